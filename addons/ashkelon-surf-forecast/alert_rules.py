@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Per-subscriber surf alert rules evaluated in one vectorized pass
+
+Each subscriber has one or more AlertRule thresholds (height, period, wind,
+hours of day, look-ahead window, beach). A RuleSet compiles all rules into
+column arrays, and evaluate() compares them against every forecast slot with
+NumPy broadcasting - a (rules x slots) boolean matrix - so thousands of
+subscribers cost one array operation instead of a Python loop per user.
+
+Usage:
+    from alert_rules import AlertRule, RuleSet, ForecastArrays
+    rules = RuleSet([AlertRule('-100123', min_height_m=0.6, min_period_s=6.5)])
+    arrays = ForecastArrays.from_days(parse_forecast(api_data))
+    alerts = rules.subscribers_to_alert(arrays)   # {'-100123': [slot indexes]}
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from surf_core import METERS_TO_FEET, epoch_now, local_epoch
+
+ALL_HOURS = tuple(range(24))
+
+
+def feet(value_ft: float) -> float:
+    """Feet threshold as meters (subscribers and the daily report think in feet)"""
+    return value_ft / METERS_TO_FEET
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """
+    One alert condition; a subscriber is alerted when any of their rules matches a slot
+
+    Heights are meters, wind is knots, window_hours counts from the evaluation
+    time (None = whole forecast), hours are local forecast hours to consider.
+    """
+    subscriber: str = 'default'
+    min_height_m: float = 0.0
+    max_height_m: float = math.inf
+    min_period_s: float = 0.0
+    max_wind_kts: float = math.inf
+    window_hours: Optional[float] = None
+    hours: Sequence[int] = ALL_HOURS
+    beach_id: int = 80
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AlertRule':
+        data = dict(data)
+        if 'min_height_ft' in data:
+            data['min_height_m'] = feet(data.pop('min_height_ft'))
+        if 'max_height_ft' in data:
+            data['max_height_m'] = feet(data.pop('max_height_ft'))
+        if 'hours' in data:
+            data['hours'] = tuple(data['hours'])
+        return cls(**data)
+
+
+# Thresholds previously hard-coded in daily_surf_report.has_surfable_waves:
+# 2ft+ with a 6.5s+ period, or a quality long-period swell of 1.8ft+ with 8s+
+SURFABLE_RULES = (
+    AlertRule(min_height_m=feet(2.0), min_period_s=6.5),
+    AlertRule(min_height_m=feet(1.8), min_period_s=8.0),
+)
+
+
+@dataclass
+class ForecastArrays:
+    """Forecast slots as parallel arrays (one entry per forecast hour, any number of beaches)"""
+    epoch: np.ndarray
+    height_m: np.ndarray
+    period_s: np.ndarray
+    wind_kts: np.ndarray
+    hour: np.ndarray
+    beach_id: np.ndarray
+    labels: List[tuple] = field(default_factory=list)
+
+    @classmethod
+    def from_slots(cls, slots: Iterable[tuple]) -> 'ForecastArrays':
+        """Build from (epoch, height_m, period_s, wind_kts, hour, beach_id, label) tuples"""
+        slots = list(slots)
+        columns = list(zip(*slots)) if slots else [()] * 7
+        return cls(
+            epoch=np.asarray(columns[0], dtype=np.int64),
+            height_m=np.asarray(columns[1], dtype=np.float64),
+            period_s=np.asarray(columns[2], dtype=np.float64),
+            wind_kts=np.asarray(columns[3], dtype=np.float64),
+            hour=np.asarray(columns[4], dtype=np.int64),
+            beach_id=np.asarray(columns[5], dtype=np.int64),
+            labels=list(columns[6]),
+        )
+
+    @classmethod
+    def from_days(cls, days, beach_id: int = 80) -> 'ForecastArrays':
+        """From surf_core ForecastDay records; missing values count as 0"""
+        return cls.from_slots(
+            (hour.epoch, hour.height_m or 0, hour.period_s or 0, hour.wind_kts or 0,
+             hour.hour, beach_id, (hour.date_key, hour.time_key))
+            for day in days for hour in day.hours
+        )
+
+    @classmethod
+    def from_sessions(cls, forecast_days: List[Dict], beach_id: int = 80) -> 'ForecastArrays':
+        """From daily_surf_report.parse_forecast_data output (heights as the rounded feet shown)"""
+        slots = []
+        for day in forecast_days:
+            for session in day['sessions']:
+                epoch = local_epoch(day['date'], session['time']) or 0
+                slots.append((epoch, session['height_ft'] / METERS_TO_FEET, session['period_s'],
+                              session.get('wind_kts') or 0, int(session['time'][:2]), beach_id,
+                              (day['date'], session['time'])))
+        return cls.from_slots(slots)
+
+    def __len__(self) -> int:
+        return len(self.epoch)
+
+
+class RuleSet:
+    """All subscribers' rules compiled into column arrays"""
+
+    def __init__(self, rules: Iterable[AlertRule]):
+        self.rules = list(rules)
+        self.subscribers, self._owner = np.unique(
+            np.asarray([rule.subscriber for rule in self.rules], dtype=object).astype(str),
+            return_inverse=True)
+        self.min_height = np.asarray([r.min_height_m for r in self.rules], dtype=np.float64)[:, None]
+        self.max_height = np.asarray([r.max_height_m for r in self.rules], dtype=np.float64)[:, None]
+        self.min_period = np.asarray([r.min_period_s for r in self.rules], dtype=np.float64)[:, None]
+        self.max_wind = np.asarray([r.max_wind_kts for r in self.rules], dtype=np.float64)[:, None]
+        self.window = np.asarray([math.inf if r.window_hours is None else r.window_hours * 3600
+                                  for r in self.rules], dtype=np.float64)[:, None]
+        self.beach = np.asarray([r.beach_id for r in self.rules], dtype=np.int64)[:, None]
+        # Allowed hours as a 24-bit mask per rule
+        self.hour_mask = np.asarray([sum(1 << h for h in set(r.hours)) for r in self.rules],
+                                    dtype=np.int64)[:, None]
+
+    def evaluate(self, arrays: ForecastArrays, now: Optional[int] = None) -> np.ndarray:
+        """
+        Match every rule against every slot
+
+        Args:
+            arrays: Forecast slots
+            now: Window start as a Unix epoch (default: current time); slots
+                 before it never match
+
+        Returns:
+            Boolean matrix of shape (rules, slots)
+        """
+        if not self.rules or not len(arrays):
+            return np.zeros((len(self.rules), len(arrays)), dtype=bool)
+        now = epoch_now() if now is None else now
+        offset = (arrays.epoch - now)[None, :]
+        return (
+            (arrays.height_m[None, :] >= self.min_height)
+            & (arrays.height_m[None, :] <= self.max_height)
+            & (arrays.period_s[None, :] >= self.min_period)
+            & (arrays.wind_kts[None, :] <= self.max_wind)
+            & (offset >= 0) & (offset <= self.window)
+            & (arrays.beach_id[None, :] == self.beach)
+            & (((self.hour_mask >> arrays.hour[None, :]) & 1) == 1)
+        )
+
+    def subscriber_matches(self, arrays: ForecastArrays, now: Optional[int] = None) -> np.ndarray:
+        """Boolean matrix (subscribers, slots): any of the subscriber's rules matches the slot"""
+        matches = self.evaluate(arrays, now)
+        combined = np.zeros((len(self.subscribers), matches.shape[1]), dtype=bool)
+        np.logical_or.at(combined, self._owner, matches)
+        return combined
+
+    def subscribers_to_alert(self, arrays: ForecastArrays, now: Optional[int] = None) -> Dict[str, List[int]]:
+        """Subscriber -> indexes of the matching slots, for subscribers with at least one match"""
+        combined = self.subscriber_matches(arrays, now)
+        alerted = np.flatnonzero(combined.any(axis=1))
+        return {str(self.subscribers[i]): np.flatnonzero(combined[i]).tolist() for i in alerted}
+
+    def any_match(self, arrays: ForecastArrays, now: Optional[int] = None) -> bool:
+        return bool(self.evaluate(arrays, now).any())
+
+
+# SURFABLE_RULES compiled once, shared by the daily report and its notification state
+SURFABLE = RuleSet(SURFABLE_RULES)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Persistent asyncio event loop for synchronous callers
+
+Flask handlers and the refresh scheduler are plain threads, while the
+Playwright scraper is async. Instead of creating and closing an event loop
+per refresh (which also throws away the browser and its connections),
+one loop runs forever in a daemon thread and sync code submits coroutines
+to it with asyncio.run_coroutine_threadsafe. Async resources created on
+that loop - the Playwright driver, a launched Chromium - stay usable across
+refreshes.
+
+Usage:
+    loop = shared_loop()
+    result = loop.run(fetch_forecast(), timeout=120)   # blocks the calling thread
+    future = loop.submit(fetch_forecast())             # concurrent.futures.Future
+    loop.on_stop(session.close)                        # async cleanup before shutdown
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundLoop:
+    """An asyncio loop running in its own daemon thread; thread-safe submit/run"""
+
+    def __init__(self, name: str = 'surf-async'):
+        self.loop = asyncio.new_event_loop()
+        self._cleanups: List[Callable[[], Awaitable]] = []
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._started.set)
+        self.loop.run_forever()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread.is_alive() and not self.loop.is_closed()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule a coroutine on the loop from any thread"""
+        if not self.is_running:
+            coro.close()
+            raise RuntimeError('background loop is stopped')
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and wait for its result; cancelled on timeout"""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError('BackgroundLoop.run() called from the loop thread; await the coroutine instead')
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def on_stop(self, cleanup: Callable[[], Awaitable]) -> None:
+        """Register an async cleanup (e.g. closing a browser) run on the loop before it stops"""
+        self._cleanups.append(cleanup)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        if not self.is_running:
+            return
+        for cleanup in reversed(self._cleanups):
+            try:
+                self.run(cleanup(), timeout)
+            except Exception as e:
+                logger.warning(f"Background loop cleanup failed: {e}")
+        self._cleanups.clear()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self.loop.close()
+
+
+_shared: Optional[BackgroundLoop] = None
+_shared_pid: Optional[int] = None
+_shared_lock = threading.Lock()
+
+
+def shared_loop() -> BackgroundLoop:
+    """The process-wide background loop (started on first use, and again after fork or stop)"""
+    global _shared, _shared_pid
+    with _shared_lock:
+        if _shared is None or _shared_pid != os.getpid() or not _shared.is_running:
+            _shared = BackgroundLoop()
+            _shared_pid = os.getpid()
+        return _shared
+
+
+def stop_shared_loop() -> None:
+    global _shared
+    with _shared_lock:
+        loop, _shared = _shared, None
+    if loop is not None and _shared_pid == os.getpid():
+        loop.stop()
+
+
+atexit.register(stop_shared_loop)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Load test for the add-on HTTP endpoints
+
+Starts web_server.py in a subprocess, fed by the local fake 4surfers API
+(fake_4surfers.py in the repository root), and drives concurrent keep-alive
+clients against each endpoint in two phases:
+
+    steady    forecast cached, no refresh running
+    refresh   the background updater refreshes the forecast back to back
+              (UPDATE_INTERVAL=1 with upstream latency), so requests overlap
+              cache swaps and chart re-renders
+
+Per endpoint it reports requests/s, p50/p99 latency, errors and the server's
+peak RSS while that endpoint was under load (Linux /proc; "-" elsewhere).
+
+Usage:
+    python load_test.py                                  # all endpoints, 10 s each
+    python load_test.py --duration 3 --clients 16 --endpoint /api/widget
+    python load_test.py --json load_test_results.json --max-p99 0.5
+
+Exits non-zero when requests failed or a p99 exceeded --max-p99, so it can
+gate CI.
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(os.path.dirname(ADDON_DIR))
+
+ENDPOINTS = ['/', '/widget', '/api/widget', '/api/forecast', '/api/ha-sensor']
+PHASES = ['steady', 'refresh']
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(ordered: List[float], fraction: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def rss_bytes(pid: int) -> Optional[int]:
+    """Resident set size of a process (Linux only)"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+class RssSampler:
+    """Peak RSS of a process while the block runs"""
+
+    def __init__(self, pid: int, interval: float = 0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak = rss_bytes(pid)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            rss = rss_bytes(self.pid)
+            if rss is not None and (self.peak is None or rss > self.peak):
+                self.peak = rss
+
+    def __enter__(self) -> 'RssSampler':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def serve(port: int, upstream: str, refresh: bool) -> None:
+    """Subprocess entry point: the add-on web server fetching from the fake upstream"""
+    sys.path.insert(0, ADDON_DIR)
+    sys.path.insert(1, REPO_DIR)
+    os.chdir(tempfile.mkdtemp(prefix='addon_load_'))  # the API fetcher saves raw responses to the cwd
+
+    import logging
+    from werkzeug.serving import make_server
+
+    import web_server
+    from wave_forecast import FourSurfersWaveForecast as ApiWaveForecast
+
+    logging.getLogger().setLevel(os.getenv('SURF_LOG_LEVEL', 'WARNING').upper())
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    web_server.FourSurfersWaveForecast = lambda: ApiWaveForecast(base_url=upstream)
+    web_server.scheduler.refresh_now()
+    if refresh:
+        web_server.scheduler.start()
+    make_server('127.0.0.1', port, web_server.app, threaded=True).serve_forever()
+
+
+class AddonServer:
+    """web_server.py in a subprocess (see serve())"""
+
+    def __init__(self, upstream: str, refresh: bool = False):
+        self.port = free_port()
+        self.url = f'http://127.0.0.1:{self.port}'
+        # serve() runs in its own temporary directory, so the snapshot lands there
+        env = dict(os.environ, UPDATE_INTERVAL='1' if refresh else '3600', SHOW_CHART='true',
+                   SNAPSHOT_PATH='forecast_snapshot.json')
+        args = [sys.executable, os.path.abspath(__file__), '--serve', str(self.port), '--upstream', upstream]
+        if refresh:
+            args.append('--refresh')
+        self.process = subprocess.Popen(args, env=env)
+
+    def wait_ready(self, timeout: float = 60.0) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'web server exited with {self.process.returncode}')
+            try:
+                if requests.get(f'{self.url}/api/forecast', timeout=2).status_code == 200:
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        raise TimeoutError('web server did not serve a forecast in time')
+
+    def stop(self) -> None:
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+    def __enter__(self) -> 'AddonServer':
+        try:
+            self.wait_ready()
+        except Exception:
+            self.stop()
+            raise
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def drive(url: str, clients: int, duration: float) -> Dict:
+    """Hammer one URL from `clients` keep-alive sessions for `duration` seconds"""
+    deadline = time.perf_counter() + duration
+
+    def client() -> tuple:
+        latencies, errors = [], 0
+        with requests.Session() as session:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = session.get(url, timeout=30)
+                    response.content
+                    ok = response.status_code == 200
+                except requests.RequestException:
+                    ok = False
+                latencies.append(time.perf_counter() - start)
+                errors += not ok
+        return latencies, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(lambda _: client(), range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(sample for samples, _ in results for sample in samples)
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors for _, errors in results),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+    }
+
+
+def run(endpoints: List[str], phases: List[str], clients: int, duration: float,
+        upstream_latency: float) -> List[Dict]:
+    """Run every phase/endpoint combination; one result dict per combination"""
+    sys.path.insert(0, REPO_DIR)
+    from fake_4surfers import FakeFourSurfers
+
+    results = []
+    with FakeFourSurfers(latency=upstream_latency) as upstream:
+        for phase in phases:
+            with AddonServer(upstream.url, refresh=phase == 'refresh') as server:
+                for endpoint in endpoints:
+                    drive(server.url + endpoint, 1, min(duration, 0.5))  # warm caches
+                    with RssSampler(server.process.pid) as rss:
+                        result = drive(server.url + endpoint, clients, duration)
+                    result.update(phase=phase, endpoint=endpoint, peak_rss_mb=(
+                        round(rss.peak / 1024 / 1024, 1) if rss.peak is not None else None))
+                    results.append(result)
+                    print(f"   {phase:8} {endpoint:15} {result['rps']:8.1f} req/s  "
+                          f"p50 {result['p50_ms']} ms  p99 {result['p99_ms']} ms  "
+                          f"errors {result['errors']}  rss {result['peak_rss_mb'] or '-'} MB")
+    return results
+
+
+def print_table(results: List[Dict]) -> None:
+    print(f"\n{'phase':8} {'endpoint':15} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'rss MB':>7}")
+    for r in results:
+        print(f"{r['phase']:8} {r['endpoint']:15} {r['rps']:8.1f} {r['p50_ms'] or '-':>8} "
+              f"{r['p99_ms'] or '-':>8} {r['errors']:7} {r['peak_rss_mb'] or '-':>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the add-on HTTP endpoints against a fake upstream')
+    parser.add_argument('--endpoint', action='append', choices=ENDPOINTS,
+                        help='Endpoint to test (repeatable; default: all)')
+    parser.add_argument('--phase', action='append', choices=PHASES, help='Phase to run (repeatable; default: both)')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent clients per endpoint')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds of load per endpoint and phase')
+    parser.add_argument('--upstream-latency', type=float, default=0.2,
+                        help='Fake 4surfers API latency in seconds (stretches refreshes)')
+    parser.add_argument('--json', metavar='PATH', help='Also write the results to a JSON file')
+    parser.add_argument('--max-p99', type=float, metavar='SECONDS', help='Fail when any p99 latency is higher')
+    parser.add_argument('--serve', type=int, metavar='PORT', help=argparse.SUPPRESS)
+    parser.add_argument('--upstream', help=argparse.SUPPRESS)
+    parser.add_argument('--refresh', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.upstream, args.refresh)
+        return
+
+    endpoints = args.endpoint or ENDPOINTS
+    phases = args.phase or PHASES
+    print(f"🏄 Load testing {len(endpoints)} endpoint(s), {args.clients} clients, {args.duration:g}s each")
+    results = run(endpoints, phases, args.clients, args.duration, args.upstream_latency)
+    print_table(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'clients': args.clients, 'duration_s': args.duration,
+                       'upstream_latency_s': args.upstream_latency, 'results': results}, f, indent=2)
+        print(f"\n💾 Results saved: {args.json}")
+
+    failed = [r for r in results if r['errors'] or not r['requests']]
+    slow = [r for r in results if args.max_p99 is not None and (r['p99_ms'] or 0) > args.max_p99 * 1000]
+    for r in failed:
+        print(f"❌ {r['phase']} {r['endpoint']}: {r['errors']} of {r['requests']} requests failed")
+    for r in slow:
+        print(f"❌ {r['phase']} {r['endpoint']}: p99 {r['p99_ms']} ms over {args.max_p99 * 1000:g} ms")
+    if failed or slow:
+        sys.exit(1)
+    print("✅ Load test passed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Background forecast refresh scheduler for the add-on
+
+One refresh in flight at a time: refresh_now() callers that arrive while a
+refresh is running wait for it and share its outcome instead of starting
+another upstream fetch. The next refresh is picked from:
+
+    * failures - exponential back-off (retry, 2x retry, ... up to max_backoff)
+    * forecastUpdatedDate cadence - once two upstream model runs have been
+      seen, the refresh is aligned to just after the next expected run
+      (last run + median gap + settle), bounded by min_interval/interval;
+      if the run is late, polls back off from min_interval
+    * otherwise every `interval` seconds
+
+A random 0..jitter fraction is added to every delay so restarts of several
+add-on instances do not hit 4surfers at the same moment.
+
+Usage:
+    scheduler = RefreshScheduler(update_forecast_data, interval=3600)
+    scheduler.refresh_now()   # initial load
+    scheduler.start()         # background thread
+    scheduler.trigger()       # ask for an early refresh (honours back-off)
+    scheduler.stop()
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from surf_core import parse_local
+from surf_core.metrics import REGISTRY, Registry
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshScheduler:
+    """Single-flight, jittered, cadence-aligned refresh loop"""
+
+    def __init__(self, refresh: Callable[[], Optional[Dict]], interval: float = 3600.0,
+                 min_interval: float = 300.0, settle: float = 300.0, retry: float = 60.0,
+                 max_backoff: Optional[float] = None, jitter: float = 0.1, history: int = 6,
+                 clock: Callable[[], float] = time.time, rng: Optional[random.Random] = None,
+                 registry: Registry = REGISTRY):
+        """
+        Args:
+            refresh: Fetches and stores a forecast; returns it (a dict with an optional
+                     'forecast_updated' stamp) or None on failure
+            interval: Longest time between refreshes
+            min_interval: Shortest time between scheduled refreshes
+            settle: Seconds after an expected upstream run before fetching it
+            retry: First back-off after a failed refresh
+            max_backoff: Longest back-off (default: interval)
+            jitter: Random extra delay as a fraction of each delay
+            history: Upstream run stamps kept for the cadence estimate
+            clock: Wall-clock seconds (upstream stamps are epochs)
+            rng: Random source for the jitter
+            registry: Metrics registry for surf_refresh_total
+        """
+        self.refresh = refresh
+        self.interval = interval
+        self.min_interval = min(min_interval, interval)
+        self.settle = settle
+        self.retry = min(retry, interval)
+        self.max_backoff = interval if max_backoff is None else max_backoff
+        self.jitter = jitter
+        self.clock = clock
+        self.random = rng or random.Random()
+        self.runs = registry.counter('surf_refresh_total', 'Forecast refreshes by result (ok, failed, coalesced)',
+                                     ('result',))
+
+        self.failures = 0
+        self.stale_polls = 0
+        self.upstream_runs: deque = deque(maxlen=history)
+        self.next_run = clock()
+        self._earliest = 0.0
+        self._in_flight = False
+        self._last_ok = False
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def cadence(self) -> Optional[float]:
+        """Median seconds between observed upstream runs (None until two were seen)"""
+        runs = list(self.upstream_runs)
+        gaps = sorted(b - a for a, b in zip(runs, runs[1:]) if b > a)
+        return gaps[len(gaps) // 2] if gaps else None
+
+    def refresh_now(self) -> bool:
+        """Refresh unless one is already running, in which case wait for it; True on success"""
+        with self._cond:
+            if self._in_flight:
+                self.runs.inc(result='coalesced')
+                self._cond.wait_for(lambda: not self._in_flight)
+                return self._last_ok
+            self._in_flight = True
+
+        result = None
+        try:
+            result = self.refresh()
+        except Exception as e:
+            logger.error(f"Forecast refresh failed: {e}")
+        finally:
+            with self._cond:
+                self._schedule(result or None)
+                self._in_flight = False
+                self._last_ok = bool(result)
+                self._cond.notify_all()
+        self.runs.inc(result='ok' if result else 'failed')
+        return bool(result)
+
+    def _schedule(self, result: Optional[Dict]) -> None:
+        now = self.clock()
+        if result is None:
+            self.failures += 1
+            delay = min(self.max_backoff, self.retry * 2 ** (self.failures - 1))
+            self._earliest = now + delay
+        else:
+            self.failures = 0
+            updated = parse_local(result.get('forecast_updated'))
+            if updated is not None and (not self.upstream_runs or updated.epoch > self.upstream_runs[-1]):
+                self.upstream_runs.append(updated.epoch)
+                self.stale_polls = 0
+            else:
+                self.stale_polls += 1
+            delay = self._aligned_delay(now)
+            self._earliest = now + self.min_interval
+        self.next_run = now + delay + self.random.uniform(0, self.jitter * delay)
+        logger.info(f"Next forecast refresh in {self.next_run - now:.0f}s")
+
+    def _aligned_delay(self, now: float) -> float:
+        cadence = self.cadence()
+        if cadence is None:
+            return self.interval
+        expected = self.upstream_runs[-1] + cadence + self.settle
+        if expected <= now:
+            # Upstream run is late (or was missed): poll, backing off while the stamp stays put
+            return min(self.interval, self.min_interval * 2 ** max(self.stale_polls - 1, 0))
+        return max(self.min_interval, min(self.interval, expected - now))
+
+    def trigger(self) -> None:
+        """
+        Ask for an early refresh; ignored while one is running, while backing off
+        or within min_interval of the last one. Without a running loop the
+        refresh runs in a one-off thread.
+        """
+        if self._in_flight or self.clock() < self._earliest:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            self._wake.set()
+        else:
+            threading.Thread(target=self.refresh_now, daemon=True).start()
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            delay = self.next_run - self.clock()
+            if delay > 0:
+                self._wake.wait(delay)
+                self._wake.clear()
+                if self._stop.is_set():
+                    break
+                if self.clock() < min(self.next_run, self._earliest):
+                    continue
+            self.refresh_now()
+
+    def start(self) -> 'RefreshScheduler':
+        self._thread = threading.Thread(target=self.run_forever, name='forecast-refresh', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def snapshot(self) -> Dict:
+        """Scheduler state for /api/status"""
+        cadence = self.cadence()
+        with self._cond:
+            return {
+                'in_flight': self._in_flight,
+                'consecutive_failures': self.failures,
+                'next_refresh_in_s': round(max(0.0, self.next_run - self.clock()), 1),
+                'upstream_cadence_s': round(cadence) if cadence else None,
+                'upstream_runs_seen': len(self.upstream_runs),
+            }
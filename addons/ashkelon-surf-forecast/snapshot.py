@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Last-good forecast snapshot for warm starts
+
+After every successful refresh the add-on writes the parsed forecast, its
+fetch time and the rendered charts (SVG, and PNG when matplotlib is
+available) to one JSON file under /data, which Home Assistant keeps across
+restarts. At boot the snapshot is read back in milliseconds, so every page
+and /health answer at once while the first real refresh runs in the
+background.
+
+Writes go to a temporary file that is renamed over the snapshot, so a
+crash mid-write never leaves a torn file behind; an unreadable or foreign
+snapshot is ignored.
+
+Usage:
+    save(forecast, last_update, views={'chart_svg': svg, 'chart_png': png})
+    snap = load()
+    if snap:
+        forecast, last_update, views = snap.forecast, snap.last_update, snap.views
+"""
+
+import base64
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Bump when the forecast or chart layout changes so older snapshots are ignored
+SNAPSHOT_VERSION = 1
+
+
+def default_path() -> str:
+    """SNAPSHOT_PATH, else /data/forecast_snapshot.json (the add-on's persistent volume)"""
+    return os.getenv('SNAPSHOT_PATH', '/data/forecast_snapshot.json')
+
+
+class Snapshot(NamedTuple):
+    forecast: Dict
+    last_update: datetime
+    views: Dict[str, Union[str, bytes]]
+    saved_at: datetime
+
+
+def save(forecast: Dict, last_update: datetime, views: Optional[Dict[str, Union[str, bytes, None]]] = None,
+         path: Optional[str] = None) -> bool:
+    """
+    Atomically write the snapshot; False (and a warning) if it could not be written
+
+    Args:
+        forecast: Parsed forecast served by the add-on
+        last_update: When it was fetched
+        views: Pre-rendered views by name; bytes are stored base64-encoded, None is skipped
+        path: Snapshot file (default: default_path())
+    """
+    path = path or default_path()
+    encoded = {}
+    for name, body in (views or {}).items():
+        if isinstance(body, bytes):
+            encoded[name] = {'base64': base64.b64encode(body).decode('ascii')}
+        elif body is not None:
+            encoded[name] = {'text': body}
+    document = {
+        'version': SNAPSHOT_VERSION,
+        'saved_at': datetime.now().isoformat(),
+        'last_update': last_update.isoformat(),
+        'forecast': forecast,
+        'views': encoded,
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix='.snapshot_', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(document, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not write forecast snapshot {path}: {e}")
+        return False
+    return True
+
+
+def load(path: Optional[str] = None) -> Optional[Snapshot]:
+    """The last saved snapshot, or None if there is none or it cannot be used"""
+    path = path or default_path()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable forecast snapshot {path}: {e}")
+        return None
+
+    try:
+        if document.get('version') != SNAPSHOT_VERSION or not document['forecast'].get('daily_forecasts'):
+            logger.info(f"Ignoring forecast snapshot {path} (version {document.get('version')})")
+            return None
+        views = {}
+        for name, body in document.get('views', {}).items():
+            views[name] = base64.b64decode(body['base64']) if 'base64' in body else body['text']
+        return Snapshot(document['forecast'], datetime.fromisoformat(document['last_update']), views,
+                        datetime.fromisoformat(document['saved_at']))
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Ignoring malformed forecast snapshot {path}: {e}")
+        return None
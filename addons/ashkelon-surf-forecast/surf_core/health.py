@@ -0,0 +1,171 @@
+"""
+Source health tracking with a per-source circuit breaker
+
+Each forecast backend (extended API, basic API, browser scrape) gets a
+success-rate and call-time moving average (failed calls included, so a
+source that keeps timing out gets expensive). order() returns the sources to try
+for the next refresh:
+
+    * closed circuits first, cheapest expected time-to-success first
+      (call time / success rate), so the fastest working source leads - a
+      less preferred source (later in the mapping, e.g. one with less data)
+      must be `slack` times cheaper to move ahead of a preferred one;
+    * a source whose cool-off has expired comes next for one trial call
+      (half-open) - success closes it, failure re-opens it for twice as long;
+    * sources still cooling off are skipped entirely.
+
+If every circuit is open the one due soonest is still tried, so a refresh
+never becomes a no-op.
+
+Usage:
+    health = SourceHealth({"extended_api": 1.0, "basic_api": 1.5, "browser": 20.0})
+    for source in health.order():
+        with health.attempt(source) as attempt:
+            attempt.ok = bool(fetch(source))
+        if attempt.ok:
+            break
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, List, Mapping
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _SourceState:
+    __slots__ = ("latency", "success", "failures", "opened_at", "cooloff", "calls")
+
+    def __init__(self, expected_latency: float) -> None:
+        self.latency = expected_latency
+        self.success = 1.0
+        self.failures = 0
+        self.opened_at = None
+        self.cooloff = 0.0
+        self.calls = 0
+
+
+class _Attempt:
+    __slots__ = ("_health", "_source", "_start", "ok")
+
+    def __init__(self, health: "SourceHealth", source: str) -> None:
+        self._health = health
+        self._source = source
+        self.ok = False
+
+    def __enter__(self) -> "_Attempt":
+        self._start = self._health.clock()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._health.record(self._source, self.ok and exc_info[0] is None, self._health.clock() - self._start)
+
+
+class SourceHealth:
+    """Success rate, latency and circuit state per forecast source (thread-safe)"""
+
+    def __init__(self, expected_latency: Mapping[str, float], failure_threshold: int = 2,
+                 cooloff: float = 300.0, max_cooloff: float = 3600.0, alpha: float = 0.3,
+                 slack: float = 3.0, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Args:
+            expected_latency: Source -> seconds assumed before it has been measured;
+                              the mapping order is the tie-break preference
+            failure_threshold: Consecutive failures that open a circuit
+            cooloff: Seconds an opened circuit is skipped (doubles on each re-open)
+            max_cooloff: Upper bound for the doubled cool-off
+            alpha: Weight of the newest sample in the moving averages
+            slack: Cost ratio needed for a later source to overtake an earlier one
+                   (1.0 = strictly fastest first)
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.sources = list(expected_latency)
+        self.failure_threshold = failure_threshold
+        self.base_cooloff = cooloff
+        self.max_cooloff = max_cooloff
+        self.alpha = alpha
+        self.slack = slack
+        self.clock = clock
+        self._states = {name: _SourceState(latency) for name, latency in expected_latency.items()}
+        self._lock = threading.Lock()
+
+    def _state_of(self, state: _SourceState, now: float) -> str:
+        if state.opened_at is None:
+            return CLOSED
+        return HALF_OPEN if now - state.opened_at >= state.cooloff else OPEN
+
+    def state(self, source: str) -> str:
+        with self._lock:
+            return self._state_of(self._states[source], self.clock())
+
+    def _rank(self, names: List[str], cost: Dict[str, float]) -> List[str]:
+        remaining = list(names)  # preference order
+        ranked = []
+        while remaining:
+            best = remaining[0]
+            for name in remaining[1:]:
+                if cost[name] * self.slack < cost[best]:
+                    best = name
+            ranked.append(best)
+            remaining.remove(best)
+        return ranked
+
+    def order(self) -> List[str]:
+        """Sources to try, best first; open circuits are left out"""
+        now = self.clock()
+        with self._lock:
+            states = {name: self._state_of(self._states[name], now) for name in self.sources}
+            cost = {name: self._states[name].latency / max(self._states[name].success, 0.05) for name in self.sources}
+            closed = self._rank([n for n in self.sources if states[n] == CLOSED], cost)
+            half_open = self._rank([n for n in self.sources if states[n] == HALF_OPEN], cost)
+            if closed or half_open:
+                return closed + half_open
+            # Everything is cooling off - try the source that is due soonest
+            due = min(self.sources, key=lambda n: self._states[n].opened_at + self._states[n].cooloff - now)
+            return [due]
+
+    def attempt(self, source: str) -> _Attempt:
+        """Context manager timing one call; set .ok = True on success"""
+        return _Attempt(self, source)
+
+    def record(self, source: str, ok: bool, seconds: float) -> None:
+        now = self.clock()
+        with self._lock:
+            state = self._states[source]
+            state.calls += 1
+            state.success += self.alpha * ((1.0 if ok else 0.0) - state.success)
+            # Failed calls count too: a source that times out is slow even when it sometimes works
+            state.latency += self.alpha * (seconds - state.latency)
+            if ok:
+                state.failures = 0
+                state.opened_at = None
+                state.cooloff = 0.0
+                return
+            state.failures += 1
+            if state.opened_at is not None:
+                # Half-open trial failed: back off longer
+                state.cooloff = min(state.cooloff * 2, self.max_cooloff)
+                state.opened_at = now
+            elif state.failures >= self.failure_threshold:
+                state.cooloff = self.base_cooloff
+                state.opened_at = now
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Per-source state, moving averages and remaining cool-off (for status pages and logs)"""
+        now = self.clock()
+        with self._lock:
+            return {
+                name: {
+                    "state": self._state_of(state, now),
+                    "success_rate": round(state.success, 3),
+                    "latency_s": round(state.latency, 3),
+                    "consecutive_failures": state.failures,
+                    "retry_in_s": round(max(0.0, state.opened_at + state.cooloff - now), 1)
+                    if state.opened_at is not None else 0.0,
+                    "calls": state.calls,
+                }
+                for name, state in self._states.items()
+            }
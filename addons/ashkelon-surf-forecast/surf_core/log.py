@@ -0,0 +1,122 @@
+"""
+Leveled, queue-backed logging for the forecast scripts
+
+Thin layer over the stdlib logging module. Callers log with lazy %-style
+arguments (log.debug("Mapped %s -> %sm", date, height)) so a disabled level
+costs one integer comparison and no string formatting. configure_logging()
+routes every record through a QueueHandler; a QueueListener thread does the
+formatting and the blocking stream write, so hot loops never wait on stdout.
+
+Environment:
+    SURF_LOG_LEVEL   default level (INFO)
+    SURF_LOG_LEVELS  per-logger overrides, e.g. "wave_forecast.parse=DEBUG,telegram_delivery=WARNING"
+    SURF_LOG_FORMAT  "text" (message only, the old print output) or "json" (one object per line)
+
+Usage:
+    from surf_core.log import configure_logging, get_logger
+
+    log = get_logger("wave_forecast")
+    configure_logging()  # once, in main()
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import IO, Dict, Optional
+
+TEXT_FORMAT = "%(message)s"
+
+# Attributes every LogRecord has; anything else came in through extra={...}
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_pid = 0
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and any extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(name)
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """"a=DEBUG, b.c=warning" -> {"a": 10, "b.c": 30}; malformed entries are ignored"""
+    levels = {}
+    for item in spec.replace(";", ",").split(","):
+        name, _, level = item.partition("=")
+        value = logging.getLevelName(level.strip().upper())
+        if name.strip() and isinstance(value, int):
+            levels[name.strip()] = value
+    return levels
+
+
+def configure_logging(level: Optional[str] = None, levels: Optional[str] = None,
+                      fmt: Optional[str] = None, stream: Optional[IO[str]] = None) -> logging.handlers.QueueListener:
+    """
+    Install the queue handler on the root logger (idempotent; a second call reconfigures)
+
+    Worker processes call this again from their pool initializer: a forked
+    child inherits the handler but not the listener thread that drains it.
+
+    Args:
+        level: Root level name (default SURF_LOG_LEVEL or INFO)
+        levels: Per-logger overrides (default SURF_LOG_LEVELS)
+        fmt: "text" or "json" (default SURF_LOG_FORMAT or text)
+        stream: Output stream (default sys.stdout)
+
+    Returns:
+        The running QueueListener
+    """
+    global _listener, _listener_pid
+    shutdown_logging()
+
+    fmt = (fmt or os.getenv("SURF_LOG_FORMAT", "text")).lower()
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel(logging.getLevelName((level or os.getenv("SURF_LOG_LEVEL", "INFO")).upper()))
+    for name, value in parse_levels(levels if levels is not None else os.getenv("SURF_LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(value)
+
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    _listener_pid = os.getpid()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records, stop the listener thread and detach the queue handler"""
+    global _listener
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+    _listener = None
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)]:
+        root.removeHandler(handler)
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,132 @@
+"""Single-pass parser for the GetBeachAreaForecast forecastHours schema"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from .records import ForecastDay, ForecastHour
+from .timestamps import parse_local
+
+METERS_TO_FEET = 3.28084
+
+# Indexed by datetime.weekday() (0 = Monday)
+HEBREW_DAYS = ("שני", "שלישי", "רביעי", "חמישי", "שישי", "שבת", "ראשון")
+HEBREW_DAY_LETTERS = ("ב'", "ג'", "ד'", "ה'", "ו'", "שבת", "א'")
+ENGLISH_DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Longest phrases first so "קרסול עד ברך" is not reported as "קרסול"
+_QUALITY_TERMS = (
+    ("פלטה", "flat"),
+    ("שטוח", "flat"),
+    ("קרסול עד ברך", "ankle_to_knee"),
+    ("קרסול", "ankle_high"),
+    ("מעל ברך", "above_knee"),
+    ("ברך", "knee_high"),
+    ("מעל כתף", "above_shoulder"),
+    ("כתף", "shoulder_high"),
+    ("מותן", "waist_high"),
+    ("מעל ראש", "overhead"),
+    ("ראש", "head_high"),
+)
+
+
+@lru_cache(maxsize=64)
+def surf_quality_english(hebrew_desc: str) -> str:
+    """Map a surfHeightDesc phrase (e.g. "קרסול עד ברך") to its English key"""
+    for term, english in _QUALITY_TERMS:
+        if term in hebrew_desc:
+            return english
+    return "unknown"
+
+
+def _number(hour: Dict[str, Any], *keys: str) -> Optional[float]:
+    """First present value among keys as a number (API casing varies between fields)"""
+    for key in keys:
+        value = hour.get(key)
+        if isinstance(value, (int, float)):
+            return value
+        if value is not None and value != "":
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+def parse_hour(hour: Dict[str, Any]) -> Optional[ForecastHour]:
+    """
+    Parse one forecastHours entry
+
+    height_m is the average of SurfHeightFrom/To when both are positive and the
+    raw WaveHeight otherwise; wave_height_m always holds WaveHeight.
+    Returns None when forecastLocalHour is missing or malformed.
+    """
+    stamp = hour.get("forecastLocalHour")
+    local = parse_local(stamp) if isinstance(stamp, str) else None
+    if local is None:
+        return None
+
+    wave_height = _number(hour, "WaveHeight", "waveHeight", "WaveHeightInMeters")
+    surf_from = _number(hour, "SurfHeightFrom", "surfHeightFrom")
+    surf_to = _number(hour, "SurfHeightTo", "surfHeightTo")
+    if surf_from and surf_to:
+        height = (surf_from + surf_to) / 2
+    else:
+        height = wave_height
+
+    return ForecastHour(
+        stamp,
+        local.epoch,
+        local.date_key,
+        local.time_key,
+        local.hour,
+        height,
+        wave_height,
+        _number(hour, "WavePeriod", "wavePeriod"),
+        _number(hour, "WindSpeedInKnots", "windSpeedInKnots"),
+        hour.get("surfHeightDesc") or "",
+        hour.get("surfRankMark"),
+    )
+
+
+def parse_forecast(payload: Dict[str, Any], max_days: Optional[int] = None) -> List[ForecastDay]:
+    """
+    Parse a GetBeachAreaForecast payload into ForecastDay records
+
+    Args:
+        payload: Decoded API response containing dailyForecastList
+        max_days: Only parse the first N days (None = all)
+
+    Returns:
+        Days in API order; entries without forecastLocalTime are skipped
+    """
+    daily_list = payload.get("dailyForecastList") or []
+    if max_days is not None:
+        daily_list = daily_list[:max_days]
+
+    days: List[ForecastDay] = []
+    for day_data in daily_list:
+        local_time = day_data.get("forecastLocalTime")
+        local = parse_local(local_time) if isinstance(local_time, str) else None
+        if local is None:
+            continue
+        weekday = local.weekday
+
+        hours = []
+        for hour_data in day_data.get("forecastHours") or ():
+            parsed = parse_hour(hour_data)
+            if parsed is not None:
+                hours.append(parsed)
+
+        days.append(
+            ForecastDay(
+                local.date_key,
+                local.display_date,
+                weekday,
+                HEBREW_DAYS[weekday],
+                HEBREW_DAY_LETTERS[weekday],
+                ENGLISH_DAYS[weekday],
+                hours,
+            )
+        )
+    return days
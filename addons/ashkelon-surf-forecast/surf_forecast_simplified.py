@@ -10,15 +10,60 @@ import re
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List
 import asyncio
+import threading
+import weakref
 from playwright.async_api import async_playwright
 import logging
 
+from background_loop import BackgroundLoop, shared_loop
+from surf_core import ENGLISH_DAYS, parse_local
+from surf_core.metrics import REGISTRY, timed
+
 logger = logging.getLogger(__name__)
 
+FORECAST_SOURCE = REGISTRY.counter(
+    'surf_forecast_source_total',
+    'Fetch path that produced the forecast (extended_api, basic_api, browser, none)',
+    ('source',),
+)
+
+class BrowserSession:
+    """Playwright driver and Chromium kept open across refreshes (use from one event loop only)"""
+    
+    def __init__(self):
+        self._playwright = None
+        self._browser = None
+        self._lock = asyncio.Lock()
+        self.launches = 0
+    
+    async def browser(self):
+        """The running browser, (re)launched if it is not connected"""
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                self.launches += 1
+            return self._browser
+    
+    async def close(self):
+        async with self._lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
 class FourSurfersWaveForecast:
     """Simplified wave forecast class for Home Assistant addon"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[BrowserSession] = None):
+        """
+        Args:
+            session: Browser kept open between calls (default: launch and close one per call)
+        """
+        self.session = session
         self.ashkelon_url = "https://www.4surfers.co.il/אשקלון"
         self.api_base_url = "https://www.4surfers.co.il"
         
@@ -65,53 +110,65 @@ class FourSurfersWaveForecast:
         hebrew_days = ['ראשון', 'שני', 'שלישי', 'רביעי', 'חמישי', 'שישי', 'שבת']
         return hebrew_days[weekday]
     
+    @timed('surf_fetch_seconds', 'Forecast fetch latency by method', method='browser')
     async def get_ashkelon_forecast(self) -> Optional[Dict]:
         """Get forecast data using Playwright"""
         try:
             logger.info("Getting Ashkelon forecast from 4surfers.co.il...")
             
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
+            session = self.session or BrowserSession()
+            try:
+                browser = await session.browser()
+                # Fresh context per refresh: no cookies or storage carried over, browser stays warm
                 context = await browser.new_context(
                     user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
                 )
-                page = await context.new_page()
-                
-                # Navigate to Ashkelon page
-                await page.goto(self.ashkelon_url, timeout=30000)
-                await page.wait_for_load_state('networkidle', timeout=30000)
-                
-                # Get page content
-                html = await page.content()
-                
-                # Try to get extended API data
-                forecast_data = await self._get_extended_api_data(page)
-                
-                if not forecast_data or not forecast_data.get('daily_forecasts'):
-                    # Fallback to HTML parsing
-                    forecast_data = self._parse_basic_forecast(html)
-                
-                await browser.close()
-                
-                if forecast_data:
-                    forecast_data.update({
-                        'beach': 'Ashkelon',
-                        'beach_hebrew': 'אשקלון', 
-                        'source': '4surfers.co.il',
-                        'timestamp': datetime.now().isoformat(),
-                        'url': self.ashkelon_url
-                    })
+                try:
+                    page = await context.new_page()
                     
-                    logger.info(f"Forecast retrieved successfully: {len(forecast_data.get('daily_forecasts', {}))} days")
-                    return forecast_data
-                else:
-                    logger.error("Failed to retrieve forecast data")
-                    return None
+                    # Navigate to Ashkelon page
+                    await page.goto(self.ashkelon_url, timeout=30000)
+                    await page.wait_for_load_state('networkidle', timeout=30000)
+                    
+                    # Get page content
+                    html = await page.content()
                     
+                    # Try to get extended API data
+                    forecast_data = await self._get_extended_api_data(page)
+                    source = 'extended_api'
+                    
+                    if not forecast_data or not forecast_data.get('daily_forecasts'):
+                        # Fallback to HTML parsing
+                        forecast_data = self._parse_basic_forecast(html)
+                        source = 'browser'
+                finally:
+                    await context.close()
+            finally:
+                if self.session is None:
+                    await session.close()
+            
+            if forecast_data:
+                forecast_data.update({
+                    'beach': 'Ashkelon',
+                    'beach_hebrew': 'אשקלון', 
+                    'source': '4surfers.co.il',
+                    'timestamp': datetime.now().isoformat(),
+                    'url': self.ashkelon_url
+                })
+                
+                logger.info(f"Forecast retrieved successfully: {len(forecast_data.get('daily_forecasts', {}))} days")
+                FORECAST_SOURCE.inc(source=source)
+                return forecast_data
+            else:
+                logger.error("Failed to retrieve forecast data")
+                FORECAST_SOURCE.inc(source='none')
+                return None
+                
         except Exception as e:
             logger.error(f"Error getting forecast: {e}")
             return None
     
+    @timed('surf_fetch_seconds', 'Forecast fetch latency by method', method='extended_api')
     async def _get_extended_api_data(self, page) -> Optional[Dict]:
         """Get data from 4surfers extended API"""
         try:
@@ -178,23 +235,27 @@ class FourSurfersWaveForecast:
             logger.warning(f"JWT token extraction failed: {e}")
             return None
     
+    @timed('surf_parse_seconds', 'Forecast parse time by parser', parser='extended_api')
     def _process_extended_api_data(self, api_data: Dict) -> Dict:
         """Process extended API response into forecast structure"""
         try:
             forecast_data = {
                 'daily_forecasts': {},
                 'surf_quality_indicators': [],
-                'surf_quality_counts': {}
+                'surf_quality_counts': {},
+                'forecast_updated': api_data.get('forecastUpdatedDate')
             }
             
             # Process forecast points (69 hours = ~3 days detailed)
             forecast_points = api_data.get('forecastPoints', [])
             
             for point in forecast_points:
-                # Parse datetime
-                forecast_time = datetime.fromisoformat(point['forecastDateTime'].replace('Z', '+00:00'))
-                date_key = forecast_time.strftime('%Y-%m-%d')
-                time_key = forecast_time.strftime('%H:%M')
+                # Parse datetime (UTC "Z" stamps are converted to Israel local time)
+                local = parse_local(point.get('forecastDateTime'))
+                if local is None:
+                    continue
+                date_key = local.date_key
+                time_key = local.time_key
                 
                 # Only keep key surf times
                 if time_key not in ['06:00', '12:00', '18:00']:
@@ -206,11 +267,11 @@ class FourSurfersWaveForecast:
                 
                 # Initialize day if not exists
                 if date_key not in forecast_data['daily_forecasts']:
-                    hebrew_day = self._get_hebrew_day(forecast_time.weekday())
-                    english_day = forecast_time.strftime('%A')
+                    hebrew_day = self._get_hebrew_day(local.weekday)
+                    english_day = ENGLISH_DAYS[local.weekday]
                     
                     forecast_data['daily_forecasts'][date_key] = {
-                        'hebrew_date': forecast_time.strftime('%d/%m'),
+                        'hebrew_date': local.display_date,
                         'hebrew_day': hebrew_day,
                         'english_day': english_day,
                         'times': {}
@@ -260,6 +321,7 @@ class FourSurfersWaveForecast:
         }
         return translations.get(hebrew_quality, 'unknown')
     
+    @timed('surf_parse_seconds', 'Forecast parse time by parser', parser='html')
     def _parse_basic_forecast(self, html: str) -> Dict:
         """Fallback HTML parsing for basic forecast data"""
         try:
@@ -328,20 +390,36 @@ class FourSurfersWaveForecast:
             return {}
 
 # Synchronous wrapper for Home Assistant
+_sessions = weakref.WeakKeyDictionary()  # BackgroundLoop -> BrowserSession
+_sessions_lock = threading.Lock()
+
+def browser_session(loop: BackgroundLoop) -> BrowserSession:
+    """One browser per background loop, closed when the loop stops"""
+    with _sessions_lock:
+        session = _sessions.get(loop)
+        if session is None:
+            session = _sessions[loop] = BrowserSession()
+            loop.on_stop(session.close)
+        return session
+
 class SyncFourSurfersWaveForecast:
-    """Synchronous wrapper for async forecast functionality"""
+    """Synchronous wrapper running the async scrape on a persistent background loop"""
     
-    def __init__(self):
-        self._async_forecast = FourSurfersWaveForecast()
+    def __init__(self, loop: Optional[BackgroundLoop] = None, timeout: float = 180.0):
+        """
+        Args:
+            loop: Event loop thread to run on (default: the process-wide shared_loop(),
+                  so the browser survives between wrapper instances and refreshes)
+            timeout: Seconds before a refresh is abandoned and cancelled
+        """
+        self._loop = loop or shared_loop()
+        self.timeout = timeout
+        self._async_forecast = FourSurfersWaveForecast(session=browser_session(self._loop))
     
     def get_ashkelon_forecast(self) -> Optional[Dict]:
         """Synchronous version of get_ashkelon_forecast"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(self._async_forecast.get_ashkelon_forecast())
-            loop.close()
-            return result
+            return self._loop.run(self._async_forecast.get_ashkelon_forecast(), timeout=self.timeout)
         except Exception as e:
             logger.error(f"Sync forecast error: {e}")
-            return None
\ No newline at end of file
+            return None
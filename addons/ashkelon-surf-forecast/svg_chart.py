@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Pure-Python SVG version of the wave height bar chart
+
+Draws the same 06:00/12:00/18:00 bars and reference lines as wave_chart, but
+as an SVG string built from templates, so it needs neither matplotlib nor
+arabic_reshaper (browsers lay out Hebrew natively). Static parts of the
+chart (frame, titles, legend, bar x positions) are built once per number of
+days; a render only formats the bar rectangles and labels.
+
+Usage:
+    from svg_chart import SvgChartRenderer
+    svg = SvgChartRenderer().render(forecast_data)
+"""
+
+import threading
+from functools import lru_cache
+from html import escape
+from typing import Dict, List, Optional, Tuple
+
+from wave_chart import REFERENCE_LINES, SESSIONS, chart_series, series_hash
+
+WIDTH = 900
+HEIGHT = 480
+LEFT = 60
+RIGHT = 190  # room for the legend
+TOP = 60
+BOTTOM = 60
+PLOT_WIDTH = WIDTH - LEFT - RIGHT
+PLOT_HEIGHT = HEIGHT - TOP - BOTTOM
+BASELINE = TOP + PLOT_HEIGHT
+
+_HEADER = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+    'font-family="Arial, sans-serif" role="img" aria-label="Ashkelon wave forecast">'
+    '<rect width="{width}" height="{height}" fill="#fff"/>'
+    '<rect x="{left}" y="{top}" width="{plot_width}" height="{plot_height}" fill="#F8F9FA"/>'
+    '<text x="{center}" y="26" text-anchor="middle" font-size="18" font-weight="bold">'
+    '🌊 <tspan direction="rtl" unicode-bidi="embed">תחזית גלים אשקלון</tspan> - Ashkelon Wave Forecast</text>'
+    '<text x="{center}" y="46" text-anchor="middle" font-size="13" fill="#555" direction="rtl">'
+    'גובה גלים לפי שעות היום</text>'
+)
+_BAR = ('<rect x="{x:.1f}" y="{y:.1f}" width="{w:.1f}" height="{h:.1f}" fill="{color}" '
+        'fill-opacity="0.8" stroke="#fff"/>')
+_BAR_LABEL = ('<text x="{x:.1f}" y="{y:.1f}" text-anchor="middle" font-size="10" '
+              'font-weight="bold" fill="#2C3E50">{height:.1f}m</text>')
+_X_LABEL = ('<text x="{x:.1f}" y="{y}" text-anchor="middle" font-size="12" font-weight="bold">{date}'
+            '<tspan x="{x:.1f}" dy="15" direction="rtl">{day}</tspan></text>')
+_GRID_LINE = ('<line x1="{left}" x2="{right}" y1="{y:.1f}" y2="{y:.1f}" stroke="#000" '
+              'stroke-opacity="0.1"/><text x="{label_x}" y="{label_y:.1f}" text-anchor="end" '
+              'font-size="11">{value:.1f}</text>')
+_REFERENCE_LINE = ('<line x1="{left}" x2="{right}" y1="{y:.1f}" y2="{y:.1f}" stroke="{color}" '
+                   'stroke-opacity="{alpha}" stroke-width="{width}" stroke-dasharray="6 4"/>')
+_FOOTER = '</svg>'
+
+
+def _legend() -> str:
+    x = WIDTH - RIGHT + 15
+    items = [(f'<rect x="{x}" y="{{y}}" width="14" height="10" fill="{color}" fill-opacity="0.8"/>', label)
+             for _, label, color in SESSIONS]
+    items += [(f'<line x1="{x}" x2="{x + 14}" y1="{{y5}}" y2="{{y5}}" stroke="{color}" '
+               f'stroke-opacity="{alpha}" stroke-width="{width}" stroke-dasharray="4 2"/>', term + suffix)
+              for _, color, alpha, width, term, suffix in REFERENCE_LINES]
+    parts = []
+    for index, (swatch, text) in enumerate(items):
+        y = TOP + index * 20
+        parts.append(swatch.format(y=y, y5=y + 5))
+        parts.append(f'<text x="{x + 20}" y="{y + 9}" font-size="11">{escape(text)}</text>')
+    return ''.join(parts)
+
+
+@lru_cache(maxsize=16)
+def _layout(days: int) -> Tuple[str, Tuple[float, ...], float]:
+    """
+    Static markup and geometry for a chart with the given number of days
+
+    Returns:
+        (header + legend markup, x center per day, bar width)
+    """
+    slot = PLOT_WIDTH / days
+    bar_width = slot * 0.25
+    centers = tuple(LEFT + slot * (index + 0.5) for index in range(days))
+    header = _HEADER.format(width=WIDTH, height=HEIGHT, left=LEFT, top=TOP,
+                            plot_width=PLOT_WIDTH, plot_height=PLOT_HEIGHT,
+                            center=LEFT + PLOT_WIDTH / 2)
+    return header + _legend(), centers, bar_width
+
+
+def render_svg(date_labels: List[str], hebrew_days: List[str], heights: List[List[float]]) -> str:
+    """Build the SVG document for one chart series (see wave_chart.chart_series)"""
+    static, centers, bar_width = _layout(len(date_labels))
+    max_height = max((h for session in heights for h in session), default=1.0)
+    y_max = max(1.2, max_height + 0.1)
+    scale = PLOT_HEIGHT / y_max
+
+    parts = [static]
+    step = 0.5 if y_max > 2.5 else 0.2
+    value = 0.0
+    while value <= y_max:
+        y = BASELINE - value * scale
+        parts.append(_GRID_LINE.format(left=LEFT, right=LEFT + PLOT_WIDTH, y=y,
+                                       label_x=LEFT - 6, label_y=y + 4, value=value))
+        value = round(value + step, 2)
+
+    for height, color, alpha, width, _, _ in REFERENCE_LINES:
+        if height <= y_max:
+            parts.append(_REFERENCE_LINE.format(left=LEFT, right=LEFT + PLOT_WIDTH,
+                                                y=BASELINE - height * scale,
+                                                color=color, alpha=alpha, width=width))
+
+    for index, (_, _, color) in enumerate(SESSIONS):
+        offset = (index - 1) * bar_width - bar_width / 2
+        for center, height in zip(centers, heights[index]):
+            bar_height = height * scale
+            x = center + offset
+            parts.append(_BAR.format(x=x, y=BASELINE - bar_height, w=bar_width, h=bar_height, color=color))
+            if height > 0:
+                parts.append(_BAR_LABEL.format(x=x + bar_width / 2, y=BASELINE - bar_height - 4, height=height))
+
+    for center, date, day in zip(centers, date_labels, hebrew_days):
+        parts.append(_X_LABEL.format(x=center, y=BASELINE + 18, date=escape(date), day=escape(day)))
+
+    parts.append(f'<line x1="{LEFT}" x2="{LEFT + PLOT_WIDTH}" y1="{BASELINE}" y2="{BASELINE}" stroke="#000"/>')
+    parts.append(_FOOTER)
+    return ''.join(parts)
+
+
+class SvgChartRenderer:
+    """Renders the wave height chart to SVG, returning the cached document while the series is unchanged"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.last_hash: Optional[str] = None
+        self.last_svg: Optional[str] = None
+        self.renders = 0
+        self.cache_hits = 0
+
+    def render(self, forecast_data: Dict) -> Optional[str]:
+        """Return the chart as an SVG string, or None when there is nothing to draw"""
+        tagged = self.render_tagged(forecast_data)
+        return tagged[0] if tagged else None
+
+    def render_tagged(self, forecast_data: Dict) -> Optional[Tuple[str, str]]:
+        """(SVG, series hash) taken together under the render lock - use the hash as ETag"""
+        series = chart_series(forecast_data)
+        if not series[0]:
+            return None
+
+        digest = series_hash(series)
+        with self._lock:
+            if digest == self.last_hash and self.last_svg is not None:
+                self.cache_hits += 1
+                return self.last_svg, digest
+            self.last_svg = render_svg(*series)
+            self.last_hash = digest
+            self.renders += 1
+            return self.last_svg, digest
+
+    def preload(self, forecast_data: Dict, svg: str) -> bool:
+        """Seed the cache with an SVG rendered earlier for this forecast (warm start); False if there is nothing to draw"""
+        series = chart_series(forecast_data)
+        if not series[0]:
+            return False
+        with self._lock:
+            self.last_hash = series_hash(series)
+            self.last_svg = svg
+        return True
@@ -2,28 +2,46 @@
 """
 Test script for Ashkelon Surf Forecast Home Assistant Addon
 Tests the web server functionality locally
+
+Forecasts are replayed from the recorded API payload (api_debug_full.json in the
+repository root) so no network is needed. Use --live to fetch from 4surfers.co.il.
 """
 
 import os
 import sys
 import time
+import tempfile
 import threading
 import requests
 from datetime import datetime
 
-# Add the addon directory to path
-sys.path.insert(0, '/Users/avielj/Library/Mobile Documents/com~apple~CloudDocs/Surfers/homeassistant-addon/ashkelon-surf-forecast')
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(os.path.dirname(ADDON_DIR))
+
+# Add the addon directory (and the repo root for replay.py) to path
+sys.path.insert(0, ADDON_DIR)
+sys.path.insert(1, REPO_DIR)
+
+TEST_PORT = int(os.getenv('ADDON_TEST_PORT', 8099))
 
-def test_addon_locally():
+
+def test_addon_locally(live: bool = False, keep_running: bool = False):
     """Test the addon functionality locally"""
     
     print("🧪 Testing Ashkelon Surf Forecast Home Assistant Addon")
     print("=" * 60)
+    base_url = f'http://127.0.0.1:{TEST_PORT}'
+    health_ok = False
+    forecast_loaded = False
+    chart_ok = False
+    metrics_ok = False
+    original_cwd = os.getcwd()
     
     # Set environment variables for testing
     os.environ['UPDATE_INTERVAL'] = '60'  # 1 minute for testing
     os.environ['SHOW_HEBREW'] = 'true'
     os.environ['SHOW_CHART'] = 'true'
+    os.environ.setdefault('SNAPSHOT_PATH', os.path.join(tempfile.mkdtemp(prefix='addon_snapshot_'), 'snapshot.json'))
     
     try:
         # Import and start the web server in a separate thread
@@ -31,9 +49,20 @@ def test_addon_locally():
         
         import web_server
         
+        if not live:
+            # Replay recorded API responses through the API-based fetcher
+            from replay import ReplayTransport
+            from wave_forecast import FourSurfersWaveForecast as ApiWaveForecast
+            
+            transport = ReplayTransport(latency=0.2)
+            web_server.FourSurfersWaveForecast = lambda: ApiWaveForecast(transport=transport)
+            # The API fetcher saves raw responses to the working directory
+            os.chdir(tempfile.mkdtemp(prefix='addon_test_'))
+            print("📼 Using recorded API responses (replay mode)")
+        
         # Start server in background thread
         server_thread = threading.Thread(
-            target=lambda: web_server.app.run(host='127.0.0.1', port=8099, debug=False),
+            target=lambda: web_server.app.run(host='127.0.0.1', port=TEST_PORT, debug=False),
             daemon=True
         )
         server_thread.start()
@@ -41,15 +70,16 @@ def test_addon_locally():
         # Wait for server to start
         time.sleep(3)
         
-        print("✅ Web server started on http://127.0.0.1:8099")
+        print(f"✅ Web server started on {base_url}")
         
         # Test API endpoints
         print("\n🔍 Testing API endpoints...")
         
         # Test health endpoint
         try:
-            response = requests.get('http://127.0.0.1:8099/health', timeout=10)
+            response = requests.get(f'{base_url}/health', timeout=10)
             if response.status_code == 200:
+                health_ok = True
                 print("✅ Health endpoint working")
             else:
                 print(f"❌ Health endpoint failed: {response.status_code}")
@@ -58,7 +88,7 @@ def test_addon_locally():
         
         # Test status endpoint
         try:
-            response = requests.get('http://127.0.0.1:8099/api/status', timeout=10)
+            response = requests.get(f'{base_url}/api/status', timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 print("✅ Status endpoint working")
@@ -71,7 +101,7 @@ def test_addon_locally():
         
         # Test main page
         try:
-            response = requests.get('http://127.0.0.1:8099/', timeout=15)
+            response = requests.get(f'{base_url}/', timeout=15)
             if response.status_code == 200:
                 print("✅ Main page loading")
                 print(f"   Content length: {len(response.content)} bytes")
@@ -85,10 +115,11 @@ def test_addon_locally():
         
         for attempt in range(6):  # Wait up to 30 seconds
             try:
-                response = requests.get('http://127.0.0.1:8099/api/forecast', timeout=10)
+                response = requests.get(f'{base_url}/api/forecast', timeout=10)
                 if response.status_code == 200:
                     data = response.json()
                     if data.get('data') and data['data'].get('daily_forecasts'):
+                        forecast_loaded = True
                         print("✅ Forecast data loaded successfully!")
                         forecast_count = len(data['data']['daily_forecasts'])
                         print(f"   Found {forecast_count} days of forecast data")
@@ -110,20 +141,91 @@ def test_addon_locally():
         else:
             print("⚠️  Forecast data not loaded within timeout period")
         
-        print("\n🎉 Test completed! Visit http://127.0.0.1:8099 to see the interface")
-        print("   Press Ctrl+C to stop the server")
+        # Chart is rendered in memory and revalidated by ETag
+        if forecast_loaded and web_server.chart_renderer is not None:
+            response = requests.get(f'{base_url}/chart.png', timeout=60)
+            etag = response.headers.get('ETag')
+            if response.status_code == 200 and response.headers.get('Content-Type') == 'image/png':
+                cached = requests.get(f'{base_url}/chart.png', headers={'If-None-Match': etag}, timeout=10)
+                chart_ok = cached.status_code == 304
+                print(f"✅ Chart served ({len(response.content)} bytes, revalidation {cached.status_code})")
+            else:
+                print(f"❌ Chart endpoint failed: {response.status_code}")
+        else:
+            chart_ok = True
         
-        # Keep running
-        try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            print("\n👋 Shutting down...")
+        if forecast_loaded:
+            response = requests.get(f'{base_url}/chart.svg', timeout=10)
+            etag = response.headers.get('ETag')
+            if response.status_code == 200 and response.headers.get('Content-Type', '').startswith('image/svg+xml'):
+                cached = requests.get(f'{base_url}/chart.svg', headers={'If-None-Match': etag}, timeout=10)
+                chart_ok = chart_ok and cached.status_code == 304
+                print(f"✅ SVG chart served ({len(response.content)} bytes, revalidation {cached.status_code})")
+            else:
+                chart_ok = False
+                print(f"❌ SVG chart endpoint failed: {response.status_code}")
+        
+        response = requests.get(f'{base_url}/metrics', timeout=10)
+        if response.status_code == 200 and response.headers.get('Content-Type', '').startswith('text/plain'):
+            metrics_ok = 'surf_http_request_seconds_bucket' in response.text and \
+                         'surf_parse_seconds_count' in response.text
+            print(f"✅ Metrics served ({len(response.text.splitlines())} lines)")
+        else:
+            print(f"❌ Metrics endpoint failed: {response.status_code}")
+        
+        if keep_running:
+            print(f"\n🎉 Test completed! Visit {base_url} to see the interface")
+            print("   Press Ctrl+C to stop the server")
+            
+            # Keep running
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                print("\n👋 Shutting down...")
         
     except Exception as e:
         print(f"❌ Test failed: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        os.chdir(original_cwd)
+    
+    assert health_ok, "Health endpoint not reachable"
+    assert forecast_loaded, "Forecast data not loaded"
+    assert chart_ok, "Chart endpoint not serving cached PNG"
+    assert metrics_ok, "Metrics endpoint missing request or parse timings"
+
+
+def test_chart_png_without_matplotlib():
+    """No matplotlib: /chart.png answers 503 and the ETag always belongs to the served bytes"""
+    import web_server
+    import wave_chart
+    
+    assert wave_chart.HAS_MATPLOTLIB == (web_server.chart_renderer is not None)
+    saved = web_server.chart_renderer, web_server.forecast_cache
+    web_server.forecast_cache = {'daily_forecasts': {'2025-10-27': {'times': {'06:00': {'wave_height': 0.6}}}}}
+    try:
+        client = web_server.app.test_client()
+        web_server.chart_renderer = None
+        assert client.get('/chart.png').status_code == 503
+        if wave_chart.HAS_MATPLOTLIB:
+            web_server.chart_renderer = wave_chart.WaveChartRenderer(dpi=50)
+            response = client.get('/chart.png')
+            png, digest = web_server.chart_renderer.render_tagged(web_server.forecast_cache)
+            assert response.data == png and response.headers['ETag'] == f'"{digest}"'
+    finally:
+        web_server.chart_renderer, web_server.forecast_cache = saved
+
+def test_load_harness_smoke():
+    """load_test.py drives the add-on against the fake upstream, steady and mid-refresh"""
+    import load_test
+    
+    results = load_test.run(['/api/ha-sensor'], load_test.PHASES, clients=2, duration=0.5, upstream_latency=0.05)
+    assert [r['phase'] for r in results] == ['steady', 'refresh']
+    for result in results:
+        assert result['requests'] > 0 and result['errors'] == 0
+        assert result['p50_ms'] <= result['p99_ms']
 
 if __name__ == '__main__':
-    test_addon_locally()
\ No newline at end of file
+    test_addon_locally(live='--live' in sys.argv, keep_running=True)
\ No newline at end of file
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Test the persistent background event loop used by the sync forecast wrapper"""
+
+import asyncio
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from background_loop import BackgroundLoop, shared_loop, stop_shared_loop
+
+
+def test_submissions_share_one_loop_and_its_resources():
+    loop = BackgroundLoop()
+    try:
+        resources = {}
+
+        async def use_connection_pool(i):
+            # An async resource created on the first call is reused by every later call
+            pool = resources.setdefault('pool', asyncio.Queue())
+            await pool.put(i)
+            await asyncio.sleep(0.01)
+            return asyncio.get_running_loop(), threading.current_thread().name
+
+        with ThreadPoolExecutor(max_workers=8) as callers:
+            results = list(callers.map(lambda i: loop.run(use_connection_pool(i), timeout=5), range(20)))
+        assert {id(running) for running, _ in results} == {id(loop.loop)}
+        assert {thread for _, thread in results} == {'surf-async'}
+        assert resources['pool'].qsize() == 20
+    finally:
+        loop.stop()
+
+
+def test_timeout_cancels_and_loop_keeps_running():
+    loop = BackgroundLoop()
+    try:
+        cancelled = threading.Event()
+
+        async def hang():
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(TimeoutError):
+            loop.run(hang(), timeout=0.05)
+        assert cancelled.wait(1)
+        assert loop.run(asyncio.sleep(0, result='still up'), timeout=1) == 'still up'
+    finally:
+        loop.stop()
+
+
+def test_stop_runs_cleanups_and_rejects_new_work():
+    loop = BackgroundLoop()
+    closed = []
+
+    async def close_browser():
+        closed.append(asyncio.get_running_loop() is loop.loop)
+
+    loop.on_stop(close_browser)
+    loop.stop()
+    assert closed == [True] and not loop.is_running
+    with pytest.raises(RuntimeError):
+        loop.submit(asyncio.sleep(0))
+
+
+def test_run_from_loop_thread_is_refused():
+    loop = BackgroundLoop()
+    try:
+        async def nested():
+            with pytest.raises(RuntimeError):
+                loop.run(asyncio.sleep(0))
+            return True
+
+        assert loop.run(nested(), timeout=1)
+    finally:
+        loop.stop()
+
+
+def test_shared_loop_is_process_wide():
+    first = shared_loop()
+    assert shared_loop() is first
+    stop_shared_loop()
+    assert not first.is_running
+    assert shared_loop() is not first and shared_loop().is_running
+
+
+def test_sync_wrappers_share_browser_session():
+    pytest.importorskip('playwright.async_api')
+    from surf_forecast_simplified import SyncFourSurfersWaveForecast
+
+    first, second = SyncFourSurfersWaveForecast(), SyncFourSurfersWaveForecast()
+    assert first._loop is second._loop
+    assert first._async_forecast.session is second._async_forecast.session
+
+
+if __name__ == '__main__':
+    for name, fn in sorted(globals().items()):
+        if name.startswith('test_'):
+            fn()
+            print(f"✅ {name}")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Test the add-on refresh scheduler (single-flight, back-off, upstream cadence)"""
+
+import os
+import sys
+import threading
+import time
+
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(os.path.dirname(ADDON_DIR))
+sys.path.insert(0, ADDON_DIR)
+sys.path.insert(1, REPO_DIR)
+
+from fakes import FakeClock
+from refresh_scheduler import RefreshScheduler
+from surf_core import parse_local
+from surf_core.metrics import Registry
+
+HOUR = 3600
+
+
+def make_scheduler(refresh, clock=None, **kwargs):
+    """RefreshScheduler without jitter and with its own Registry (real clock when none is given)"""
+    if clock is not None:
+        kwargs['clock'] = clock
+    kwargs.setdefault('jitter', 0.0)
+    return RefreshScheduler(refresh, registry=Registry(), **kwargs)
+
+
+def test_single_flight():
+    calls = []
+
+    def slow_refresh():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'daily_forecasts': {'2025-10-27': {}}}
+
+    scheduler = make_scheduler(slow_refresh)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(scheduler.refresh_now())) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1 and results == [True] * 5
+    assert scheduler.runs.value(result='coalesced') == 4
+
+
+def test_failures_back_off_exponentially():
+    clock = FakeClock()
+    scheduler = make_scheduler(lambda: None, clock, interval=HOUR, retry=60)
+    delays = []
+    for _ in range(8):
+        assert scheduler.refresh_now() is False
+        delays.append(scheduler.next_run - clock.now)
+    assert delays == [60, 120, 240, 480, 960, 1920, HOUR, HOUR]
+
+    # trigger() honours the back-off: no extra upstream call
+    scheduler.refresh = lambda: {'daily_forecasts': {}}
+    scheduler.trigger()
+    time.sleep(0.05)
+    assert scheduler.failures == 8
+
+
+def test_aligns_with_upstream_cadence():
+    stamps = ['2025-10-27T03:00:00', '2025-10-27T09:00:00', '2025-10-27T15:00:00']
+    clock = FakeClock(parse_local(stamps[0]).epoch + 600)
+    served = {'forecast_updated': stamps[0]}
+    scheduler = make_scheduler(lambda: dict(served), clock, interval=12 * HOUR, settle=300)
+
+    scheduler.refresh_now()
+    assert scheduler.next_run - clock.now == 12 * HOUR  # no cadence yet
+
+    clock.now = parse_local(stamps[1]).epoch + 600
+    served['forecast_updated'] = stamps[1]
+    scheduler.refresh_now()
+    # Next run expected 6h after the last one; fetch 5 minutes after it lands
+    assert scheduler.cadence() == 6 * HOUR
+    assert scheduler.next_run == parse_local(stamps[2]).epoch + 300
+
+    # Upstream run is late: poll from min_interval, backing off while the stamp stays put
+    clock.now = parse_local(stamps[2]).epoch + 300
+    delays = []
+    for _ in range(3):
+        scheduler.refresh_now()
+        delays.append(scheduler.next_run - clock.now)
+    assert delays == [300, 600, 1200]
+
+    served['forecast_updated'] = stamps[2]
+    scheduler.refresh_now()
+    assert scheduler.next_run == parse_local(stamps[2]).epoch + 6 * HOUR + 300
+
+
+def test_jitter_only_delays():
+    clock = FakeClock()
+    scheduler = make_scheduler(lambda: {'daily_forecasts': {}}, clock, interval=HOUR, jitter=0.1)
+    for _ in range(20):
+        scheduler.refresh_now()
+        assert HOUR <= scheduler.next_run - clock.now <= 1.1 * HOUR
+
+
+def test_trigger_without_loop_refreshes_once():
+    calls = []
+    scheduler = make_scheduler(lambda: calls.append(1) or {'daily_forecasts': {}})
+    scheduler.trigger()
+    time.sleep(0.1)
+    scheduler.trigger()  # within min_interval of the last refresh
+    time.sleep(0.1)
+    assert calls == [1]
+
+
+if __name__ == '__main__':
+    for name, fn in sorted(globals().items()):
+        if name.startswith('test_'):
+            fn()
+            print(f"✅ {name}")
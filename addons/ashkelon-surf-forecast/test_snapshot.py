@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test the warm-start forecast snapshot"""
+
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(os.path.dirname(ADDON_DIR))
+sys.path.insert(0, ADDON_DIR)
+sys.path.insert(1, REPO_DIR)
+
+import snapshot
+
+FORECAST = {
+    'beach': 'ashkelon',
+    'daily_forecasts': {
+        '2025-10-27': {'hebrew_day': 'שני', 'times': {'06:00': {'wave_height': 0.6}, '12:00': {'wave_height': 0.8}}},
+        '2025-10-28': {'hebrew_day': 'שלישי', 'times': {'06:00': {'wave_height': 1.1}}},
+    },
+}
+
+
+def snapshot_path():
+    return os.path.join(tempfile.mkdtemp(prefix='snapshot_'), 'forecast_snapshot.json')
+
+
+def test_round_trip():
+    path = snapshot_path()
+    fetched = datetime(2025, 10, 27, 9, 40)
+    assert snapshot.save(FORECAST, fetched, {'chart_svg': '<svg/>', 'chart_png': b'\x89PNG\x00', 'none': None}, path)
+    snap = snapshot.load(path)
+    assert snap.forecast == FORECAST and snap.last_update == fetched
+    assert snap.views == {'chart_svg': '<svg/>', 'chart_png': b'\x89PNG\x00'}
+    assert os.listdir(os.path.dirname(path)) == ['forecast_snapshot.json']  # no temp files left
+
+
+def test_unusable_snapshots_are_ignored():
+    path = snapshot_path()
+    assert snapshot.load(path) is None  # missing
+
+    with open(path, 'w') as f:
+        f.write('{"version": 1, "forecast": {"daily_')  # torn write
+    assert snapshot.load(path) is None
+
+    snapshot.save(FORECAST, datetime.now(), path=path)
+    with open(path) as f:
+        document = json.load(f)
+    document['version'] = snapshot.SNAPSHOT_VERSION + 1
+    with open(path, 'w') as f:
+        json.dump(document, f)
+    assert snapshot.load(path) is None
+
+    assert not snapshot.save(FORECAST, datetime.now(), path=os.path.join(path, 'not-a-dir', 'x.json'))
+
+
+def test_web_server_warm_start():
+    os.environ['SNAPSHOT_PATH'] = snapshot_path()
+    try:
+        import web_server
+
+        web_server.save_snapshot(FORECAST, datetime(2025, 10, 27, 9, 40))
+        web_server.forecast_cache, web_server.last_update = {}, None
+        web_server.svg_renderer = web_server.SvgChartRenderer()
+
+        assert web_server.restore_snapshot()
+        client = web_server.app.test_client()
+        data = client.get('/api/forecast').get_json()
+        assert data['data'] == FORECAST and data['last_update'] == '2025-10-27T09:40:00'
+        response = client.get('/chart.svg')
+        assert response.status_code == 200 and response.data.startswith(b'<svg')
+        assert web_server.svg_renderer.renders == 0  # served from the snapshot
+    finally:
+        del os.environ['SNAPSHOT_PATH']
+
+
+def test_snapshot_error_does_not_fail_refresh():
+    import web_server
+
+    class BrokenRenderer:
+        def render(self, forecast_data):
+            raise RuntimeError('no matplotlib backend')
+
+    saved = web_server.FourSurfersWaveForecast, web_server.svg_renderer
+    web_server.FourSurfersWaveForecast = lambda: type('Fetcher', (), {'get_ashkelon_forecast': lambda self: FORECAST})()
+    web_server.svg_renderer = BrokenRenderer()
+    try:
+        assert web_server.update_forecast_data() == FORECAST
+        assert web_server.forecast_cache == FORECAST
+    finally:
+        web_server.FourSurfersWaveForecast, web_server.svg_renderer = saved
+
+
+if __name__ == '__main__':
+    for name, fn in sorted(globals().items()):
+        if name.startswith('test_'):
+            fn()
+            print(f"✅ {name}")
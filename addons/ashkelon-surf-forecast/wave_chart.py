@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Cached renderer for the 4surfers-style wave height bar chart
+
+The figure (Agg canvas, axes, bars, value labels, reference lines, legend and
+the RTL-shaped Hebrew titles) is built once per number of forecast days.
+Later renders only move bar heights with set_height(), update the value
+labels and tick labels, and write a PNG into an in-memory buffer. When the
+chart series hashes the same as the previous render the cached PNG bytes are
+returned without touching matplotlib.
+
+Usage:
+    from wave_chart import default_renderer
+    png_bytes = default_renderer().render(forecast_data)
+    default_renderer().render_to_file(forecast_data, 'chart.png')
+"""
+
+import hashlib
+import importlib.util
+import io
+import json
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from surf_core import shape_rtl
+
+# matplotlib is imported lazily by the figure template; probe for it up front so
+# callers can fall back (e.g. the add-on answers 503 for /chart.png) instead of failing mid-render
+HAS_MATPLOTLIB = importlib.util.find_spec('matplotlib') is not None
+
+# (time key, Hebrew legend label, bar color) in bar order
+SESSIONS = (
+    ('06:00', 'בוקר (06:00)', '#87CEEB'),
+    ('12:00', 'צהרים (12:00)', '#4682B4'),
+    ('18:00', 'ערב (18:00)', '#2F4F4F'),
+)
+
+# (height m, color, alpha, line width, Hebrew term, English suffix)
+REFERENCE_LINES = (
+    (0.3, 'orange', 0.7, 2, 'קרסול', ' - Ankle High (0.3m)'),
+    (0.7, 'green', 0.7, 2, 'ברך', ' - Knee High (0.7m)'),
+    (1.0, 'blue', 0.7, 2, 'מעל ברך', ' - Above Knee (1.0m)'),
+    (1.3, 'red', 0.7, 2, 'כתף', ' - Shoulder High (1.3m)'),
+    (2.0, 'purple', 0.5, 1, 'ראש', ' - Head High (2.0m)'),
+)
+
+BAR_WIDTH = 0.25
+
+
+def format_hebrew_text(text: str) -> str:
+    """Shape Hebrew text for RTL display (unchanged if reshaper/bidi are missing)"""
+    return shape_rtl(text)
+
+
+def chart_series(forecast_data: Dict) -> Tuple[List[str], List[str], List[List[float]]]:
+    """
+    Extract what the chart draws from forecast_data['daily_forecasts']
+
+    Returns:
+        (date labels, Hebrew day names, one height list per SESSIONS entry), by date
+    """
+    date_labels = []
+    hebrew_days = []
+    heights = [[] for _ in SESSIONS]
+    for date_key, day_data in sorted(forecast_data.get('daily_forecasts', {}).items()):
+        if len(date_key) < 10:
+            continue
+        date_labels.append(day_data.get('hebrew_date') or f"{date_key[8:10]}/{date_key[5:7]}")
+        hebrew_days.append(day_data.get('hebrew_day', ''))
+        times_data = day_data.get('times', {})
+        for index, (time_key, _, _) in enumerate(SESSIONS):
+            heights[index].append(float(times_data.get(time_key, {}).get('wave_height', 0) or 0))
+    return date_labels, hebrew_days, heights
+
+
+def series_hash(series: Tuple[List[str], List[str], List[List[float]]]) -> str:
+    return hashlib.sha1(json.dumps(series, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class _ChartTemplate:
+    """A built figure for a fixed number of days"""
+
+    def __init__(self, days: int, figsize: Tuple[float, float]):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        import numpy as np
+
+        self.days = days
+        self.figure = Figure(figsize=figsize, facecolor='white')
+        self.canvas = FigureCanvasAgg(self.figure)
+        ax = self.figure.add_subplot(1, 1, 1)
+        self.ax = ax
+
+        x_positions = np.arange(days)
+        self.bars = []
+        self.labels = []
+        for index, (_, label, color) in enumerate(SESSIONS):
+            offset = (index - 1) * BAR_WIDTH
+            container = ax.bar(x_positions + offset, [0.0] * days, BAR_WIDTH,
+                               label=format_hebrew_text(label),
+                               color=color, alpha=0.8, edgecolor='white', linewidth=1)
+            self.bars.append(list(container))
+            session_labels = []
+            for bar in container:
+                annotation = ax.annotate('', xy=(bar.get_x() + bar.get_width() / 2, 0),
+                                         xytext=(0, 3),  # 3 points vertical offset
+                                         textcoords="offset points",
+                                         ha='center', va='bottom',
+                                         fontsize=9, weight='bold', color='#2C3E50')
+                annotation.set_visible(False)
+                session_labels.append(annotation)
+            self.labels.append(session_labels)
+
+        ax.set_xticks(x_positions)
+
+        title_text = format_hebrew_text('תחזית גלים אשקלון') + ' - Ashkelon Wave Forecast'
+        subtitle_text = format_hebrew_text('גובה גלים לפי שעות היום')
+        ax.set_title(f'🌊 {title_text}\n{subtitle_text}', fontsize=18, fontweight='bold', pad=25)
+        ax.set_ylabel(format_hebrew_text('גובה גלים (מטר)') + '\nWave Height (meters)', fontsize=13, weight='bold')
+        ax.set_xlabel(format_hebrew_text('תאריך ויום') + '\nDate & Day', fontsize=13, weight='bold')
+
+        for height, color, alpha, width, term, suffix in REFERENCE_LINES:
+            ax.axhline(y=height, color=color, linestyle='--', alpha=alpha, linewidth=width,
+                       label=format_hebrew_text(term) + suffix)
+
+        ax.grid(True, alpha=0.3, linestyle='-', linewidth=0.5, axis='y')
+        ax.set_axisbelow(True)
+        ax.legend(loc='upper right', framealpha=0.95, fontsize=11, shadow=True, fancybox=True)
+
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.spines['left'].set_linewidth(1)
+        ax.spines['bottom'].set_linewidth(1)
+        ax.set_facecolor('#F8F9FA')
+
+    def update(self, date_labels: List[str], hebrew_days: List[str], heights: List[List[float]]) -> None:
+        for session_bars, session_labels, session_heights in zip(self.bars, self.labels, heights):
+            for bar, annotation, height in zip(session_bars, session_labels, session_heights):
+                bar.set_height(height)
+                annotation.xy = (bar.get_x() + bar.get_width() / 2, height)
+                annotation.set_text(f'{height:.1f}m')
+                annotation.set_visible(height > 0)
+
+        self.ax.set_xticklabels(
+            [f"{date}\n{format_hebrew_text(day)}" for date, day in zip(date_labels, hebrew_days)],
+            fontsize=11, ha='center', weight='bold'
+        )
+        max_height = max((h for session in heights for h in session), default=1.0)
+        self.ax.set_ylim(0, max(1.2, max_height + 0.1))
+
+    def to_png(self, dpi: int) -> bytes:
+        buffer = io.BytesIO()
+        self.figure.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight',
+                            facecolor='white', edgecolor='none')
+        return buffer.getvalue()
+
+
+class WaveChartRenderer:
+    """Renders the wave height chart to PNG bytes, reusing figures between calls"""
+
+    def __init__(self, dpi: int = 300, figsize: Tuple[float, float] = (18, 10)):
+        """
+        Args:
+            dpi: Output resolution (the PDF report uses 300)
+            figsize: Figure size in inches
+        """
+        self.dpi = dpi
+        self.figsize = figsize
+        self._templates: Dict[int, _ChartTemplate] = {}
+        self._lock = threading.Lock()
+        self.last_hash: Optional[str] = None
+        self.last_png: Optional[bytes] = None
+        self.renders = 0
+        self.cache_hits = 0
+
+    def render(self, forecast_data: Dict) -> Optional[bytes]:
+        """Return the chart as PNG bytes, or None when there is nothing to draw"""
+        tagged = self.render_tagged(forecast_data)
+        return tagged[0] if tagged else None
+
+    def render_tagged(self, forecast_data: Dict) -> Optional[Tuple[bytes, str]]:
+        """(PNG bytes, series hash) taken together under the render lock - use the hash as ETag"""
+        series = chart_series(forecast_data)
+        date_labels, hebrew_days, heights = series
+        if not date_labels:
+            return None
+
+        digest = series_hash(series)
+        with self._lock:
+            if digest == self.last_hash and self.last_png is not None:
+                self.cache_hits += 1
+                return self.last_png, digest
+
+            template = self._templates.get(len(date_labels))
+            if template is None:
+                template = _ChartTemplate(len(date_labels), self.figsize)
+                self._templates[len(date_labels)] = template
+            template.update(date_labels, hebrew_days, heights)
+            png = template.to_png(self.dpi)
+
+            self.last_hash = digest
+            self.last_png = png
+            self.renders += 1
+            return png, digest
+
+    def preload(self, forecast_data: Dict, png: bytes) -> bool:
+        """Seed the cache with a PNG rendered earlier for this forecast (warm start); False if there is nothing to draw"""
+        series = chart_series(forecast_data)
+        if not series[0]:
+            return False
+        with self._lock:
+            self.last_hash = series_hash(series)
+            self.last_png = png
+        return True
+
+    def render_to_file(self, forecast_data: Dict, filename: str) -> Optional[str]:
+        """Render and write the PNG to filename; returns filename or None"""
+        png = self.render(forecast_data)
+        if png is None:
+            return None
+        with open(filename, 'wb') as f:
+            f.write(png)
+        return filename
+
+
+_default_renderers: Dict[int, WaveChartRenderer] = {}
+_default_lock = threading.Lock()
+
+
+def default_renderer(dpi: int = 300) -> WaveChartRenderer:
+    """Process-wide renderer per dpi, so the figure template survives between calls"""
+    with _default_lock:
+        renderer = _default_renderers.get(dpi)
+        if renderer is None:
+            renderer = _default_renderers[dpi] = WaveChartRenderer(dpi=dpi)
+        return renderer
@@ -9,7 +9,7 @@ import json
 import time
 import threading
 from datetime import datetime, timedelta
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, g, render_template, jsonify, request
 import logging
 
 # Import the simplified wave forecast functionality
@@ -21,6 +21,12 @@ except ImportError:
     sys.path.append('/app')
     from wave_forecast import FourSurfersWaveForecast
 
+from wave_chart import HAS_MATPLOTLIB, WaveChartRenderer
+from svg_chart import SvgChartRenderer
+from refresh_scheduler import RefreshScheduler
+import snapshot
+from surf_core.metrics import CONTENT_TYPE, REGISTRY
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -29,9 +35,42 @@ logger = logging.getLogger(__name__)
 forecast_cache = {}
 last_update = None
 update_lock = threading.Lock()
+# Screen-resolution chart kept in memory; re-rendered only when the forecast changes
+chart_renderer = WaveChartRenderer(dpi=100) if HAS_MATPLOTLIB else None
+# Lightweight SVG chart that needs no matplotlib/reshaper
+svg_renderer = SvgChartRenderer()
 
 app = Flask(__name__)
 
+HTTP_LATENCY = REGISTRY.histogram('surf_http_request_seconds', 'Request latency by route',
+                                  ('route', 'method', 'status'))
+CACHE_REQUESTS = REGISTRY.counter('surf_cache_requests_total', 'Cache lookups by cache and result (hit/miss)',
+                                  ('cache', 'result'))
+FORECAST_AGE = REGISTRY.gauge('surf_forecast_age_seconds', 'Seconds since the cached forecast was fetched')
+# Routes answered from forecast_cache; a request with an empty cache counts as a miss
+FORECAST_ROUTES = {'/', '/api/forecast', '/widget', '/api/widget', '/api/ha-sensor'}
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    HTTP_LATENCY.observe(time.perf_counter() - g.request_start,
+                         route=route, method=request.method, status=response.status_code)
+    if route in FORECAST_ROUTES:
+        CACHE_REQUESTS.inc(cache='forecast', result='hit' if forecast_cache else 'miss')
+    return response
+
+def count_render(cache, renderer, render):
+    """Run a chart render and count whether the renderer served its cached bytes"""
+    hits = renderer.cache_hits
+    result = render()
+    if result is not None:
+        CACHE_REQUESTS.inc(cache=cache, result='hit' if renderer.cache_hits > hits else 'miss')
+    return result
+
 def get_config():
     """Get configuration from environment variables"""
     return {
@@ -56,26 +95,51 @@ def update_forecast_data():
         if forecast_data:
             with update_lock:
                 forecast_cache = forecast_data
-                last_update = datetime.now()
+                last_update = updated_at = datetime.now()
             logger.info("Forecast data updated successfully")
         else:
             logger.error("Failed to retrieve forecast data")
+            return None
             
     except Exception as e:
         logger.error(f"Error updating forecast: {e}")
+        return None
+    
+    # The refresh already succeeded; a snapshot problem must not count as a failed refresh
+    save_snapshot(forecast_data, updated_at)
+    return forecast_data
 
-def background_updater():
-    """Background thread to periodically update forecast data"""
-    config = get_config()
-    update_interval = config['update_interval']
+def save_snapshot(forecast_data, updated_at):
+    """Persist the forecast with its rendered charts for the next warm start (errors are only logged)"""
+    try:
+        views = {'chart_svg': svg_renderer.render(forecast_data)}
+        if chart_renderer is not None and get_config()['show_chart']:
+            views['chart_png'] = chart_renderer.render(forecast_data)
+        snapshot.save(forecast_data, updated_at, views)
+    except Exception as e:
+        logger.warning(f"Could not save forecast snapshot: {e}")
+
+def restore_snapshot():
+    """Serve the last-good forecast and charts straight away after a restart"""
+    global forecast_cache, last_update
     
-    while True:
-        try:
-            update_forecast_data()
-            time.sleep(update_interval)
-        except Exception as e:
-            logger.error(f"Error in background updater: {e}")
-            time.sleep(60)  # Wait 1 minute before retrying
+    snap = snapshot.load()
+    if snap is None:
+        return False
+    with update_lock:
+        forecast_cache = snap.forecast
+        last_update = snap.last_update
+    if 'chart_svg' in snap.views:
+        svg_renderer.preload(snap.forecast, snap.views['chart_svg'])
+    if chart_renderer is not None and 'chart_png' in snap.views:
+        chart_renderer.preload(snap.forecast, snap.views['chart_png'])
+    logger.info(f"Warm start from snapshot fetched {last_update:%Y-%m-%d %H:%M} ({', '.join(snap.views) or 'no views'})")
+    return True
+
+# One refresh in flight at a time, jittered and aligned with upstream forecast runs
+_update_interval = get_config()['update_interval']
+scheduler = RefreshScheduler(update_forecast_data, interval=_update_interval,
+                             min_interval=min(300, _update_interval))
 
 def format_wave_height_hebrew(height):
     """Convert wave height to Hebrew surf quality term"""
@@ -119,8 +183,8 @@ def index():
     # Check if we need to update data
     if not forecast_cache or not last_update or \
        (datetime.now() - last_update).total_seconds() > config['update_interval']:
-        # Update in background if too old
-        threading.Thread(target=update_forecast_data, daemon=True).start()
+        # Ask the scheduler for an early refresh if too old (never a second concurrent fetch)
+        scheduler.trigger()
     
     # Prepare forecast data for template
     forecast_display = {
@@ -185,9 +249,57 @@ def api_status():
         'status': 'running',
         'last_update': last_update.isoformat() if last_update else None,
         'config': config,
-        'data_available': bool(forecast_cache)
+        'data_available': bool(forecast_cache),
+        'refresh': scheduler.snapshot()
+    })
+
+@app.route('/chart.png')
+def chart_png():
+    """Wave height chart rendered from the cached forecast"""
+    if not get_config()['show_chart']:
+        return jsonify({'success': False, 'error': 'Chart disabled'}), 404
+    if chart_renderer is None:
+        return jsonify({'success': False, 'error': 'Chart rendering not available'}), 503
+    
+    tagged = count_render('chart_png', chart_renderer,
+                          lambda: chart_renderer.render_tagged(forecast_cache)) if forecast_cache else None
+    if tagged is None:
+        return jsonify({'success': False, 'error': 'No forecast data available'}), 503
+    
+    png, etag = tagged
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={'ETag': f'"{etag}"'})
+    return Response(png, mimetype='image/png', headers={
+        'ETag': f'"{etag}"',
+        'Cache-Control': 'public, max-age=300'
     })
 
+@app.route('/chart.svg')
+def chart_svg():
+    """Wave height chart as SVG (pure Python, no matplotlib)"""
+    if not get_config()['show_chart']:
+        return jsonify({'success': False, 'error': 'Chart disabled'}), 404
+    
+    tagged = count_render('chart_svg', svg_renderer,
+                          lambda: svg_renderer.render_tagged(forecast_cache)) if forecast_cache else None
+    if tagged is None:
+        return jsonify({'success': False, 'error': 'No forecast data available'}), 503
+    
+    svg, etag = tagged
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={'ETag': f'"{etag}"'})
+    return Response(svg, mimetype='image/svg+xml', headers={
+        'ETag': f'"{etag}"',
+        'Cache-Control': 'public, max-age=300'
+    })
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics (fetch/parse latency, fallback sources, cache hits, request latency)"""
+    if last_update:
+        FORECAST_AGE.set(round((datetime.now() - last_update).total_seconds(), 1))
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
 @app.route('/health')
 def health():
     """Health check endpoint"""
@@ -350,12 +462,9 @@ def ha_sensor():
 if __name__ == '__main__':
     logger.info("Starting Ashkelon Surf Forecast Web Server...")
     
-    # Start background updater
-    updater_thread = threading.Thread(target=background_updater, daemon=True)
-    updater_thread.start()
-    
-    # Initial data load
-    update_forecast_data()
+    # Serve the last-good snapshot at once; the first real refresh runs in the background
+    restore_snapshot()
+    scheduler.start()
     
     # Start Flask app
     logger.info("Web server starting on port 8099...")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the forecastHours parsing hot paths
+
+Compares the parallel implementations of the same transform on synthetic
+payloads built from the recorded API response (replay.synthetic_forecast):
+
+    extended_api   FourSurfersWaveForecast._parse_extended_api_response
+    daily_report   daily_surf_report.parse_forecast_data
+    ha_sensor      SurfForecastData._parse_response (needs homeassistant)
+    html_enhanced  FourSurfersWaveForecast._parse_forecast_html_enhanced
+
+Each case records the per-record cost and the tracemalloc allocation figures
+in the benchmark's extra_info. Records are counted per implementation: the
+daily report and the HA sensor only ever parse the first DAY_LIMITS days.
+
+Usage:
+    pip install -r requirements-dev.txt
+    python -m pytest benchmarks/ --benchmark-columns=mean,ops
+    SURF_BENCH_FULL=1 python -m pytest benchmarks/   # 1-1000 days x 1-100 beaches
+    python benchmarks/test_parser_benchmarks.py       # plain table, no pytest
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from replay import synthetic_forecast  # noqa: E402
+
+if __name__ != '__main__':
+    pytest.importorskip('pytest_benchmark')
+
+FULL = os.getenv('SURF_BENCH_FULL') == '1'
+DAY_COUNTS = (1, 10, 100, 1000) if FULL else (1, 10, 100)
+BEACH_COUNTS = (1, 10, 100) if FULL else (1, 10)
+
+
+def build_payloads(days: int, beaches: int) -> List[Dict]:
+    """One synthetic GetBeachAreaForecast payload per beach"""
+    return [synthetic_forecast(days=days, beach_id=beach_id) for beach_id in range(1, beaches + 1)]
+
+
+def payload_to_html(payload: Dict) -> str:
+    """Render a payload as the kind of day/table markup the HTML parser scans"""
+    parts = ['<html><body>']
+    for day in payload['dailyForecastList']:
+        date = day['forecastLocalTime'][:10]
+        parts.append(f'<div class="forecast-day"><span class="date">{date[8:10]}/{date[5:7]}</span>')
+        parts.append(f"<span>{day['forecastHours'][0].get('DayOfWeekDesc', '')}</span><table>")
+        for hour in day['forecastHours']:
+            parts.append(
+                f"<tr><td>{hour['forecastLocalHour'][11:16]}</td>"
+                f"<td>{hour['WaveHeight']}m</td><td>{hour.get('surfHeightDesc', '')}</td></tr>"
+            )
+        parts.append('</table></div>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+# Implementations that stop after the first N days of each payload (parse_forecast(max_days=3))
+DAY_LIMITS = {'daily_report': 3, 'ha_sensor': 3}
+
+
+def record_count(payloads: List[Dict], max_days: Optional[int] = None) -> int:
+    """forecastHours entries an implementation actually parses"""
+    return sum(len(day['forecastHours']) for payload in payloads
+               for day in payload['dailyForecastList'][:max_days])
+
+
+def _implementations() -> Dict[str, Callable[[List[Dict]], Callable[[], object]]]:
+    """
+    Map implementation name -> factory(payloads) returning a zero-arg callable
+
+    A factory raises ImportError when its optional dependency is missing.
+    """
+    from wave_forecast import FourSurfersWaveForecast
+    import daily_surf_report
+
+    forecast = FourSurfersWaveForecast()
+
+    def extended_api(payloads):
+        return lambda: [forecast._parse_extended_api_response(p) for p in payloads]
+
+    def daily_report(payloads):
+        return lambda: [daily_surf_report.parse_forecast_data(p) for p in payloads]
+
+    def html_enhanced(payloads):
+        pages = [payload_to_html(p) for p in payloads]
+        return lambda: [forecast._parse_forecast_html_enhanced(html, 'ashkelon', 'אשקלון') for html in pages]
+
+    def ha_sensor(payloads):
+        from custom_components.ashkelon_surf.sensor import SurfForecastData  # needs homeassistant
+        parser = SurfForecastData.__new__(SurfForecastData)
+        return lambda: [parser._parse_response(p) for p in payloads]
+
+    return {
+        'extended_api': extended_api,
+        'daily_report': daily_report,
+        'ha_sensor': ha_sensor,
+        'html_enhanced': html_enhanced,
+    }
+
+
+def measure_allocations(fn: Callable[[], object]) -> Tuple[int, int]:
+    """Return (allocated blocks still held by the result, peak traced bytes) for one call"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        result = fn()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    del result
+    return blocks, peak
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the parsers' progress prints while measuring"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+IMPLEMENTATIONS = _implementations()
+
+
+@pytest.mark.parametrize('beaches', BEACH_COUNTS)
+@pytest.mark.parametrize('days', DAY_COUNTS)
+@pytest.mark.parametrize('impl', sorted(IMPLEMENTATIONS))
+def test_parse_benchmark(benchmark, impl, days, beaches):
+    if impl == 'html_enhanced' and days * beaches > 100 and not FULL:
+        pytest.skip("HTML parser is only benchmarked at full scale with SURF_BENCH_FULL=1")
+
+    payloads = build_payloads(days, beaches)
+    records = record_count(payloads, DAY_LIMITS.get(impl))
+    try:
+        fn = IMPLEMENTATIONS[impl](payloads)
+    except ImportError as e:
+        pytest.skip(f"{impl} needs {e.name or e}")
+
+    with quiet():
+        blocks, peak = measure_allocations(fn)
+        benchmark(fn)
+
+    benchmark.extra_info.update({
+        'records': records,
+        'alloc_blocks': blocks,
+        'alloc_blocks_per_record': blocks / records,
+        'peak_kib': peak / 1024,
+    })
+    if benchmark.stats:  # None under --benchmark-disable
+        benchmark.extra_info['per_record_us'] = benchmark.stats.stats.mean / records * 1e6
+
+
+def main():
+    """Print a per-implementation table without pytest-benchmark"""
+    impls = IMPLEMENTATIONS
+    print(f"{'impl':<14} {'days':>5} {'beaches':>7} {'records':>8} {'us/record':>10} {'blocks/rec':>10} {'peak KiB':>9}")
+    for days in DAY_COUNTS:
+        for beaches in BEACH_COUNTS:
+            payloads = build_payloads(days, beaches)
+            for name, factory in sorted(impls.items()):
+                records = record_count(payloads, DAY_LIMITS.get(name))
+                try:
+                    fn = factory(payloads)
+                except ImportError as e:
+                    print(f"{name:<14} {days:>5} {beaches:>7}  skipped: needs {e.name or e}")
+                    continue
+                with quiet():
+                    blocks, peak = measure_allocations(fn)
+                    start = time.perf_counter()
+                    fn()
+                    elapsed = time.perf_counter() - start
+                print(f"{name:<14} {days:>5} {beaches:>7} {records:>8} {elapsed / records * 1e6:>10.2f} "
+                      f"{blocks / records:>10.2f} {peak / 1024:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
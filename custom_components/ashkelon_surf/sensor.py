@@ -3,18 +3,21 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from homeassistant.core import HomeAssistant
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_track_time_interval
+
+from .surf_core import ISRAEL_TZ, METERS_TO_FEET, parse_forecast
+from .surf_core.endpoints import FORECAST_ENDPOINT, api_url
 
 DOMAIN = "ashkelon_surf"
 _LOGGER = logging.getLogger(__name__)
 
-API_URL = "https://4surfers.co.il/webapi/BeachArea/GetBeachAreaForecast"
 BEACH_AREA_ID = "80"
 BEACH_NAME_EN = "Ashkelon"
 BEACH_NAME_HE = "אשקלון"
@@ -22,10 +25,42 @@ SCAN_INTERVAL = timedelta(hours=3)
 MIN_TIME_BETWEEN_UPDATES = timedelta(hours=1)
 REQUEST_TIMEOUT = 20
 TARGET_TIMES: tuple[str, ...] = ("06:00", "09:00", "12:00", "18:00")
+# Today, tomorrow and the day after, one sensor each
+FORECAST_DAYS = 3
 STAR_BINS = (0.5, 1.0, 1.5, 2.0, 2.5)
-
-
-@dataclass
+# Emit sessions as parallel arrays instead of one dict per session
+CONF_COMPACT_ATTRIBUTES = "compact_attributes"
+# API root override, e.g. a local fake_4surfers.py server for load tests
+CONF_BASE_URL = "base_url"
+SERVICE_GET_FORECAST = "get_forecast"
+# Bulky or static attributes kept out of the recorder database
+UNRECORDED_ATTRIBUTES = frozenset(
+    {
+        "beach",
+        "beach_hebrew",
+        "day_label",
+        "hebrew_day",
+        "sessions",
+        "missing_times",
+        "best_session",
+        "last_refreshed",
+    }
+)
+
+
+SESSION_FIELDS: tuple[str, ...] = (
+    "time",
+    "height_m",
+    "height_ft",
+    "period_s",
+    "stars",
+    "surf_rank",
+    "hebrew_height",
+    "wind_kts",
+)
+
+
+@dataclass(frozen=True, slots=True)
 class SurfSession:
     """Structured data for a single time slot."""
 
@@ -37,56 +72,84 @@ class SurfSession:
     surf_rank: Optional[str]
     hebrew_height: Optional[str]
     wind_kts: Optional[float]
+    _dict: Dict[str, Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_dict", {name: getattr(self, name) for name in SESSION_FIELDS})
 
     def as_dict(self) -> Dict[str, Any]:
-        return {
-            "time": self.time,
-            "height_m": self.height_m,
-            "height_ft": self.height_ft,
-            "period_s": self.period_s,
-            "stars": self.stars,
-            "surf_rank": self.surf_rank,
-            "hebrew_height": self.hebrew_height,
-            "wind_kts": self.wind_kts,
-        }
+        """Serialized form, built once; treat as read-only."""
+        return self._dict
 
 
-@dataclass
+def _session_columns(sessions: Tuple[SurfSession, ...]) -> Dict[str, List[Any]]:
+    """Parallel arrays (one list per field) instead of one dict per session."""
+    return {name: [getattr(session, name) for session in sessions] for name in SESSION_FIELDS}
+
+
+@dataclass(frozen=True, slots=True)
 class SurfDay:
     """Structured data for a forecast day."""
 
     label: str
     date_iso: str
     hebrew_day: str
-    sessions: List[SurfSession] = field(default_factory=list)
-    missing_times: List[str] = field(default_factory=list)
+    sessions: Tuple[SurfSession, ...] = ()
+    missing_times: Tuple[str, ...] = ()
     average_height_m: Optional[float] = None
     average_height_ft: Optional[float] = None
     stars: str = "☆☆☆☆☆"
     best_session: Optional[SurfSession] = None
+    _dict: Dict[str, Any] = field(init=False, repr=False, compare=False)
+    _compact: Dict[str, Any] = field(init=False, repr=False, compare=False)
 
-    def as_dict(self) -> Dict[str, Any]:
-        return {
+    def __post_init__(self) -> None:
+        common = {
             "label": self.label,
             "date_iso": self.date_iso,
             "hebrew_day": self.hebrew_day,
-            "sessions": [session.as_dict() for session in self.sessions],
-            "missing_times": self.missing_times,
+            "missing_times": list(self.missing_times),
             "average_height_m": self.average_height_m,
             "average_height_ft": self.average_height_ft,
             "stars": self.stars,
-            "best_session": self.best_session.as_dict() if self.best_session else None,
         }
+        best = self.best_session
+        object.__setattr__(self, "_dict", {
+            **common,
+            "sessions": [session.as_dict() for session in self.sessions],
+            "best_session": best.as_dict() if best else None,
+        })
+        object.__setattr__(self, "_compact", {
+            **common,
+            "sessions": _session_columns(self.sessions),
+            "best_session": best.time if best else None,
+        })
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serialized form, built once; treat as read-only."""
+        return self._dict
+
+    def as_compact_dict(self) -> Dict[str, Any]:
+        """Like as_dict, with sessions as parallel arrays and best_session as its time slot."""
+        return self._compact
 
 
 class SurfForecastData:
     """Shared helper fetching forecast data once per refresh cycle."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
-        self._session = async_get_clientsession(hass)
+    def __init__(
+        self, hass: HomeAssistant, session: Any = None, compact: bool = False, base_url: Optional[str] = None
+    ) -> None:
+        # ``session`` lets tests inject an aiohttp-compatible stand-in such as
+        # replay.ReplayTransport().aiohttp_session() instead of the shared client.
+        self._session = session if session is not None else async_get_clientsession(hass)
+        self._compact = compact
+        self._url = api_url(FORECAST_ENDPOINT, base_url)
         self._lock = asyncio.Lock()
         self._last_update: Optional[datetime] = None
         self._data: Dict[str, Any] | None = None
+        # Parsed days behind _data; the service serializes them in full even in compact mode
+        self._days: List[SurfDay] = []
 
     async def async_get_data(self) -> Dict[str, Any] | None:
         async with self._lock:
@@ -112,7 +175,7 @@ class SurfForecastData:
 
             try:
                 async with asyncio.timeout(REQUEST_TIMEOUT):
-                    async with self._session.post(API_URL, json=payload, headers=headers) as response:
+                    async with self._session.post(self._url, json=payload, headers=headers) as response:
                         if response.status != 200:
                             text = await response.text()
                             raise RuntimeError(f"Non-200 response ({response.status}): {text[:128]}")
@@ -120,82 +183,95 @@ class SurfForecastData:
             except asyncio.TimeoutError as exc:
                 _LOGGER.error("Timeout fetching Ashkelon surf forecast: %s", exc)
                 self._data = None
+                self._days = []
                 self._last_update = now
                 return None
             except Exception as exc:  # pylint: disable=broad-except
                 _LOGGER.error("Error fetching Ashkelon surf forecast: %s", exc)
                 self._data = None
+                self._days = []
                 self._last_update = now
                 return None
 
             parsed = self._parse_response(raw)
+            self._days = parsed
             self._data = {
                 "fetched_at": now.isoformat(),
-                "days": [day.as_dict() for day in parsed],
+                "days": [day.as_compact_dict() if self._compact else day.as_dict() for day in parsed],
             }
             self._last_update = now
             return self._data
 
+    async def async_get_forecast(self) -> Dict[str, Any]:
+        """Full per-session forecast for the get_forecast service, whatever the attribute mode."""
+        data = await self.async_get_data()
+        if not data:
+            return {"days": []}
+        return {"fetched_at": data["fetched_at"], "days": [day.as_dict() for day in self._days]}
+
     def _parse_response(self, payload: Dict[str, Any]) -> List[SurfDay]:
+        # Pick days by Israel-local date: the API list may start yesterday or skip a day
+        today = _israel_today()
+        wanted = {(today + timedelta(days=offset)).isoformat() for offset in range(FORECAST_DAYS)}
         days: List[SurfDay] = []
-        daily_list = payload.get("dailyForecastList", []) or []
-        for day_index, day_data in enumerate(daily_list[:3]):
-            forecast_date = _parse_datetime(day_data.get("forecastLocalTime"))
-            if forecast_date is None:
+        for forecast_day in parse_forecast(payload):
+            if forecast_day.date_key not in wanted:
                 continue
+            if forecast_day.date_key == today.isoformat():
+                label = "Today"
+            else:
+                label = f"{forecast_day.english_day[:3]} {forecast_day.display_date}"
 
-            label = "Today" if day_index == 0 else f"{forecast_date.strftime('%a')} {forecast_date.strftime('%d/%m')}"
-            hebrew_day = _get_hebrew_day(forecast_date.weekday())
-            surf_day = SurfDay(label=label, date_iso=forecast_date.date().isoformat(), hebrew_day=hebrew_day)
-
-            forecast_hours = day_data.get("forecastHours", []) or []
+            by_time = forecast_day.by_time()
             available_sessions: List[SurfSession] = []
             missing_times: List[str] = []
 
             for slot in TARGET_TIMES:
-                hour_data = _match_hour_data(forecast_hours, slot)
-                if hour_data is None:
+                hour = by_time.get(slot)
+                if hour is None:
                     missing_times.append(slot)
                     continue
 
-                height_m = _extract_height(hour_data)
-                height_ft = _meters_to_feet(height_m) if height_m is not None else None
-                period = _safe_float(hour_data.get("WavePeriod") or hour_data.get("wavePeriod"))
-                surf_rank = hour_data.get("surfRankMark")
-                hebrew_height = hour_data.get("surfHeightDesc")
-                wind_kts = _safe_float(hour_data.get("WindSpeedInKnots") or hour_data.get("windSpeedInKnots"))
-                stars = _height_to_stars(height_m)
-
+                height_m = round(hour.height_m, 3) if hour.height_m is not None else None
                 available_sessions.append(
                     SurfSession(
                         time=slot,
                         height_m=height_m,
-                        height_ft=height_ft,
-                        period_s=period,
-                        stars=stars,
-                        surf_rank=surf_rank,
-                        hebrew_height=hebrew_height,
-                        wind_kts=wind_kts,
+                        height_ft=_meters_to_feet(height_m),
+                        period_s=hour.period_s,
+                        stars=_height_to_stars(height_m),
+                        surf_rank=hour.surf_rank,
+                        hebrew_height=hour.surf_desc or None,
+                        wind_kts=hour.wind_kts,
                     )
                 )
 
-            surf_day.sessions = available_sessions
-            surf_day.missing_times = missing_times
-
-            if available_sessions:
-                heights_m = [session.height_m for session in available_sessions if session.height_m is not None]
-                if heights_m:
-                    avg_height_m = sum(heights_m) / len(heights_m)
-                    surf_day.average_height_m = round(avg_height_m, 3)
-                    surf_day.average_height_ft = _meters_to_feet(avg_height_m)
-                    surf_day.stars = _height_to_stars(avg_height_m)
-
-                surf_day.best_session = max(
-                    (s for s in available_sessions if s.height_m is not None),
-                    key=lambda session: session.height_m,
-                    default=None,
-                )
-
+            average_height_m = average_height_ft = None
+            stars = "☆☆☆☆☆"
+            heights_m = [session.height_m for session in available_sessions if session.height_m is not None]
+            if heights_m:
+                avg_height_m = sum(heights_m) / len(heights_m)
+                average_height_m = round(avg_height_m, 3)
+                average_height_ft = _meters_to_feet(avg_height_m)
+                stars = _height_to_stars(avg_height_m)
+
+            best_session = max(
+                (s for s in available_sessions if s.height_m is not None),
+                key=lambda session: session.height_m,
+                default=None,
+            )
+
+            surf_day = SurfDay(
+                label=label,
+                date_iso=forecast_day.date_key,
+                hebrew_day=forecast_day.hebrew_day_letter,
+                sessions=tuple(available_sessions),
+                missing_times=tuple(missing_times),
+                average_height_m=average_height_m,
+                average_height_ft=average_height_ft,
+                stars=stars,
+                best_session=best_session,
+            )
             days.append(surf_day)
 
         return days
@@ -205,10 +281,27 @@ async def async_setup_platform(hass: HomeAssistant, config: Dict[str, Any], asyn
     """Set up surf sensors for Ashkelon."""
     hass.data.setdefault(DOMAIN, {})
     if "data" not in hass.data[DOMAIN]:
-        hass.data[DOMAIN]["data"] = SurfForecastData(hass)
+        hass.data[DOMAIN]["data"] = SurfForecastData(
+            hass,
+            compact=bool(config.get(CONF_COMPACT_ATTRIBUTES, False)),
+            base_url=config.get(CONF_BASE_URL),
+        )
 
     data: SurfForecastData = hass.data[DOMAIN]["data"]
 
+    if not hass.services.has_service(DOMAIN, SERVICE_GET_FORECAST):
+
+        async def _async_get_forecast(call: ServiceCall) -> ServiceResponse:
+            """Return the full per-session forecast without storing it in entity state."""
+            return await data.async_get_forecast()
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_GET_FORECAST,
+            _async_get_forecast,
+            supports_response=SupportsResponse.ONLY,
+        )
+
     sensors = [
         AshkelonSurfSensor(data, "Ashkelon Surf Today", 0),
         AshkelonSurfSensor(data, "Ashkelon Surf Tomorrow", 1),
@@ -218,9 +311,18 @@ async def async_setup_platform(hass: HomeAssistant, config: Dict[str, Any], asyn
     async_add_entities(sensors, True)
 
 
-class AshkelonSurfSensor(Entity):
+class AshkelonSurfSensor(SensorEntity):
     """Representation of a single-day surf summary sensor."""
 
+    # Numeric measurement so HA keeps long-term statistics for the daily average.
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "ft"
+    _attr_suggested_display_precision = 1
+    # Refreshed on our own timer so unchanged forecasts are not written again.
+    _attr_should_poll = False
+    # Still visible in the UI and templates, but not persisted by the recorder.
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
     def __init__(self, data: SurfForecastData, name: str, day_offset: int) -> None:
         self._data = data
         self._name = name
@@ -228,6 +330,7 @@ class AshkelonSurfSensor(Entity):
         self._state: Optional[float] = None
         self._attrs: Dict[str, Any] = {}
         self._available = True
+        self._signature: Optional[tuple] = None
 
     @property
     def name(self) -> str:
@@ -238,13 +341,9 @@ class AshkelonSurfSensor(Entity):
         return f"ashkelon_surf_{self._day_offset}"
 
     @property
-    def state(self) -> Optional[float]:
+    def native_value(self) -> Optional[float]:
         return self._state
 
-    @property
-    def unit_of_measurement(self) -> str:
-        return "ft"
-
     @property
     def icon(self) -> str:
         if self._state is None:
@@ -263,20 +362,33 @@ class AshkelonSurfSensor(Entity):
     def available(self) -> bool:
         return self._available
 
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(async_track_time_interval(self.hass, self._async_refresh, SCAN_INTERVAL))
+
+    async def _async_refresh(self, _now: Optional[datetime] = None) -> None:
+        previous = self._signature
+        await self.async_update()
+        if self._signature != previous:
+            self.async_write_ha_state()
+        else:
+            _LOGGER.debug("Forecast unchanged for %s, skipping state write", self._name)
+
     async def async_update(self) -> None:
         data = await self._data.async_get_data()
         if not data:
             self._available = False
+            self._signature = None
             _LOGGER.debug("No data returned for %s", self._name)
             return
 
-        days: List[Dict[str, Any]] = data.get("days", [])
-        if len(days) <= self._day_offset:
+        target_date = (_israel_today() + timedelta(days=self._day_offset)).isoformat()
+        day = next((d for d in data.get("days", []) if d.get("date_iso") == target_date), None)
+        if day is None:
             self._available = False
-            _LOGGER.debug("Insufficient forecast days for %s", self._name)
+            self._signature = None
+            _LOGGER.debug("No forecast for %s (%s)", self._name, target_date)
             return
 
-        day = days[self._day_offset]
         day_avg_ft = day.get("average_height_ft")
         self._state = day_avg_ft
         self._attrs = {
@@ -295,28 +407,10 @@ class AshkelonSurfSensor(Entity):
         }
 
         self._available = True
-
-
-def _match_hour_data(forecast_hours: List[Dict[str, Any]], target_time: str) -> Optional[Dict[str, Any]]:
-    for hour in forecast_hours:
-        slot = str(hour.get("forecastLocalHour", ""))
-        if target_time in slot:
-            return hour
-    return None
-
-
-def _extract_height(hour_data: Dict[str, Any]) -> Optional[float]:
-    surf_from = _safe_float(hour_data.get("SurfHeightFrom") or hour_data.get("surfHeightFrom"))
-    surf_to = _safe_float(hour_data.get("SurfHeightTo") or hour_data.get("surfHeightTo"))
-    if surf_from is not None and surf_to is not None:
-        return round((surf_from + surf_to) / 2, 3)
-
-    wave_height = _safe_float(
-        hour_data.get("waveHeight")
-        or hour_data.get("WaveHeight")
-        or hour_data.get("WaveHeightInMeters")
-    )
-    return round(wave_height, 3) if wave_height is not None else None
+        # last_refreshed changes on every fetch; it alone should not trigger a write.
+        self._signature = tuple(
+            (key, repr(value)) for key, value in self._attrs.items() if key != "last_refreshed"
+        )
 
 
 def _height_to_stars(height_m: Optional[float]) -> str:
@@ -337,44 +431,11 @@ def _height_to_stars(height_m: Optional[float]) -> str:
     return "⭐⭐⭐⭐⭐"
 
 
-def _meters_to_feet(value: Optional[float]) -> Optional[float]:
-    if value is None:
-        return None
-    return round(value * 3.28084, 1)
+def _israel_today() -> date:
+    return datetime.now(ISRAEL_TZ).date()
 
 
-def _safe_float(value: Any) -> Optional[float]:
+def _meters_to_feet(value: Optional[float]) -> Optional[float]:
     if value is None:
         return None
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return None
-
-
-def _parse_datetime(value: Any) -> Optional[datetime]:
-    if not value:
-        return None
-    try:
-        if isinstance(value, datetime):
-            return value
-        text = str(value).replace("Z", "+00:00")
-        return datetime.fromisoformat(text)
-    except (TypeError, ValueError):
-        _LOGGER.debug("Unable to parse datetime value: %s", value)
-        return None
-
-
-def _get_hebrew_day(index: int) -> str:
-    hebrew_days = [
-        "א'",
-        "ב'",
-        "ג'",
-        "ד'",
-        "ה'",
-        "ו'",
-        "שבת",
-    ]
-    if 0 <= index < len(hebrew_days):
-        return hebrew_days[index]
-    return ""
+    return round(value * METERS_TO_FEET, 1)
@@ -0,0 +1,25 @@
+"""
+4surfers API locations with a base-URL override
+
+Every fetcher builds its URLs here so the whole stack can be pointed at a
+stand-in server (fake_4surfers.py) with one setting: an explicit base_url
+argument / option, else the FOURSURFERS_BASE_URL environment variable, else
+the real site.
+"""
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+DEFAULT_BASE_URL = "https://4surfers.co.il"
+FORECAST_ENDPOINT = "GetBeachAreaForecast"
+AREA_DATA_ENDPOINT = "GetBeachAreaData"
+
+
+def base_url(override: Optional[str] = None) -> str:
+    return (override or os.getenv("FOURSURFERS_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+
+
+def api_url(endpoint: str, override: Optional[str] = None) -> str:
+    """e.g. api_url(FORECAST_ENDPOINT) -> https://4surfers.co.il/webapi/BeachArea/GetBeachAreaForecast"""
+    return f"{base_url(override)}/webapi/BeachArea/{endpoint}"
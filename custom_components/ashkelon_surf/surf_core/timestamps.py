@@ -0,0 +1,76 @@
+"""
+Timezone-aware parsing for 4surfers timestamps
+
+forecastLocalHour values arrive as naive Israel wall-clock times
+("2025-10-27T06:00:00"), with an explicit offset ("...+03:00" in summer,
+"...+02:00" in winter) or in UTC ("...Z"). All of them are resolved once
+against Asia/Jerusalem and cached by the raw string, since the same hour
+strings repeat across every fetch.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+    ISRAEL_TZ = ZoneInfo("Asia/Jerusalem")
+except (ImportError, ZoneInfoNotFoundError):  # no system tz database (e.g. Windows without tzdata)
+    ISRAEL_TZ = timezone(timedelta(hours=2), "IST")
+
+
+class LocalTime:
+    """A timestamp resolved to Israel local time"""
+
+    __slots__ = ("epoch", "date_key", "time_key", "hour", "weekday", "display_date")
+
+    def __init__(self, dt: datetime) -> None:
+        self.epoch = int(dt.timestamp())
+        self.date_key = f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+        self.time_key = f"{dt.hour:02d}:{dt.minute:02d}"
+        self.hour = dt.hour
+        self.weekday = dt.weekday()
+        self.display_date = f"{dt.day:02d}/{dt.month:02d}"
+
+    def to_datetime(self) -> datetime:
+        """Aware datetime in Asia/Jerusalem"""
+        return datetime.fromtimestamp(self.epoch, ISRAEL_TZ)
+
+    def __repr__(self) -> str:
+        return f"LocalTime({self.date_key} {self.time_key}, epoch={self.epoch})"
+
+
+@lru_cache(maxsize=8192)
+def parse_local(stamp: str) -> Optional[LocalTime]:
+    """
+    Parse an API timestamp into Israel local time
+
+    Naive values are taken as Asia/Jerusalem wall-clock time; values with an
+    offset or "Z" are converted. Returns None for anything unparseable.
+    """
+    if not isinstance(stamp, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(stamp)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=ISRAEL_TZ)
+    else:
+        dt = dt.astimezone(ISRAEL_TZ)
+    return LocalTime(dt)
+
+
+@lru_cache(maxsize=4096)
+def local_epoch(date_key: str, time_key: str = "00:00") -> Optional[int]:
+    """Epoch seconds for a YYYY-MM-DD date and HH:MM Israel local time"""
+    parsed = parse_local(f"{date_key}T{time_key}")
+    return parsed.epoch if parsed is not None else None
+
+
+def epoch_now() -> int:
+    """Current time as epoch seconds"""
+    return int(time.time())
@@ -8,24 +8,33 @@ Uses the same logic as the Scriptable widget and Home Assistant integration
 
 import os
 import sys
-import json
-import requests
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
+from alert_rules import SURFABLE, SURFABLE_RULES, AlertRule, ForecastArrays, RuleSet, feet
+from surf_core import HEBREW_DAYS, METERS_TO_FEET, parse_forecast
+from notification_state import notify_chats, report_sessions
+from surf_core.endpoints import FORECAST_ENDPOINT, api_url
+from surf_core.hedge import default_transport
+from surf_core.profiling import RunProfiler, profile_requested, stage
+from telegram_delivery import parse_chat_ids
 
-def get_surf_forecast(beach_id: str = "80") -> Optional[Dict]:
+def get_surf_forecast(beach_id: str = "80", transport=None, base_url: Optional[str] = None) -> Optional[Dict]:
     """
     Get surf forecast from 4surfers.co.il API
     
     Args:
         beach_id: Beach area ID (80 = Ashkelon)
+        transport: Object with a requests-compatible post() (defaults to requests,
+                   hedged when SURF_HEDGE=true; see replay.ReplayTransport for
+                   offline runs)
+        base_url: API root (default FOURSURFERS_BASE_URL or https://4surfers.co.il;
+                  e.g. a local fake_4surfers.py server)
     
     Returns:
         API response dictionary or None if failed
     """
     try:
-        url = 'https://4surfers.co.il/webapi/BeachArea/GetBeachAreaForecast'
+        url = api_url(FORECAST_ENDPOINT, base_url)
         
         headers = {
             'Accept': 'application/json, text/plain, */*',
@@ -38,10 +47,13 @@ def get_surf_forecast(beach_id: str = "80") -> Optional[Dict]:
         
         data = {"beachAreaId": beach_id}
         
-        response = requests.post(url, json=data, headers=headers, timeout=30)
+        transport = default_transport(transport)
+        with stage("fetch"):
+            response = transport.post(url, json=data, headers=headers, timeout=30)
         
         if response.status_code == 200:
-            return response.json()
+            with stage("decode"):
+                return response.json()
         else:
             print(f"❌ API request failed: {response.status_code}")
             return None
@@ -69,83 +81,60 @@ def get_star_rating(height_m: float) -> str:
 
 def get_hebrew_day(weekday: int) -> str:
     """Get Hebrew day name from weekday number (0=Monday)"""
-    hebrew_days = ['שני', 'שלישי', 'רביעי', 'חמישי', 'שישי', 'שבת', 'ראשון']
-    return hebrew_days[weekday]
+    return HEBREW_DAYS[weekday]
 
 
 def parse_forecast_data(api_data: Dict) -> List[Dict]:
     """
     Parse API response into structured forecast days
-    Same logic as Home Assistant sensor
+    Same logic as Home Assistant sensor (shared surf_core parser)
     
     Returns:
         List of forecast days with sessions
     """
-    if 'dailyForecastList' not in api_data:
-        return []
-    
     forecast_days = []
+    target_hours = (6, 9, 12, 18)  # 4 key times: 06:00, 09:00, 12:00, 18:00
     
-    for day_forecast in api_data['dailyForecastList'][:3]:  # Only next 3 days
-        if 'forecastLocalTime' not in day_forecast:
-            continue
-        
-        # Parse the forecast date
-        forecast_date = day_forecast['forecastLocalTime']
-        dt = datetime.fromisoformat(forecast_date.replace('T', ' ').replace('+03:00', ''))
-        
-        # Process hourly forecasts for this day
-        forecast_hours = day_forecast.get('forecastHours', [])
-        
-        # Filter to 4 key times: 06:00, 09:00, 12:00, 18:00
+    for day in parse_forecast(api_data, max_days=3):  # Only next 3 days
         sessions = []
-        target_hours = [6, 9, 12, 18]
-        
-        for hour_forecast in forecast_hours:
-            hour_time = hour_forecast.get('forecastLocalHour', '')
-            
-            try:
-                hour_dt = datetime.fromisoformat(hour_time.replace('T', ' ').replace('+03:00', ''))
-                
-                if hour_dt.hour in target_hours:
-                    # Get wave height - use average of from/to if available, fallback to WaveHeight
-                    surf_from = hour_forecast.get('SurfHeightFrom', 0)
-                    surf_to = hour_forecast.get('SurfHeightTo', 0)
-                    
-                    if surf_from > 0 and surf_to > 0:
-                        wave_height_m = (surf_from + surf_to) / 2
-                    else:
-                        wave_height_m = hour_forecast.get('WaveHeight', 0)
-                    
-                    wave_height_ft = wave_height_m * 3.28084
-                    hebrew_desc = hour_forecast.get('surfHeightDesc', '')
-                    period_s = hour_forecast.get('WavePeriod', 0)
-                    wind_kts = hour_forecast.get('WindSpeedInKnots', 0)
-                    stars = get_star_rating(wave_height_m)
-                    
-                    sessions.append({
-                        'time': f"{hour_dt.hour:02d}:00",
-                        'height_m': round(wave_height_m, 2),
-                        'height_ft': round(wave_height_ft, 1),  # Round to 1 decimal for consistency
-                        'hebrew_desc': hebrew_desc,
-                        'period_s': round(period_s, 1),  # Round period to 1 decimal
-                        'wind_kts': wind_kts,
-                        'stars': stars
-                    })
-            except:
+        for hour in day.hours:
+            if hour.hour not in target_hours:
                 continue
+            
+            wave_height_m = hour.height_m or 0
+            period_s = hour.period_s or 0
+            sessions.append({
+                'time': f"{hour.hour:02d}:00",
+                'height_m': round(wave_height_m, 2),
+                'height_ft': round(wave_height_m * METERS_TO_FEET, 1),  # Round to 1 decimal for consistency
+                'hebrew_desc': hour.surf_desc,
+                'period_s': round(period_s, 1),  # Round period to 1 decimal
+                'wind_kts': hour.wind_kts or 0,
+                'stars': get_star_rating(wave_height_m)
+            })
         
         if sessions:
             forecast_days.append({
-                'date': dt.strftime('%Y-%m-%d'),
-                'date_display': dt.strftime('%d/%m'),
-                'hebrew_day': get_hebrew_day(dt.weekday()),
+                'date': day.date_key,
+                'date_display': day.display_date,
+                'hebrew_day': day.hebrew_day,
                 'sessions': sessions
             })
     
     return forecast_days
 
 
+def surfable_slots(forecast_days: List[Dict]) -> Set[Tuple[str, str]]:
+    """
+    (date, time) of every session matching SURFABLE_RULES: 2ft+ with a 6.5s+
+    period, or a quality long-period swell of 1.8ft+ with 8s+
+    """
+    arrays = ForecastArrays.from_sessions(forecast_days)
+    # Every parsed session counts, including ones earlier today
+    matches = SURFABLE.evaluate(arrays, now=0).any(axis=0)
+    return {label for label, match in zip(arrays.labels, matches) if match}
+
+
 def has_surfable_waves(forecast_days: List[Dict], min_height_ft: float = 2.0, min_period_s: float = 6.5) -> bool:
     """
     Check if there are surfable waves in the forecast
@@ -159,20 +148,11 @@ def has_surfable_waves(forecast_days: List[Dict], min_height_ft: float = 2.0, mi
         True if any session has waves >= min_height_ft AND period >= min_period_s
         OR if waves >= 1.8ft AND period >= 8s (quality long-period swell)
     """
-    for day in forecast_days:
-        for session in day['sessions']:
-            height_ft = session['height_ft']
-            period_s = session['period_s']
-            
-            # Standard condition: 2ft+ with 6.5s+ period
-            standard_ok = height_ft >= min_height_ft and period_s >= min_period_s
-            
-            # Alternative condition: 1.8ft+ with 8s+ period (quality long-period swell)
-            quality_swell = height_ft >= 1.8 and period_s >= 8.0
-            
-            if standard_ok or quality_swell:
-                return True
-    return False
+    rules = SURFABLE
+    standard, quality_swell = SURFABLE_RULES
+    if (feet(min_height_ft), min_period_s) != (standard.min_height_m, standard.min_period_s):
+        rules = RuleSet([AlertRule(min_height_m=feet(min_height_ft), min_period_s=min_period_s), quality_swell])
+    return rules.any_match(ForecastArrays.from_sessions(forecast_days), now=0)
 
 
 def format_telegram_message(forecast_days: List[Dict]) -> str:
@@ -186,7 +166,8 @@ def format_telegram_message(forecast_days: List[Dict]) -> str:
         return "אין מידע על תחזית גלים"
     
     # Check if there are surfable waves
-    if not has_surfable_waves(forecast_days):
+    surfable = surfable_slots(forecast_days)
+    if not surfable:
         return "אין גלים בימים הקרובים 🏖️"
     
     # Build 3-day forecast message
@@ -196,20 +177,8 @@ def format_telegram_message(forecast_days: List[Dict]) -> str:
     
     for day in forecast_days:
         # Only show days that have quality sessions
-        quality_sessions = []
-        
-        for session in day['sessions']:
-            height_ft = session['height_ft']
-            period_s = session['period_s']
-            
-            # Standard condition: 2ft+ with 6.5s+ period
-            standard_ok = height_ft >= 2.0 and period_s >= 6.5
-            
-            # Alternative condition: 1.8ft+ with 8s+ period (quality long-period swell)
-            quality_swell = height_ft >= 1.8 and period_s >= 8.0
-            
-            if standard_ok or quality_swell:
-                quality_sessions.append(session)
+        quality_sessions = [session for session in day['sessions']
+                            if (day['date'], session['time']) in surfable]
         
         # Skip days with no quality sessions
         if not quality_sessions:
@@ -256,56 +225,30 @@ def format_telegram_message(forecast_days: List[Dict]) -> str:
     return "\n".join(lines)
 
 
-def send_telegram_message(bot_token: str, chat_id: str, message: str) -> bool:
-    """
-    Send message via Telegram Bot API
-    
-    Args:
-        bot_token: Telegram bot token
-        chat_id: Chat/channel ID
-        message: Message text (HTML formatted)
-    
-    Returns:
-        True if successful, False otherwise
-    """
-    try:
-        url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-        
-        data = {
-            'chat_id': chat_id,
-            'text': message,
-            'parse_mode': 'HTML'
-        }
-        
-        response = requests.post(url, data=data, timeout=10)
-        
-        if response.status_code == 200:
-            print("✅ Telegram message sent successfully!")
-            return True
-        else:
-            print(f"❌ Telegram API error: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Error sending Telegram message: {e}")
-        return False
+def main():
+    """Main function for daily surf report (--profile writes a run profile next to the JSON artifacts)"""
+    if profile_requested():
+        with RunProfiler("daily_surf_report"):
+            run_report()
+    else:
+        run_report()
 
 
-def main():
-    """Main function for daily surf report"""
+def run_report():
+    """Fetch, classify and send one daily report; exits with the job status"""
     print("🏄‍♂️ Daily Surf Report - Ashkelon")
     print("=" * 50)
     
     # Get environment variables
     bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
-    chat_id = os.getenv('TELEGRAM_CHAT_ID')
+    # One or more chat/channel IDs, comma separated
+    chat_ids = parse_chat_ids(os.getenv('TELEGRAM_CHAT_ID'))
     
     if not bot_token:
         print("❌ TELEGRAM_BOT_TOKEN environment variable not set")
         sys.exit(1)
     
-    if not chat_id:
+    if not chat_ids:
         print("❌ TELEGRAM_CHAT_ID environment variable not set")
         sys.exit(1)
     
@@ -319,7 +262,8 @@ def main():
     
     # Parse forecast
     print("📊 Parsing forecast data...")
-    forecast_days = parse_forecast_data(api_data)
+    with stage("parse"):
+        forecast_days = parse_forecast_data(api_data)
     
     if not forecast_days:
         print("❌ No forecast data available")
@@ -328,15 +272,21 @@ def main():
     print(f"✅ Got {len(forecast_days)} days of forecast")
     
     # Format message
-    message = format_telegram_message(forecast_days)
+    with stage("render"):
+        message = format_telegram_message(forecast_days)
     print("\n📝 Message to send:")
     print("-" * 50)
     print(message)
     print("-" * 50)
     
     # Send to Telegram
-    print("\n📱 Sending to Telegram...")
-    success = send_telegram_message(bot_token, chat_id, message)
+    print(f"\n📱 Sending to Telegram ({len(chat_ids)} chat(s))...")
+    # Outbox-backed delivery: rate limited and retried on 429/5xx. Chats that already
+    # have these sessions are skipped; detail-only changes edit yesterday's message
+    with stage("classify"):
+        sessions = report_sessions(forecast_days)
+    with stage("send"):
+        success = notify_chats(bot_token, chat_ids, message, sessions)
     
     if success:
         print("✅ Daily report completed successfully!")
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the 4surfers.co.il API
+
+Serves POST /webapi/BeachArea/GetBeachAreaForecast and GetBeachAreaData from
+recorded payloads (api_debug_full.json for Ashkelon, beachAreaId 80) and
+synthetic multi-beach data for any other beachAreaId, with configurable
+latency, HTTP 503 errors and expired-JWT (401) answers. Point the fetchers at
+it with FOURSURFERS_BASE_URL or their base_url argument / option.
+
+Stdlib only (ThreadingHTTPServer); responses are encoded once per beach so
+the server itself stays cheap under load.
+
+Usage:
+    python fake_4surfers.py --port 8765 --latency 0.2 --jitter 0.3 --error-rate 0.05
+    FOURSURFERS_BASE_URL=http://127.0.0.1:8765 python daily_surf_report.py
+
+    # In tests
+    with FakeFourSurfers(latency=0.05) as server:
+        get_surf_forecast(base_url=server.url)
+
+    GET /__stats returns request counts per endpoint and status.
+"""
+
+import argparse
+import base64
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from replay import DEFAULT_RECORDING, endpoint_name, synthetic_area_data, synthetic_forecast
+from surf_core.endpoints import AREA_DATA_ENDPOINT, FORECAST_ENDPOINT
+
+ENDPOINTS = (FORECAST_ENDPOINT, AREA_DATA_ENDPOINT)
+
+
+def jwt_expired(header: Optional[str], now: Optional[float] = None) -> bool:
+    """True when an X-App-JWT / Authorization bearer token carries an exp claim in the past"""
+    if not header:
+        return False
+    token = header.split()[-1]
+    try:
+        claims_part = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(claims_part + '=' * (-len(claims_part) % 4)))
+        return float(claims['exp']) < (time.time() if now is None else now)
+    except (IndexError, KeyError, TypeError, ValueError):
+        return False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'fake-4surfers/1.0'
+
+    def log_message(self, format, *args):  # keep load tests quiet
+        pass
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up (timeout, hedged request, stopped process)
+
+    def do_GET(self):
+        fake = self.server.fake
+        if self.path.rstrip('/') == '/__stats':
+            return self._send(200, json.dumps(fake.stats()).encode('utf-8'))
+        if self.path.rstrip('/') == '/health':
+            return self._send(200, b'{"status": "ok"}')
+        self._send(404, b'{"message": "Not found"}')
+
+    def do_POST(self):
+        fake = self.server.fake
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            payload = {}
+        status, body = fake.respond(endpoint_name(self.path), payload, self.headers)
+        self._send(status, body)
+
+
+class FakeFourSurfers:
+    """In-process fake API server; use as a context manager or start()/stop()"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, jwt_expired_rate: float = 0.0, check_jwt: bool = False,
+                 days: int = 10, recordings: Optional[Dict[int, Any]] = None, seed: Optional[int] = None):
+        """
+        Args:
+            host, port: Listen address (port 0 picks a free port; see .url)
+            latency: Seconds before every API answer
+            jitter: Extra random latency (uniform 0..jitter)
+            error_rate: Probability of an HTTP 503 answer
+            jwt_expired_rate: Probability of a 401 "JWT expired" answer
+            check_jwt: Also answer 401 when the request's JWT exp claim is in the past
+            days: Forecast days in synthetic payloads
+            recordings: beachAreaId -> GetBeachAreaForecast payload or JSON path
+                        (default: api_debug_full.json for 80); other ids get synthetic data
+            seed: Seed for latency jitter and injected failures
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.jwt_expired_rate = jwt_expired_rate
+        self.check_jwt = check_jwt
+        self.days = days
+        self.recordings = {80: DEFAULT_RECORDING} if recordings is None else dict(recordings)
+        self._random = random.Random(seed)
+        self._bodies: Dict[tuple, bytes] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def forecast(self, beach_id: int) -> Dict:
+        source = self.recordings.get(beach_id)
+        if source is None:
+            return synthetic_forecast(days=self.days, beach_id=beach_id)
+        if isinstance(source, str):
+            with open(source, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return source
+
+    def _body(self, endpoint: str, beach_id: int) -> bytes:
+        key = (endpoint, beach_id)
+        body = self._bodies.get(key)
+        if body is None:
+            payload = self.forecast(beach_id)
+            if endpoint == AREA_DATA_ENDPOINT:
+                payload = synthetic_area_data(payload)
+            body = self._bodies[key] = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        return body
+
+    def _count(self, endpoint: str, status: int) -> None:
+        key = f"{endpoint} {status}"
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def respond(self, endpoint: str, payload: Dict, headers: Any) -> tuple:
+        """(status, body) for one API call"""
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            roll_error = self._random.random()
+            roll_jwt = self._random.random()
+        if delay:
+            time.sleep(delay)
+
+        if endpoint not in ENDPOINTS:
+            status, body = 404, json.dumps({'message': f'Unknown endpoint {endpoint}'}).encode('utf-8')
+        elif roll_error < self.error_rate:
+            status, body = 503, b'{"message": "Service Unavailable"}'
+        elif roll_jwt < self.jwt_expired_rate or (
+                self.check_jwt and jwt_expired(headers.get('X-App-JWT') or headers.get('Authorization'))):
+            status, body = 401, b'{"message": "JWT token expired"}'
+        else:
+            try:
+                beach_id = int(payload.get('beachAreaId', 80))
+            except (TypeError, ValueError):
+                beach_id = -1
+            if beach_id <= 0:
+                status, body = 400, b'{"message": "Invalid beachAreaId"}'
+            else:
+                status, body = 200, self._body(endpoint, beach_id)
+        self._count(endpoint, status)
+        return status, body
+
+    def start(self) -> 'FakeFourSurfers':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fake-4surfers', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'FakeFourSurfers':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a local stand-in for the 4surfers.co.il API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds before every answer')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency (0..jitter seconds)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of HTTP 503 answers')
+    parser.add_argument('--jwt-expired-rate', type=float, default=0.0, help='Fraction of 401 JWT-expired answers')
+    parser.add_argument('--check-jwt', action='store_true', help='Reject requests whose JWT exp is in the past')
+    parser.add_argument('--days', type=int, default=10, help='Days in synthetic beach payloads')
+    parser.add_argument('--recording', action='append', default=[], metavar='ID=PATH',
+                        help='Serve a recorded payload for a beachAreaId (repeatable; default 80=api_debug_full.json)')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    recordings = None
+    if args.recording:
+        recordings = {int(beach_id): path for beach_id, _, path in (r.partition('=') for r in args.recording)}
+    server = FakeFourSurfers(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                             error_rate=args.error_rate, jwt_expired_rate=args.jwt_expired_rate,
+                             check_jwt=args.check_jwt, days=args.days, recordings=recordings, seed=args.seed)
+    print(f"🌊 Fake 4surfers API on {server.url} (FOURSURFERS_BASE_URL={server.url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+        print(json.dumps(server.stats(), indent=2))
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
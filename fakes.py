@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Shared test doubles for the clock-driven components
+
+FakeClock stands in for time.time / time.monotonic, make_health builds a
+SourceHealth over the three forecast sources, and make_hedged builds a
+HedgedTransport with its own metrics Registry so counters start at zero.
+Root and add-on tests import this module the same way they import replay.py.
+
+Usage:
+    from fakes import FakeClock, make_health
+    clock = FakeClock()
+    health = make_health(clock, failure_threshold=1)
+    clock.now += 60
+"""
+
+from typing import Any, Optional
+
+from surf_core.health import SourceHealth
+from surf_core.hedge import HedgedTransport
+from surf_core.metrics import Registry
+
+# Expected seconds per forecast source before it has been measured (preference order)
+SOURCE_LATENCY = {'extended_api': 1.0, 'basic_api': 1.5, 'browser': 30.0}
+
+
+class FakeClock:
+    """A clock that only moves when a test sets or advances `now`"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_health(clock: Optional[FakeClock] = None, **kwargs) -> SourceHealth:
+    """SourceHealth over the three forecast sources (real monotonic clock when none is given)"""
+    if clock is not None:
+        kwargs['clock'] = clock
+    return SourceHealth(SOURCE_LATENCY, **kwargs)
+
+
+
+def make_hedged(transport: Any, **kwargs) -> HedgedTransport:
+    """HedgedTransport with a short initial hedge delay"""
+    kwargs.setdefault('initial_delay', 0.05)
+    return HedgedTransport(transport, registry=Registry(), **kwargs)
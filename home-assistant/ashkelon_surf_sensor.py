@@ -4,11 +4,13 @@ Simple custom component that fetches surf data from 4surfers.co.il API
 """
 import logging
 import asyncio
-from datetime import timedelta
+from datetime import datetime, timedelta
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.util import Throttle
 
+from .surf_core import ISRAEL_TZ, METERS_TO_FEET, parse_forecast
+
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "ashkelon_surf"
@@ -134,31 +136,23 @@ class AshkelonSurfSensor(Entity):
                 self._available = False
                 return
             
-            daily_list = result["dailyForecastList"]
-            
-            if len(daily_list) <= self._day_offset:
-                _LOGGER.error(f"Not enough forecast days for offset {self._day_offset}")
+            # Pick the day by date: the API list may start yesterday or skip a day
+            target_date = (datetime.now(ISRAEL_TZ).date() + timedelta(days=self._day_offset)).isoformat()
+            day = next((d for d in parse_forecast(result) if d.date_key == target_date), None)
+            if day is None:
+                _LOGGER.error(f"No forecast for {target_date} (offset {self._day_offset})")
                 self._available = False
                 return
             
-            day_data = daily_list[self._day_offset]
-            forecast_hours = day_data.get("forecastHours", [])
-            
             # Extract key times
+            by_time = day.by_time()
             times = {
-                "06:00": None,
-                "09:00": None,
-                "12:00": None,
-                "18:00": None
+                "06:00": by_time.get("06:00"),
+                "09:00": by_time.get("09:00"),
+                "12:00": by_time.get("12:00"),
+                "18:00": by_time.get("18:00")
             }
             
-            for hour_data in forecast_hours:
-                time_str = hour_data.get("forecastLocalHour", "")
-                for target_time in times.keys():
-                    if target_time in time_str:
-                        times[target_time] = hour_data
-                        break
-            
             # Calculate average height and collect data
             heights_meters = []
             morning_height = None
@@ -174,28 +168,28 @@ class AshkelonSurfSensor(Entity):
             evening_hebrew = "N/A"
             
             if times["06:00"]:
-                morning_height = times["06:00"].get("waveHeight", 0)
-                morning_wind = times["06:00"].get("WindSpeedInKnots", 0)
+                morning_height = times["06:00"].height_m or 0
+                morning_wind = times["06:00"].wind_kts or 0
                 heights_meters.append(morning_height)
-                morning_hebrew = times["06:00"].get("surfHeightDesc", "N/A")
+                morning_hebrew = times["06:00"].surf_desc or "N/A"
             
             if times["12:00"]:
-                noon_height = times["12:00"].get("waveHeight", 0)
-                noon_wind = times["12:00"].get("WindSpeedInKnots", 0)
+                noon_height = times["12:00"].height_m or 0
+                noon_wind = times["12:00"].wind_kts or 0
                 heights_meters.append(noon_height)
-                noon_hebrew = times["12:00"].get("surfHeightDesc", "N/A")
+                noon_hebrew = times["12:00"].surf_desc or "N/A"
             
             if times["18:00"]:
-                evening_height = times["18:00"].get("waveHeight", 0)
-                evening_wind = times["18:00"].get("WindSpeedInKnots", 0)
+                evening_height = times["18:00"].height_m or 0
+                evening_wind = times["18:00"].wind_kts or 0
                 heights_meters.append(evening_height)
-                evening_hebrew = times["18:00"].get("surfHeightDesc", "N/A")
+                evening_hebrew = times["18:00"].surf_desc or "N/A"
             
             # Convert to feet (1m = 3.28084ft)
             def meters_to_feet(m):
                 if m is None:
                     return None
-                return round(m * 3.28084, 1)
+                return round(m * METERS_TO_FEET, 1)
             
             avg_meters = sum(heights_meters) / len(heights_meters) if heights_meters else 0
             avg_feet = meters_to_feet(avg_meters)
@@ -215,7 +209,7 @@ class AshkelonSurfSensor(Entity):
                 "morning_time": "06:00",
                 "noon_time": "12:00",
                 "evening_time": "18:00",
-                "forecast_date": day_data.get("forecastLocalTime", "")[:10],
+                "forecast_date": day.date_key,
                 "beach": "Ashkelon",
                 "beach_hebrew": "אשקלון",
                 "unit": "ft",
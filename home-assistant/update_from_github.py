@@ -18,7 +18,10 @@ COMPONENT_NAME = "ashkelon_surf"
 HA_CONFIG_DIR = os.environ.get("HA_CONFIG_DIR", "/config")
 
 # Files to update
-FILES = ["sensor.py", "__init__.py", "manifest.json", "README.md"]
+FILES = [
+    "sensor.py", "__init__.py", "manifest.json", "services.yaml", "README.md",
+    "surf_core/__init__.py", "surf_core/parse.py", "surf_core/records.py", "surf_core/rtl.py", "surf_core/timestamps.py", "surf_core/endpoints.py",
+]
 BASE_URL = f"https://raw.githubusercontent.com/{GITHUB_REPO}/{GITHUB_BRANCH}/custom_components/ashkelon_surf"
 
 def print_colored(message, color=""):
@@ -73,6 +76,7 @@ def main():
         print(f"  ⬇️  Downloading {file}...")
         url = f"{BASE_URL}/{file}"
         target_file = custom_components_dir / file
+        target_file.parent.mkdir(parents=True, exist_ok=True)
         
         try:
             urllib.request.urlretrieve(url, target_file)
@@ -41,11 +41,12 @@ echo ""
 # Download latest files from GitHub
 echo "📥 Downloading latest version from GitHub..."
 
-FILES=("sensor.py" "__init__.py" "manifest.json" "README.md")
+FILES=("sensor.py" "__init__.py" "manifest.json" "services.yaml" "README.md" "surf_core/__init__.py" "surf_core/parse.py" "surf_core/records.py" "surf_core/rtl.py" "surf_core/timestamps.py" "surf_core/endpoints.py")
 BASE_URL="https://raw.githubusercontent.com/$GITHUB_REPO/$GITHUB_BRANCH/custom_components/ashkelon_surf"
 
 for file in "${FILES[@]}"; do
     echo "  ⬇️  Downloading $file..."
+    mkdir -p "$(dirname "$CUSTOM_COMPONENTS_DIR/$file")"
     curl -sS -o "$CUSTOM_COMPONENTS_DIR/$file" "$BASE_URL/$file"
     
     if [ $? -eq 0 ]; then
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Per-chat notification state for the Telegram surf reports
+
+For every chat the store keeps which surfable sessions the last message
+announced, a hash of their details, and its Telegram message_id. A new
+report then takes one of three actions:
+
+    skip  same sessions with the same heights/periods - nothing is sent
+    edit  same or fewer sessions, only details changed - editMessageText
+    send  a session not announced before (a new swell) - a new message
+
+Usage:
+    from notification_state import notify_chats, report_sessions
+    notify_chats(bot_token, chat_ids, message, report_sessions(forecast_days))
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from telegram_delivery import Outbox, TelegramDelivery
+
+DEFAULT_STATE = 'notification_state.json'
+
+# (date, time, detail, ...) - date and time identify the session, the rest are details
+Session = Tuple
+
+
+def session_ids(sessions: Iterable[Session]) -> List[str]:
+    return sorted({f"{session[0]} {session[1]}" for session in sessions})
+
+
+def details_hash(sessions: Iterable[Session]) -> str:
+    payload = json.dumps(sorted(list(session) for session in sessions), ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def report_sessions(forecast_days: List[Dict]) -> List[Session]:
+    """Sessions daily_surf_report.format_telegram_message shows (the SURFABLE_RULES matches)"""
+    from alert_rules import SURFABLE, ForecastArrays
+
+    arrays = ForecastArrays.from_sessions(forecast_days)
+    matches = SURFABLE.evaluate(arrays, now=0).any(axis=0)
+    by_label = {(day['date'], s['time']): s for day in forecast_days for s in day['sessions']}
+    sessions = []
+    for index in matches.nonzero()[0]:
+        date_key, time_key = arrays.labels[index]
+        s = by_label[(date_key, time_key)]
+        sessions.append((date_key, time_key, s['height_ft'], s['period_s'], s['wind_kts'], s['hebrew_desc']))
+    return sessions
+
+
+def forecast_sessions(forecast_data: Dict, min_height: float = 0.3) -> List[Session]:
+    """Sessions FourSurfersWaveForecast.generate_hebrew_wave_summary shows (06/12/18, >= 0.3m)"""
+    sessions = []
+    for date_key, day_data in forecast_data.get('daily_forecasts', {}).items():
+        times_data = day_data.get('times', {})
+        for time_key in ('06:00', '12:00', '18:00'):
+            info = times_data.get(time_key)
+            if info and (info.get('wave_height') or 0) >= min_height:
+                sessions.append((date_key, time_key, round(info['wave_height'], 1),
+                                 (info.get('surf_quality') or '').split('(')[0].strip()))
+    return sessions
+
+
+class NotificationState:
+    """JSON-file store of what each chat was last told"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('NOTIFICATION_STATE', DEFAULT_STATE)
+        self.chats: Dict[str, Dict] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.chats = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable notification state {self.path}: {e}")
+
+    def plan(self, chat_id: str, sessions: Sequence[Session]) -> Tuple[str, Optional[int]]:
+        """
+        Decide what to do for one chat
+
+        Returns:
+            ('skip' | 'edit' | 'send', message_id to edit or None)
+        """
+        previous = self.chats.get(str(chat_id))
+        if not previous:
+            return 'send', None
+        if not set(session_ids(sessions)) <= set(previous['sessions']):
+            return 'send', None
+        if details_hash(sessions) == previous['details']:
+            return 'skip', None
+        if previous.get('message_id') is None:
+            return 'send', None
+        return 'edit', previous['message_id']
+
+    def record(self, chat_id: str, sessions: Sequence[Session], message_id: Optional[int]) -> None:
+        """Remember what a chat was sent; edits keep the earlier announced sessions"""
+        previous = self.chats.get(str(chat_id)) or {}
+        announced = set(session_ids(sessions))
+        if message_id is not None and message_id == previous.get('message_id'):
+            announced |= set(previous.get('sessions', []))
+        self.chats[str(chat_id)] = {
+            'sessions': sorted(announced),
+            'details': details_hash(sessions),
+            'message_id': message_id,
+            'updated': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.chats, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def notify(delivery: TelegramDelivery, state: NotificationState, chat_ids: Iterable[str],
+           message: str, sessions: Sequence[Session]) -> Dict[str, int]:
+    """
+    Send, edit or skip the report per chat and record the outcome in state
+
+    Returns:
+        Counts of send/edit/skip decisions plus delivery 'failed' and 'pending'
+        (still queued for a retry after this run)
+    """
+    counts = {'send': 0, 'edit': 0, 'skip': 0, 'failed': 0, 'pending': 0}
+    planned = {}
+    for chat_id in map(str, chat_ids):
+        action, message_id = state.plan(chat_id, sessions)
+        counts[action] += 1
+        if action == 'edit':
+            planned[chat_id] = (action, delivery.enqueue_edit(chat_id, message_id, message))
+        elif action == 'send':
+            delivery.enqueue([chat_id], message)
+            planned[chat_id] = (action, Outbox.message_key(chat_id, message))
+
+    for attempt in range(2):
+        if not planned:
+            break
+        delivery.deliver()
+        retry = {}
+        for chat_id, (action, key) in planned.items():
+            status, message_id = delivery.outbox.result(key)
+            if status == 'sent':
+                state.record(chat_id, sessions, message_id)
+            elif status == 'failed' and action == 'edit' and attempt == 0:
+                # Message deleted or too old to edit - announce it as a new message instead
+                delivery.outbox.cancel(key)
+                delivery.enqueue([chat_id], message)
+                retry[chat_id] = ('send', Outbox.message_key(chat_id, message))
+            elif status == 'pending':
+                # Retry scheduled past deliver()'s wait; the outbox sends it on a later run.
+                # A pending edit is not replaced, or the chat would get both messages
+                counts['pending'] += 1
+            else:
+                counts['failed'] += 1
+        planned = retry
+
+    state.save()
+    return counts
+
+
+def notify_chats(bot_token: str, chat_ids: Iterable[str], message: str, sessions: Sequence[Session],
+                 state: Optional[NotificationState] = None, **kwargs) -> bool:
+    """notify() with a default delivery and state; True when nothing failed"""
+    delivery = TelegramDelivery(bot_token, **kwargs)
+    try:
+        counts = notify(delivery, state or NotificationState(), chat_ids, message, sessions)
+    finally:
+        delivery.outbox.close()
+    print(f"📬 Telegram: {counts['send']} new, {counts['edit']} edited, "
+          f"{counts['skip']} unchanged, {counts['failed']} failed, {counts['pending']} still queued")
+    return counts['failed'] == 0
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Parallel output pipeline for a parsed forecast
+
+One forecast is fanned out to its renderers. The matplotlib/reportlab
+stages - PNG chart and PDF report - run in a worker process, while the
+cheap ones (JSON file, Telegram HTML message, console report) run in the
+main process in the meantime; shipping the forecast to a worker would cost
+more than they do. The PDF embeds the chart the chart stage rendered
+instead of drawing it a second time. Each stage is timed.
+
+Usage:
+    from output_pipeline import run_pipeline, print_timings
+    results = run_pipeline(forecast_data, stages=('json', 'chart', 'pdf', 'telegram', 'console'))
+    print_timings(results)
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+STAGES = ('json', 'chart', 'pdf', 'telegram', 'console')
+DEFAULT_STAGES = ('json', 'telegram', 'console')
+# Rendered in a worker process; everything else runs inline
+POOLED_STAGES = ('chart', 'pdf')
+
+
+@dataclass
+class StageResult:
+    """Outcome of one pipeline stage"""
+    name: str
+    output: Any = None
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_worker_forecast = None
+
+
+def _init_worker() -> None:
+    """One forecast object per worker process (fonts, chart templates and caches live on in it)"""
+    global _worker_forecast
+    from surf_core.log import configure_logging
+    from wave_forecast import FourSurfersWaveForecast
+    configure_logging()
+    _worker_forecast = FourSurfersWaveForecast()
+
+
+def _render_json(forecast: Any, forecast_data: Dict, path: str) -> str:
+    forecast.save_forecast_data(forecast_data, path)
+    return path
+
+
+def _render_telegram(forecast: Any, forecast_data: Dict, path: str) -> Dict:
+    """Whether the report should go out (good waves in 72h) and its HTML text"""
+    return {
+        'send': forecast.check_good_waves_next_72h(forecast_data),
+        'text': forecast.generate_hebrew_wave_summary(forecast_data),
+    }
+
+
+def _render_pdf(forecast: Any, forecast_data: Dict, path: str, chart_png: Optional[bytes] = None) -> str:
+    return forecast.generate_pdf_report(forecast_data, path, chart_png)
+
+
+_RENDERERS = {
+    'json': _render_json,
+    'chart': lambda forecast, data, path: forecast.create_wave_height_chart(data, path),
+    'pdf': _render_pdf,
+    'telegram': _render_telegram,
+}
+
+
+def _run_stage(name: str, forecast_data: Dict, path: Optional[str], forecast: Any = None,
+               **kwargs) -> StageResult:
+    """Run one renderer (with the worker's forecast object unless one is given) and time it"""
+    start = time.perf_counter()
+    try:
+        output = _RENDERERS[name](forecast or _worker_forecast, forecast_data, path, **kwargs)
+        if output is None:
+            return StageResult(name, None, time.perf_counter() - start, 'no output')
+        return StageResult(name, output, time.perf_counter() - start)
+    except Exception as e:
+        return StageResult(name, None, time.perf_counter() - start, str(e))
+
+
+def output_paths(output_dir: str = '.') -> Dict[str, str]:
+    """Timestamped file names per file-producing stage (same names the old serial steps used)"""
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return {
+        'json': os.path.join(output_dir, f"ashkelon_forecast_{timestamp}.json"),
+        'chart': os.path.join(output_dir, f"wave_height_chart_{timestamp}.png"),
+        'pdf': os.path.join(output_dir, f"ashkelon_forecast_report_{timestamp}.pdf"),
+    }
+
+
+def _read_chart(result: StageResult) -> Optional[bytes]:
+    """PNG written by a successful chart stage, for the PDF to embed"""
+    if not result.ok:
+        return None
+    try:
+        with open(result.output, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _pooled_result(name: str, future) -> StageResult:
+    try:
+        return future.result()
+    except Exception as e:  # worker died / could not start
+        return StageResult(name, None, 0.0, str(e))
+
+
+def run_pipeline(forecast_data: Dict, stages: Iterable[str] = DEFAULT_STAGES,
+                 output_dir: str = '.', forecast: Any = None,
+                 console: Any = None) -> Dict[str, StageResult]:
+    """
+    Render all requested outputs for one forecast
+
+    Args:
+        forecast_data: Parsed forecast (as returned by get_ashkelon_forecast)
+        stages: Subset of STAGES to run
+        output_dir: Directory for the JSON, PNG and PDF files
+        forecast: FourSurfersWaveForecast for the inline json/telegram stages
+                  (default: a new one)
+        console: Object with display_forecast(); the 'console' stage runs it in this process
+
+    Returns:
+        Stage name -> StageResult, plus 'total' with the pipeline wall-clock time
+    """
+    stages = [name for name in STAGES if name in set(stages)]
+    paths = output_paths(output_dir)
+    results: Dict[str, StageResult] = {}
+    start = time.perf_counter()
+
+    # chart and pdf share one worker: the pdf waits for the chart so it can reuse its PNG
+    pool = None
+    chart_future = pdf_future = None
+    if any(name in POOLED_STAGES for name in stages):
+        pool = ProcessPoolExecutor(max_workers=1, initializer=_init_worker)
+        if 'chart' in stages:
+            chart_future = pool.submit(_run_stage, 'chart', forecast_data, paths['chart'])
+        else:
+            pdf_future = pool.submit(_run_stage, 'pdf', forecast_data, paths['pdf'])
+
+    try:
+        inline = [name for name in stages if name in _RENDERERS and name not in POOLED_STAGES]
+        if inline and forecast is None:
+            from wave_forecast import FourSurfersWaveForecast
+            forecast = FourSurfersWaveForecast()
+        for name in inline:
+            results[name] = _run_stage(name, forecast_data, paths.get(name), forecast)
+
+        # Console output stays in the main process so it is not interleaved per worker
+        if 'console' in stages and console is not None:
+            stage_start = time.perf_counter()
+            try:
+                console.display_forecast(forecast_data)
+                results['console'] = StageResult('console', True, time.perf_counter() - stage_start)
+            except Exception as e:
+                results['console'] = StageResult('console', None, time.perf_counter() - stage_start, str(e))
+
+        if chart_future is not None:
+            results['chart'] = _pooled_result('chart', chart_future)
+            if 'pdf' in stages:
+                pdf_future = pool.submit(_run_stage, 'pdf', forecast_data, paths['pdf'],
+                                         chart_png=_read_chart(results['chart']))
+        if pdf_future is not None:
+            results['pdf'] = _pooled_result('pdf', pdf_future)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    results['total'] = StageResult('total', None, time.perf_counter() - start)
+    return {name: results[name] for name in stages + ['total'] if name in results}
+
+
+def print_timings(results: Dict[str, StageResult]) -> None:
+    """Print per-stage timing; the sum vs total shows what overlapping the stages saved"""
+    print("\n⏱️ Output pipeline timing:")
+    stage_sum = 0.0
+    for name, result in results.items():
+        if name == 'total':
+            continue
+        stage_sum += result.seconds
+        status = '✅' if result.ok else f"❌ {result.error}"
+        print(f"   {name:<9} {result.seconds:7.3f}s  {status}")
+    if 'total' in results:
+        print(f"   {'total':<9} {results['total'].seconds:7.3f}s  (stages sum {stage_sum:.3f}s)")
+
+
+def enabled_stages() -> tuple:
+    """Default stages plus chart/PDF when RENDER_CHART / RENDER_PDF are set to true"""
+    stages = list(DEFAULT_STAGES)
+    if os.getenv('RENDER_CHART', 'false').lower() == 'true':
+        stages.append('chart')
+    if os.getenv('RENDER_PDF', 'false').lower() == 'true':
+        stages.append('pdf')
+    return tuple(stages)
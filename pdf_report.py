@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+PDF renderer for the Ashkelon wave forecast report
+
+Fonts are probed and registered once per process, paragraph/table styles and
+the static page text are built once, and documents are written to an
+in-memory buffer. FourSurfersWaveForecast.generate_pdf_report uses
+render_pdf(); render_batch() renders many reports (e.g. one per beach) in
+worker processes.
+
+Usage:
+    python pdf_report.py forecasts/*.json --out reports/ --workers 4
+"""
+
+import argparse
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from surf_core import ENGLISH_DAYS, HEBREW_DAYS
+
+HEBREW_FONT_PATHS = (
+    '/System/Library/Fonts/Arial Unicode MS.ttf',  # macOS
+    '/System/Library/Fonts/Helvetica.ttc',         # macOS fallback
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',  # Linux
+    'C:\\Windows\\Fonts\\arial.ttf',               # Windows
+)
+
+# For PDF, use English equivalents to avoid display issues (squares)
+HEBREW_TO_ENGLISH = {
+    'תחזית': 'Forecast', 'גלים': 'Waves', 'אשקלון': 'Ashkelon',
+    'תאריך': 'Date', 'יום': 'Day', 'בוקר': 'Morning',
+    'צהרים': 'Noon', 'ערב': 'Evening', 'זמן': 'Time', 'טוב': 'Best',
+    'שני': 'Monday', 'שלישי': 'Tuesday', 'רביעי': 'Wednesday',
+    'חמישי': 'Thursday', 'שישי': 'Friday', 'שבת': 'Saturday',
+    'ראשון': 'Sunday', 'קרסול': 'Ankle', 'ברך': 'Knee',
+    'כתף': 'Shoulder', 'שטוח': 'Flat', 'מדריך': 'Guide',
+    'איכות': 'Quality', 'מעולים': 'Excellent', 'גלישה': 'Surfing',
+    'תנאי': 'Conditions', 'יומית': 'Daily'
+}
+
+HEBREW_PHRASES = (
+    ('תחזית יומית', 'Daily Forecast'),
+    ('תנאי גלישה מעולים', 'Excellent Surfing Conditions'),
+    ('מדריך איכות גלים', 'Wave Quality Guide'),
+)
+
+HEBREW_DAY_TO_ENGLISH = dict(zip(HEBREW_DAYS, ENGLISH_DAYS))
+
+TIME_HEBREW = {'Morning': 'בוקר', 'Noon': 'צהרים', 'Evening': 'ערב'}
+
+
+@lru_cache(maxsize=512)
+def pdf_text(text: str) -> str:
+    """Translate Hebrew labels to English for the PDF (unknown text is returned as-is)"""
+    if not text:
+        return text
+    if text in HEBREW_TO_ENGLISH:
+        return HEBREW_TO_ENGLISH[text]
+    for phrase, english in HEBREW_PHRASES:
+        if phrase in text:
+            return english
+    # If no translation found, return as-is (might work with proper font)
+    return text
+
+
+@lru_cache(maxsize=1)
+def register_fonts() -> Tuple[str, str]:
+    """
+    Register a Hebrew-capable TTF once per process
+
+    Returns:
+        (regular, bold) font names to use in styles
+    """
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    for font_path in HEBREW_FONT_PATHS:
+        if os.path.exists(font_path):
+            try:
+                pdfmetrics.registerFont(TTFont('HebrewFont', font_path))
+                pdfmetrics.registerFont(TTFont('HebrewFont-Bold', font_path))
+                print(f"✅ Hebrew font registered: {font_path}")
+                return 'HebrewFont', 'HebrewFont-Bold'
+            except Exception:
+                continue
+    print("⚠️ No Hebrew font found, using default fonts")
+    return 'Helvetica', 'Helvetica-Bold'
+
+
+class _Theme:
+    """Styles, table styles and static markup shared by every report in a process"""
+
+    def __init__(self):
+        from reportlab.lib import colors
+        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+        from reportlab.platypus import TableStyle
+
+        regular, bold = register_fonts()
+        styles = getSampleStyleSheet()
+        self.styles = styles
+
+        # 4surfers.co.il inspired color scheme
+        surfers_blue = colors.Color(0, 0.48, 1, 1)  # #007BFF - oceanic blue
+        surfers_light_blue = colors.Color(0.89, 0.95, 0.99, 1)  # #E3F2FD - light blue background
+        surfers_dark_blue = colors.Color(0, 0.33, 0.8, 1)  # Darker blue for headers
+
+        self.title = ParagraphStyle(
+            'SurfersTitle', parent=styles['Heading1'], fontSize=22, spaceAfter=20,
+            alignment=1, fontName=bold, textColor=surfers_dark_blue,
+            backColor=surfers_light_blue, borderColor=surfers_blue, borderWidth=2, borderPadding=10
+        )
+        self.heading = ParagraphStyle(
+            'SurfersHeading', parent=styles['Heading2'], fontSize=16, spaceAfter=15, spaceBefore=10,
+            fontName=bold, textColor=surfers_dark_blue, backColor=colors.white,
+            borderColor=surfers_blue, borderWidth=1, borderPadding=8
+        )
+        self.summary = ParagraphStyle(
+            'SurfersSummary', parent=styles['Normal'], fontSize=13, spaceAfter=18, spaceBefore=5,
+            backColor=surfers_light_blue, borderColor=surfers_blue, borderWidth=2, borderPadding=12,
+            fontName=bold, textColor=surfers_dark_blue,
+            alignment=1  # Center alignment for summary
+        )
+        self.info = ParagraphStyle(
+            'SurfersInfo', parent=styles['Normal'], fontSize=11, spaceAfter=12, fontName=regular,
+            backColor=colors.white, borderColor=surfers_blue, borderWidth=1, borderPadding=8
+        )
+        self.legend = ParagraphStyle(
+            'SurfersLegend', parent=styles['Normal'], fontSize=10, spaceAfter=12, spaceBefore=8,
+            backColor=surfers_light_blue, borderColor=surfers_blue, borderWidth=1.5, borderPadding=10,
+            fontName=regular, textColor=surfers_dark_blue
+        )
+
+        self.quality_table = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+        self.forecast_table = TableStyle([
+            # Header styling with oceanic theme
+            ('BACKGROUND', (0, 0), (-1, 0), surfers_dark_blue),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), bold),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 15),
+            ('TOPPADDING', (0, 0), (-1, 0), 15),
+
+            # Data rows styling with alternating ocean colors
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('FONTNAME', (0, 1), (1, -1), bold),
+            ('FONTNAME', (2, 1), (-1, -1), regular),
+            ('TOPPADDING', (0, 1), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 10),
+            ('LEFTPADDING', (0, 0), (-1, -1), 8),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+
+            # Grid and borders with oceanic styling
+            ('GRID', (0, 0), (-1, -1), 1.5, surfers_blue),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+
+            # Alternating row colors with oceanic theme
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [surfers_light_blue, colors.white]),
+
+            # Highlight best time column with green accent
+            ('BACKGROUND', (5, 0), (5, 0), colors.green),
+            ('BACKGROUND', (5, 1), (5, -1), colors.lightgreen),
+
+            # Special styling for wave height cells
+            ('TEXTCOLOR', (2, 1), (4, -1), surfers_dark_blue),
+        ])
+        self.timeline_table = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.lightblue),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 9)
+        ])
+
+        # Static page furniture
+        self.title_text = f"�‍♂️ 4SURFERS.co.il | {pdf_text('תחזית גלים אשקלון')}<br/>Ashkelon Wave Forecast Report"
+        self.daily_heading = f"📅 Daily Breakdown - {pdf_text('תחזית יומית')} (בוקר/צהרים/ערב)"
+        self.forecast_header = [
+            f'Date\n{pdf_text("תאריך")}',
+            f'Day\n{pdf_text("יום")}',
+            f'Morning 06:00\n{pdf_text("בוקר")}',
+            f'Noon 12:00\n{pdf_text("צהרים")}',
+            f'Evening 18:00\n{pdf_text("ערב")}',
+            f'Best Time\n{pdf_text("זמן טוב")}'
+        ]
+        self.legend_text = f"""
+                <b>🏄 Surf Quality Legend - {pdf_text("מדריך איכות גלים")}:</b><br/>
+                • <b>{pdf_text("פלטה")} (Flat):</b> 0-0.1m - No waves<br/>
+                • <b>{pdf_text("קרסול")} (Ankle High):</b> 0.2-0.4m - Very small waves<br/>
+                • <b>{pdf_text("קרסול עד ברך")} (Ankle-Knee):</b> 0.5-0.6m - Small waves for beginners<br/>
+                • <b>{pdf_text("ברך")} (Knee High):</b> 0.7-0.9m - Good waves for surfing<br/>
+                • <b>{pdf_text("מעל ברך")} (Above Knee):</b> 1.0-1.2m - Great waves<br/>
+                • <b>{pdf_text("כתף")} (Shoulder High):</b> 1.3-1.5m - Excellent waves<br/>
+                • <b>{pdf_text("ראש")} (Head High):</b> 2.0m+ - Epic conditions for experts
+                """
+
+
+@lru_cache(maxsize=1)
+def theme() -> _Theme:
+    return _Theme()
+
+
+def _format_time_cell(time_info: Dict) -> str:
+    if not time_info:
+        return "N/A"
+
+    height = time_info.get('wave_height', 0)
+    surf_quality = time_info.get('surf_quality', 'N/A')
+
+    # Extract Hebrew condition if available
+    if '(' in surf_quality:
+        hebrew_condition = surf_quality.split('(')[0].strip()
+        english_condition = surf_quality.split('(')[1].replace(')', '').strip()
+        return f"{height:.1f}m\n{pdf_text(hebrew_condition)}\n({english_condition})"
+    return f"{height:.1f}m\n{surf_quality}"
+
+
+def _best_time_cell(times_data: Dict) -> str:
+    heights = []
+    for label, time_key in (('Morning', '06:00'), ('Noon', '12:00'), ('Evening', '18:00')):
+        if times_data.get(time_key):
+            heights.append((label, times_data[time_key].get('wave_height', 0)))
+    if not heights:
+        return "N/A"
+
+    best_time = max(heights, key=lambda x: x[1])
+    if best_time[1] >= 0.3:
+        return f"{best_time[0]}\n{pdf_text(TIME_HEBREW[best_time[0]])}\n{best_time[1]:.1f}m ✅"
+    return f"Flat\n{pdf_text('שטוח')}\n❌"
+
+
+def _forecast_rows(daily_forecasts: Dict) -> List[List[str]]:
+    rows = [theme().forecast_header]
+    for date_key, day_data in sorted(daily_forecasts.items()):
+        hebrew_day = day_data.get('hebrew_day', '')
+        times_data = day_data.get('times', {})
+        # Use English day names for PDF to avoid Hebrew display issues
+        english_day_name = HEBREW_DAY_TO_ENGLISH.get(hebrew_day, day_data.get('english_day', ''))
+        rows.append([
+            day_data.get('hebrew_date', date_key[-5:]),  # DD/MM format
+            f"{pdf_text(hebrew_day)}\n{english_day_name}",
+            _format_time_cell(times_data.get('06:00', {})),
+            _format_time_cell(times_data.get('12:00', {})),
+            _format_time_cell(times_data.get('18:00', {})),
+            _best_time_cell(times_data),
+        ])
+    return rows
+
+
+def _timeline_story(forecast_data: Dict) -> List:
+    """Fallback tables from the old wave_timeline structure"""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Spacer, Table
+
+    styles = theme().styles
+    daily_organized = {}
+    for item in forecast_data.get('wave_timeline') or []:
+        daily_organized.setdefault(item['date'], {})[item['time']] = item
+
+    story = []
+    for date_key in sorted(daily_organized.keys()):
+        if date_key in ['unknown_date', 'container_data']:
+            continue
+
+        try:
+            date_obj = datetime.strptime(date_key, '%Y-%m-%d')
+            day_title = (f"{HEBREW_DAYS[date_obj.weekday()]} - {date_obj.strftime('%d/%m/%Y')} "
+                         f"({date_obj.strftime('%A')})")
+        except ValueError:
+            day_title = date_key
+
+        story.append(Paragraph(f"<b>{day_title}</b>", styles['Heading3']))
+
+        time_data = [['Time', 'Wave Height', 'Surf Condition', 'Quality']]
+        for time_str in ['06:00', '6:00', '12:00', '18:00']:
+            item = daily_organized[date_key].get(time_str)
+            if not item:
+                continue
+            # Determine quality level
+            if item['height'] >= 1.0:
+                quality = "🟢 Good"
+            elif item['height'] >= 0.6:
+                quality = "🟡 Fair"
+            elif item['height'] >= 0.3:
+                quality = "🟠 Small"
+            else:
+                quality = "🔴 Flat"
+            time_data.append([time_str, f"{item['height']:.1f}m", item.get('condition', 'Unknown'), quality])
+
+        if len(time_data) > 1:  # Has data beyond header
+            time_table = Table(time_data, colWidths=[0.8*inch, 1*inch, 2.2*inch, 1*inch])
+            time_table.setStyle(theme().timeline_table)
+            story.append(time_table)
+
+        story.append(Spacer(1, 15))
+    return story
+
+
+def render_pdf(forecast_data: Dict, summary: str, chart_png: Optional[bytes] = None) -> bytes:
+    """
+    Render the forecast report and return the PDF bytes
+
+    Args:
+        forecast_data: The forecast data dictionary
+        summary: Good-wave-days summary shown at the top of the page
+        chart_png: Optional wave height chart (PNG bytes)
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table
+
+    t = theme()
+    styles = t.styles
+    story = [Paragraph(t.title_text, t.title), Spacer(1, 15),
+             Paragraph(summary, t.summary), Spacer(1, 15)]
+
+    if chart_png:
+        story.append(Paragraph("📊 Wave Height Timeline", t.heading))
+        story.append(Image(io.BytesIO(chart_png), width=6*inch, height=3*inch))
+        story.append(Spacer(1, 20))
+
+    # Beach Info with 4surfers styling and Hebrew support
+    beach_hebrew = forecast_data.get('beach_hebrew', 'N/A')
+    formatted_beach_hebrew = pdf_text(beach_hebrew) if beach_hebrew != 'N/A' else 'N/A'
+    beach_info = f"""
+            <b>🏖️ Beach | חוף:</b> {forecast_data.get('beach', 'N/A')} ({formatted_beach_hebrew})<br/>
+            <b>🌐 Source | מקור:</b> {forecast_data.get('source', 'N/A')}<br/>
+            <b>📅 Report Generated | דוח נוצר:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}<br/>
+            <b>⏱️ Data Retrieved | נתונים נאספו:</b> {forecast_data.get('timestamp', 'N/A')[:19]}
+            """
+    story.append(Paragraph(beach_info, t.info))
+    story.append(Spacer(1, 15))
+
+    # Surf Quality Summary
+    story.append(Paragraph("🏄 Surf Quality Indicators Found", t.heading))
+    if forecast_data.get('surf_quality_indicators'):
+        quality_data = [['Hebrew Term', 'English', 'Frequency']]
+        for quality in forecast_data['surf_quality_indicators']:
+            quality_data.append([quality['hebrew'], quality['english'], str(quality['count'])])
+        quality_table = Table(quality_data)
+        quality_table.setStyle(t.quality_table)
+        story.append(quality_table)
+    else:
+        story.append(Paragraph("No surf quality indicators found", styles['Normal']))
+    story.append(Spacer(1, 20))
+
+    # Enhanced Daily Forecasts with proper dates - 4surfers style
+    story.append(Paragraph(t.daily_heading, t.heading))
+    if forecast_data.get('daily_forecasts'):
+        forecast_table = Table(_forecast_rows(forecast_data['daily_forecasts']),
+                               colWidths=[0.8*inch, 1.1*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch])
+        forecast_table.setStyle(t.forecast_table)
+        story.append(forecast_table)
+        story.append(Spacer(1, 20))
+        story.append(Paragraph(t.legend_text, t.legend))
+    else:
+        story.extend(_timeline_story(forecast_data))
+
+    # Wave Heights and Wind Speeds
+    if forecast_data.get('wave_heights') or forecast_data.get('wind_speeds'):
+        story.append(Spacer(1, 20))
+        story.append(Paragraph("🌊 Conditions Summary", t.heading))
+        conditions_text = ""
+        if forecast_data.get('wave_heights'):
+            conditions_text += f"<b>Wave Heights:</b> {', '.join(map(str, forecast_data['wave_heights']))} meters<br/>"
+        if forecast_data.get('wind_speeds'):
+            conditions_text += f"<b>Wind Speeds:</b> {', '.join(map(str, forecast_data['wind_speeds']))} km/h<br/>"
+        story.append(Paragraph(conditions_text, styles['Normal']))
+
+    # Summary
+    if forecast_data.get('summary'):
+        story.append(Spacer(1, 20))
+        story.append(Paragraph("📊 Report Summary", t.heading))
+        report_summary = forecast_data['summary']
+        summary_text = f"""
+                <b>Days with Forecasts:</b> {report_summary.get('total_days_found', 0)}<br/>
+                <b>Quality Indicators Found:</b> {report_summary.get('quality_indicators_found', 0)}<br/>
+                <b>Most Common Condition:</b> {report_summary.get('most_common_condition', 'Unknown')}
+                """
+        story.append(Paragraph(summary_text, styles['Normal']))
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
+    doc.build(story)
+    return buffer.getvalue()
+
+
+_worker_forecast = None
+
+
+def _init_worker() -> None:
+    """Per-process setup: one forecast object, fonts and styles registered up front"""
+    global _worker_forecast
+    from surf_core.log import configure_logging
+    from wave_forecast import FourSurfersWaveForecast
+    configure_logging()
+    _worker_forecast = FourSurfersWaveForecast()
+    theme()
+
+
+def _render_job(job: Tuple[str, Dict, str]) -> Tuple[str, Optional[str]]:
+    name, forecast_data, filename = job
+    return name, _worker_forecast.generate_pdf_report(forecast_data, filename)
+
+
+def render_batch(jobs: Iterable[Tuple[str, Dict]], output_dir: str,
+                 workers: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """
+    Render one report per (name, forecast_data) pair in parallel worker processes
+
+    Args:
+        jobs: (name, forecast_data) pairs, e.g. one per beach
+        output_dir: Directory for <name>.pdf files
+        workers: Worker process count (default: CPU count)
+
+    Returns:
+        name -> PDF path, or None for reports that failed
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    work = [(name, data, os.path.join(output_dir, f"{name}.pdf")) for name, data in jobs]
+    if not work:
+        return {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return dict(pool.map(_render_job, work))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render forecast PDF reports from saved forecast JSON files')
+    parser.add_argument('forecasts', nargs='+', help='Forecast JSON files (as written by save_forecast_data)')
+    parser.add_argument('--out', default='reports', help='Output directory')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    jobs = []
+    for path in args.forecasts:
+        with open(path, 'r', encoding='utf-8') as f:
+            jobs.append((os.path.splitext(os.path.basename(path))[0], json.load(f)))
+
+    results = render_batch(jobs, args.out, args.workers)
+    for name, pdf_path in sorted(results.items()):
+        print(f"{'📄' if pdf_path else '❌'} {name}: {pdf_path or 'failed'}")
+
+
+if __name__ == '__main__':
+    main()
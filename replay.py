@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Record/replay transport for the 4surfers.co.il API
+
+Lets the fetchers (FourSurfersWaveForecast, daily_surf_report and the Home
+Assistant SurfForecastData) run against recorded GetBeachAreaForecast payloads
+such as api_debug_full.json instead of the live site, with optional simulated
+latency and failures.
+
+Usage:
+    from replay import ReplayTransport
+    transport = ReplayTransport(latency=0.2, failure_rate=0.1, seed=1)
+    api_data = daily_surf_report.get_surf_forecast(transport=transport)
+
+    # Record live responses into a directory for later replay
+    from replay import RecordingTransport
+    recorder = RecordingTransport('recordings')
+    daily_surf_report.get_surf_forecast(transport=recorder)
+"""
+
+import asyncio
+import copy
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import requests
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RECORDING = os.path.join(REPO_DIR, 'api_debug_full.json')
+
+
+def endpoint_name(url: str) -> str:
+    """Return the API method name from a 4surfers URL (e.g. GetBeachAreaForecast)"""
+    return url.split('?', 1)[0].rstrip('/').rsplit('/', 1)[-1]
+
+
+def recording_key(url: str, payload: Optional[Dict] = None) -> str:
+    """Build the recording key for a request: <Endpoint>_<beachAreaId>"""
+    beach_id = (payload or {}).get('beachAreaId')
+    name = endpoint_name(url)
+    return f"{name}_{beach_id}" if beach_id is not None else name
+
+
+def synthetic_forecast(days: int = 10, beach_id: int = 80, start: Optional[datetime] = None,
+                       seed: Optional[int] = None, template_path: str = DEFAULT_RECORDING) -> Dict:
+    """
+    Build a GetBeachAreaForecast-shaped payload of any length
+
+    Hour records are cloned from the recorded payload so every field the parsers
+    read is present; dates are shifted and wave fields varied deterministically.
+
+    Args:
+        days: Number of entries in dailyForecastList
+        beach_id: BeachAreaId stamped on every record
+        start: First forecast day (default: the recording's first day)
+        seed: Seed for height/period variation (default: beach_id)
+        template_path: Recorded payload used as the hour template
+    """
+    with open(template_path, 'r', encoding='utf-8') as f:
+        recorded = json.load(f)
+    template_day = max(recorded['dailyForecastList'], key=lambda d: len(d.get('forecastHours', [])))
+    template_hours = template_day['forecastHours']
+    if start is None:
+        start = datetime.fromisoformat(recorded['dailyForecastList'][0]['forecastLocalTime'][:10])
+    rng = random.Random(beach_id if seed is None else seed)
+
+    daily_list = []
+    for day_index in range(days):
+        day = start + timedelta(days=day_index)
+        date_str = day.strftime('%Y-%m-%d')
+        hours = []
+        for hour in template_hours:
+            record = copy.copy(hour)
+            record['BeachAreaId'] = beach_id
+            record['forecastLocalHour'] = f"{date_str}{hour['forecastLocalHour'][10:]}"
+            height = round(rng.uniform(0.1, 2.0), 2)
+            record['WaveHeight'] = height
+            record['SurfHeightFrom'] = round(max(0.0, height - 0.1), 1)
+            record['SurfHeightTo'] = round(height + 0.1, 1)
+            record['WavePeriod'] = round(rng.uniform(4.0, 11.0), 1)
+            record['WindSpeedInKnots'] = rng.randint(2, 25)
+            hours.append(record)
+        daily_list.append({
+            'dailyTides': None,
+            'BeachAreaId': beach_id,
+            'forecastLocalTime': f"{date_str}{template_hours[0]['forecastLocalHour'][10:]}",
+            'forecastLocalTimeId': int(day.strftime('%Y%m%d')),
+            'forecastHours': hours,
+        })
+
+    return {
+        'forecastUpdatedDate': recorded.get('forecastUpdatedDate'),
+        'dailyForecastList': daily_list,
+    }
+
+
+def synthetic_area_data(forecast: Dict) -> Dict:
+    """
+    Build a GetBeachAreaData-shaped payload (basic API) from a forecast payload
+
+    The basic endpoint lists hours flat under DailyForecast (camelCase
+    waveHeight) plus the latest observed conditions under lastCSC.
+    """
+    hours = [hour for day in forecast.get('dailyForecastList') or [] for hour in day.get('forecastHours') or []]
+    first = hours[0] if hours else {}
+    return {
+        'DailyForecast': [
+            {'forecastLocalHour': hour.get('forecastLocalHour'), 'waveHeight': hour.get('WaveHeight', 0),
+             'wavePeriod': hour.get('WavePeriod'), 'windSpeedInKnots': hour.get('WindSpeedInKnots')}
+            for hour in hours
+        ],
+        'lastCSC': {
+            'surfHeightFrom': first.get('SurfHeightFrom', 0),
+            'surfHeightTo': first.get('SurfHeightTo', 0),
+            'surfHeightDesc': first.get('surfHeightDesc', ''),
+        },
+    }
+
+
+class ReplayResponse:
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, status_code: int, payload: Any = None, url: str = ''):
+        self.status_code = status_code
+        self.url = url
+        self.headers = {'Content-Type': 'application/json; charset=utf-8'}
+        self._payload = payload
+        self.text = json.dumps(payload, ensure_ascii=False) if payload is not None else ''
+        self.content = self.text.encode('utf-8')
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 400
+
+    def json(self) -> Any:
+        if self._payload is None:
+            raise ValueError("No JSON payload in replayed response")
+        return self._payload
+
+    def raise_for_status(self) -> None:
+        if 400 <= self.status_code < 600:
+            kind = 'Client' if self.status_code < 500 else 'Server'
+            raise requests.exceptions.HTTPError(f"{self.status_code} {kind} Error for url: {self.url}", response=self)
+
+
+class ReplayTransport:
+    """
+    Serve recorded API payloads through a requests-compatible post()/get()
+
+    Recordings are looked up by "<Endpoint>_<beachAreaId>" first and then by
+    "<Endpoint>", so one file can answer every beach.
+    """
+
+    def __init__(self, recordings: Optional[Dict[str, Any]] = None, latency: float = 0.0,
+                 jitter: float = 0.0, failure_rate: float = 0.0, error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            recordings: Mapping of recording key to payload dict or JSON file path
+                        (default: api_debug_full.json for GetBeachAreaForecast)
+            latency: Simulated response time in seconds
+            jitter: Extra random latency in seconds (uniform 0..jitter)
+            failure_rate: Probability of answering with HTTP 503
+            error_rate: Probability of raising requests.exceptions.ConnectionError
+            seed: Seed for the failure/jitter random generator
+        """
+        if recordings is None:
+            recordings = {'GetBeachAreaForecast': DEFAULT_RECORDING}
+        self.recordings = dict(recordings)
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._loaded: Dict[str, Any] = {}
+        self.calls = 0
+        self.failures = 0
+
+    @classmethod
+    def from_directory(cls, directory: str, **kwargs) -> 'ReplayTransport':
+        """Load every <key>.json file in a directory written by RecordingTransport"""
+        recordings = {}
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith('.json'):
+                recordings[filename[:-5]] = os.path.join(directory, filename)
+        return cls(recordings, **kwargs)
+
+    def _payload_for(self, key: str) -> Any:
+        if key not in self._loaded:
+            source = self.recordings[key]
+            if isinstance(source, str):
+                with open(source, 'r', encoding='utf-8') as f:
+                    source = json.load(f)
+            self._loaded[key] = source
+        return self._loaded[key]
+
+    def _delay(self) -> float:
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        return delay
+
+    def _respond(self, url: str, payload: Optional[Dict]) -> ReplayResponse:
+        self.calls += 1
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.failures += 1
+            raise requests.exceptions.ConnectionError(f"Simulated connection error for {endpoint_name(url)}")
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            self.failures += 1
+            return ReplayResponse(503, {'message': 'Simulated upstream failure'}, url)
+
+        for key in (recording_key(url, payload), endpoint_name(url)):
+            if key in self.recordings:
+                return ReplayResponse(200, self._payload_for(key), url)
+        return ReplayResponse(404, {'message': f'No recording for {endpoint_name(url)}'}, url)
+
+    def post(self, url: str, json: Optional[Dict] = None, data: Any = None,
+             headers: Optional[Dict] = None, timeout: Optional[float] = None, **kwargs) -> ReplayResponse:
+        """requests.post() compatible entry point"""
+        delay = self._delay()
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            self.calls += 1
+            self.failures += 1
+            raise requests.exceptions.Timeout(f"Simulated timeout after {timeout}s for {endpoint_name(url)}")
+        if delay:
+            time.sleep(delay)
+        return self._respond(url, json)
+
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> ReplayResponse:
+        """requests.get() compatible entry point"""
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        return self._respond(url, params)
+
+    def aiohttp_session(self) -> 'ReplayClientSession':
+        """Return an aiohttp.ClientSession look-alike backed by this transport"""
+        return ReplayClientSession(self)
+
+
+class _ReplayClientResponse:
+    """Async context manager mimicking aiohttp.ClientResponse"""
+
+    def __init__(self, transport: ReplayTransport, url: str, payload: Optional[Dict]):
+        self._transport = transport
+        self._url = url
+        self._payload = payload
+        self._response: Optional[ReplayResponse] = None
+        self.status = 0
+
+    async def __aenter__(self) -> '_ReplayClientResponse':
+        delay = self._transport._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        self._response = self._transport._respond(self._url, self._payload)
+        self.status = self._response.status_code
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    async def json(self, **kwargs) -> Any:
+        return self._response.json()
+
+    async def text(self, **kwargs) -> str:
+        return self._response.text
+
+
+class ReplayClientSession:
+    """aiohttp.ClientSession look-alike for the Home Assistant integration"""
+
+    def __init__(self, transport: ReplayTransport):
+        self._transport = transport
+
+    def post(self, url: str, json: Optional[Dict] = None, **kwargs) -> _ReplayClientResponse:
+        return _ReplayClientResponse(self._transport, url, json)
+
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> _ReplayClientResponse:
+        return _ReplayClientResponse(self._transport, url, params)
+
+
+class RecordingTransport:
+    """
+    Wrap a real transport (requests by default) and save every successful JSON
+    response to <directory>/<Endpoint>_<beachAreaId>.json for later replay
+    """
+
+    def __init__(self, directory: str, transport: Any = None):
+        if transport is None:
+            transport = requests
+        self.directory = directory
+        self.transport = transport
+        os.makedirs(directory, exist_ok=True)
+
+    def _record(self, url: str, payload: Optional[Dict], response: Any) -> None:
+        if response.status_code != 200:
+            return
+        try:
+            body = response.json()
+        except ValueError:
+            return
+        path = os.path.join(self.directory, f"{recording_key(url, payload)}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(body, f, indent=2, ensure_ascii=False)
+
+    def post(self, url: str, json: Optional[Dict] = None, **kwargs) -> Any:
+        response = self.transport.post(url, json=json, **kwargs)
+        self._record(url, json, response)
+        return response
+
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> Any:
+        response = self.transport.get(url, params=params, **kwargs)
+        self._record(url, params, response)
+        return response
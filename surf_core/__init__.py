@@ -0,0 +1,43 @@
+"""
+Shared forecastHours core for every Ashkelon surf entry point
+
+A dependency-free parser for the 4surfers GetBeachAreaForecast payload used by
+daily_surf_report.py, wave_forecast.py (root and add-on), and both Home
+Assistant integrations. The package only uses relative imports so the same
+files are vendored into addons/ashkelon-surf-forecast/ (every module) and
+custom_components/ashkelon_surf/ and home-assistant/ (the parser modules in
+test_surf_core.HA_MODULES) — edit the root copy and copy it over
+(test_surf_core.py checks that the copies match).
+"""
+
+from .records import ForecastDay, ForecastHour
+from .parse import (
+    ENGLISH_DAYS,
+    HEBREW_DAY_LETTERS,
+    HEBREW_DAYS,
+    METERS_TO_FEET,
+    parse_forecast,
+    parse_hour,
+    surf_quality_english,
+)
+from .rtl import rtl_available, shape_rtl
+from .timestamps import ISRAEL_TZ, LocalTime, epoch_now, local_epoch, parse_local
+
+__all__ = [
+    "ENGLISH_DAYS",
+    "ForecastDay",
+    "ForecastHour",
+    "HEBREW_DAY_LETTERS",
+    "HEBREW_DAYS",
+    "ISRAEL_TZ",
+    "LocalTime",
+    "METERS_TO_FEET",
+    "epoch_now",
+    "local_epoch",
+    "parse_forecast",
+    "parse_hour",
+    "parse_local",
+    "rtl_available",
+    "shape_rtl",
+    "surf_quality_english",
+]
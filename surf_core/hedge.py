@@ -0,0 +1,179 @@
+"""
+Hedged requests for the 4surfers API
+
+HedgedTransport wraps a requests-compatible transport. For the hedged
+endpoints (GetBeachAreaForecast by default) it sends the request, and if no
+answer arrives within the recent p95 response time it sends the same
+request again and returns whichever answer comes back first. The slower
+call is left to finish in the background and its answer is dropped.
+
+Hedges are capped by a token bucket: every request earns `max_ratio` tokens
+(up to `burst`) and a hedge spends one, so at most ~10% extra upstream load
+by default. Outcomes are counted in surf_hedge_requests_total:
+
+    primary      answered before the hedge delay, no second request
+    hedge_won    the second request answered first (hedging helped)
+    hedge_lost   the hedge was sent but the first request still won
+    capped       over the hedge budget, waited for the first request only
+
+Opt in with SURF_HEDGE=true (see default_transport) or wrap explicitly:
+
+    transport = HedgedTransport(requests)
+    transport.post(url, json=payload, timeout=30)
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Optional
+
+from .metrics import REGISTRY, Registry
+
+HEDGED_ENDPOINTS = ("GetBeachAreaForecast",)
+
+
+class LatencyWindow:
+    """Recent response times and their percentile"""
+
+    def __init__(self, size: int = 200, min_samples: int = 10) -> None:
+        self.samples: deque = deque(maxlen=size)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """None until min_samples responses have been seen"""
+        with self._lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class HedgedTransport:
+    """requests-compatible post()/get() that hedges slow calls to the forecast endpoints"""
+
+    def __init__(self, transport: Any = None, percentile: float = 0.95, initial_delay: float = 2.0,
+                 min_delay: float = 0.05, max_ratio: float = 0.1, burst: float = 2.0,
+                 endpoints: Iterable[str] = HEDGED_ENDPOINTS, workers: int = 8,
+                 registry: Registry = REGISTRY) -> None:
+        """
+        Args:
+            transport: Wrapped object with post()/get() (default: the requests module)
+            percentile: Response-time percentile used as the hedge delay
+            initial_delay: Hedge delay until enough responses were measured
+            min_delay: Lower bound for the hedge delay
+            max_ratio: Hedges allowed per request on average
+            burst: Hedges allowed back to back before the ratio applies
+            endpoints: URL endpoint names that are hedged (others pass through)
+            workers: Threads for in-flight requests
+            registry: Metrics registry for the outcome counter
+        """
+        if transport is None:
+            import requests
+            transport = requests
+        self.transport = transport
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self.burst = burst
+        self.endpoints = tuple(endpoints)
+        self.latency = LatencyWindow()
+        self.outcomes = registry.counter("surf_hedge_requests_total", "Hedged endpoint calls by outcome",
+                                         ("outcome",))
+        self._tokens = 1.0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hedge")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.transport, name)
+
+    def hedge_delay(self) -> float:
+        measured = self.latency.percentile(self.percentile)
+        return max(self.min_delay, self.initial_delay if measured is None else measured)
+
+    def _take_token(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    def _earn_token(self) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.max_ratio)
+
+    def post(self, url: str, **kwargs) -> Any:
+        if not url.split("?", 1)[0].rstrip("/").endswith(self.endpoints):
+            return self.transport.post(url, **kwargs)
+        return self._hedged(lambda: self.transport.post(url, **kwargs))
+
+    def get(self, url: str, **kwargs) -> Any:
+        return self.transport.get(url, **kwargs)
+
+    def _hedged(self, call: Callable[[], Any]) -> Any:
+        self._earn_token()
+        started = time.perf_counter()
+        primary = self._pool.submit(call)
+        done, _ = wait([primary], timeout=self.hedge_delay())
+        if done:
+            return self._finish(primary, "primary", started)
+
+        if not self._take_token():
+            return self._finish(primary, "capped", started)
+        hedge = self._pool.submit(call)
+        pending = {primary, hedge}
+        first_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return self._finish(future, "hedge_won" if future is hedge else "hedge_lost", started)
+                first_error = first_error or future.exception()
+        raise first_error
+
+    def _finish(self, future, outcome: str, started: float) -> Any:
+        response = future.result()
+        # Time since the primary was sent: a winning hedge's own (short) duration
+        # would drag the p95 - and with it the hedge delay - below real latency
+        self.latency.add(time.perf_counter() - started)
+        self.outcomes.inc(outcome=outcome)
+        return response
+
+    def stats(self) -> dict:
+        return {outcome: int(self.outcomes.value(outcome=outcome))
+                for outcome in ("primary", "hedge_won", "hedge_lost", "capped")}
+
+
+_default: Optional[HedgedTransport] = None
+_default_lock = threading.Lock()
+
+
+def hedging_enabled() -> bool:
+    return os.getenv("SURF_HEDGE", "false").lower() == "true"
+
+
+def default_transport(transport: Any = None) -> Any:
+    """
+    The transport fetchers should use when none was injected
+
+    With SURF_HEDGE=true this is one process-wide HedgedTransport over
+    requests, so its latency window survives short-lived forecast objects.
+    """
+    global _default
+    if transport is not None:
+        return transport
+    if not hedging_enabled():
+        import requests
+        return requests
+    with _default_lock:
+        if _default is None:
+            _default = HedgedTransport()
+        return _default
@@ -0,0 +1,216 @@
+"""
+Whole-run profiling for the forecast scripts (``--profile``)
+
+RunProfiler wraps one run in cProfile plus a stack sampler and records
+named stages (fetch, decode, parse, classify, render, send) marked in the
+code with ``with stage("parse"):``. Outside a profiled run stage() returns a
+shared no-op context manager, so the marks cost a global lookup.
+
+On exit it writes, next to the run's JSON output:
+
+    profile_<run>_<timestamp>.json       per-stage wall/CPU seconds, peak RSS, totals
+    profile_<run>_<timestamp>.collapsed  sampled stacks, one "a;b;c count" line each
+                                         (flamegraph.pl / speedscope / inferno input)
+    profile_<run>_<timestamp>.prof       cProfile stats (python -m pstats, snakeviz)
+
+Usage:
+    from surf_core.profiling import RunProfiler, stage
+
+    with RunProfiler("daily_surf_report"):
+        with stage("fetch"):
+            ...
+"""
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STAGES = ("fetch", "decode", "parse", "classify", "render", "send")
+
+_NOOP = contextlib.nullcontext()
+_active: Optional["RunProfiler"] = None
+
+
+def stage(name: str):
+    """Context manager timing one stage of the active profiled run (no-op otherwise)"""
+    if _active is None:
+        return _NOOP
+    return _active.stage(name)
+
+
+def record_stage(name: str, wall: float, cpu: Optional[float] = None) -> None:
+    """Add externally measured time (e.g. a worker process stage) to the active run"""
+    if _active is not None:
+        _active.record(name, wall, cpu)
+
+
+def profile_requested(argv=None) -> bool:
+    return "--profile" in (sys.argv[1:] if argv is None else argv)
+
+
+def peak_rss_bytes() -> Dict[str, int]:
+    """Peak resident set size of this process and of its waited-for children"""
+    if resource is None:
+        return {}
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+    }
+
+
+def _stage_order(name: str):
+    """Pipeline order for the known stages (sub-stages like render.pdf after their parent)"""
+    top = name.split(".", 1)[0]
+    return (STAGES.index(top) if top in STAGES else len(STAGES), name)
+
+
+class _Stage:
+    __slots__ = ("_profiler", "_name", "_wall", "_cpu")
+
+    def __init__(self, profiler: "RunProfiler", name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self) -> "_Stage":
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._profiler.record(self._name, time.perf_counter() - self._wall, time.thread_time() - self._cpu)
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts"""
+
+    def __init__(self, thread_id: int, interval: float = 0.005) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class RunProfiler:
+    """cProfile + stack sampling + stage timers around one run; writes the reports on exit"""
+
+    def __init__(self, run_name: str, output_dir: str = ".", interval: float = 0.005) -> None:
+        """
+        Args:
+            run_name: Used in the output file names (e.g. "wave_forecast")
+            output_dir: Directory for the .json/.collapsed/.prof files
+            interval: Stack sampling interval in seconds
+        """
+        self.run_name = run_name
+        self.output_dir = output_dir
+        self.interval = interval
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.paths: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    def record(self, name: str, wall: float, cpu: Optional[float] = None) -> None:
+        """Add time to a stage (repeated stages accumulate; cpu None = measured elsewhere)"""
+        with self._lock:
+            entry = self.stages.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0})
+            entry["wall_s"] += wall
+            entry["cpu_s"] += cpu or 0.0
+            entry["calls"] += 1
+
+    def __enter__(self) -> "RunProfiler":
+        global _active
+        _active = self
+        self._sampler = StackSampler(threading.get_ident(), self.interval)
+        self._profile = cProfile.Profile()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self._sampler.start()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        global _active
+        self._profile.disable()
+        self._sampler.stop()
+        _active = None
+        try:
+            self.write(time.perf_counter() - self._wall, time.process_time() - self._cpu)
+        except OSError as e:
+            print(f"⚠️ Could not write profile: {e}")
+
+    def report(self, wall: float, cpu: float) -> Dict:
+        staged = sum(entry["wall_s"] for name, entry in self.stages.items() if "." not in name)
+        return {
+            "run": self.run_name,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "wall_s": round(wall, 4),
+            "cpu_s": round(cpu, 4),
+            "unstaged_wall_s": round(max(0.0, wall - staged), 4),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "samples": sum(self._sampler.samples.values()),
+            "sample_interval_s": self.interval,
+            "stages": {name: {key: round(value, 4) if isinstance(value, float) else value
+                              for key, value in self.stages[name].items()}
+                       for name in sorted(self.stages, key=_stage_order)},
+        }
+
+    def write(self, wall: float, cpu: float) -> Dict[str, str]:
+        base = os.path.join(self.output_dir, f"profile_{self.run_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        report = self.report(wall, cpu)
+        self.paths = {"json": f"{base}.json", "collapsed": f"{base}.collapsed", "prof": f"{base}.prof"}
+        with open(self.paths["json"], "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        with open(self.paths["collapsed"], "w", encoding="utf-8") as f:
+            f.write(self._sampler.collapsed())
+        self._profile.dump_stats(self.paths["prof"])
+        print_report(report)
+        print(f"📁 Profile written: {base}.{{json,collapsed,prof}}")
+        return self.paths
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n🔬 Profile ({report['run']}): {report['wall_s']:.3f}s wall, {report['cpu_s']:.3f}s CPU")
+    for name, entry in report["stages"].items():
+        print(f"   {name:<16} {entry['wall_s']:8.3f}s wall {entry['cpu_s']:8.3f}s CPU  x{entry['calls']}")
+    print(f"   {'(unstaged)':<16} {report['unstaged_wall_s']:8.3f}s wall")
+    rss = report["peak_rss_bytes"]
+    if rss:
+        print(f"   peak RSS {rss['self'] / 2**20:.1f} MiB (children {rss['children'] / 2**20:.1f} MiB)")
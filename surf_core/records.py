@@ -0,0 +1,97 @@
+"""Slotted records produced by surf_core.parse"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+
+class ForecastHour:
+    """One forecastHours entry with the fields every entry point reads"""
+
+    __slots__ = (
+        "local_hour",
+        "epoch",
+        "date_key",
+        "time_key",
+        "hour",
+        "height_m",
+        "wave_height_m",
+        "period_s",
+        "wind_kts",
+        "surf_desc",
+        "surf_rank",
+    )
+
+    def __init__(
+        self,
+        local_hour: str,
+        epoch: int,
+        date_key: str,
+        time_key: str,
+        hour: int,
+        height_m: Optional[float],
+        wave_height_m: Optional[float],
+        period_s: Optional[float],
+        wind_kts: Optional[float],
+        surf_desc: str,
+        surf_rank: Optional[str],
+    ) -> None:
+        self.local_hour = local_hour
+        self.epoch = epoch
+        self.date_key = date_key
+        self.time_key = time_key
+        self.hour = hour
+        self.height_m = height_m
+        self.wave_height_m = wave_height_m
+        self.period_s = period_s
+        self.wind_kts = wind_kts
+        self.surf_desc = surf_desc
+        self.surf_rank = surf_rank
+
+    def __repr__(self) -> str:
+        return f"ForecastHour({self.date_key} {self.time_key}, {self.height_m}m, {self.period_s}s)"
+
+
+class ForecastDay:
+    """One dailyForecastList entry and its parsed hours"""
+
+    __slots__ = (
+        "date_key",
+        "display_date",
+        "weekday",
+        "hebrew_day",
+        "hebrew_day_letter",
+        "english_day",
+        "hours",
+        "_by_time",
+    )
+
+    def __init__(
+        self,
+        date_key: str,
+        display_date: str,
+        weekday: int,
+        hebrew_day: str,
+        hebrew_day_letter: str,
+        english_day: str,
+        hours: List[ForecastHour],
+    ) -> None:
+        self.date_key = date_key
+        self.display_date = display_date
+        self.weekday = weekday
+        self.hebrew_day = hebrew_day
+        self.hebrew_day_letter = hebrew_day_letter
+        self.english_day = english_day
+        self.hours = hours
+        self._by_time: Optional[Dict[str, ForecastHour]] = None
+
+    def by_time(self) -> Dict[str, ForecastHour]:
+        """Hours keyed by "HH:MM" (first entry wins)"""
+        if self._by_time is None:
+            by_time: Dict[str, ForecastHour] = {}
+            for hour in self.hours:
+                by_time.setdefault(hour.time_key, hour)
+            self._by_time = by_time
+        return self._by_time
+
+    def __repr__(self) -> str:
+        return f"ForecastDay({self.date_key}, {len(self.hours)} hours)"
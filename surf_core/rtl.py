@@ -0,0 +1,115 @@
+"""
+Memoized Hebrew RTL shaping for chart, PDF and summary text
+
+arabic_reshaper + python-bidi are optional; without them text is returned
+unchanged. The fixed vocabulary (day names, surf quality terms, session
+names and report phrases) is shaped once on first use, everything else goes
+through a bounded LRU cache.
+"""
+from __future__ import annotations
+
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from .parse import HEBREW_DAY_LETTERS, HEBREW_DAYS
+
+SESSION_NAMES = ("בוקר", "צהרים", "ערב", "לילה")
+QUALITY_TERMS = (
+    "פלטה",
+    "שטוח",
+    "קרסול",
+    "קרסול עד ברך",
+    "ברך",
+    "מעל ברך",
+    "כתף",
+    "מעל כתף",
+    "מותן",
+    "ראש",
+    "מעל ראש",
+)
+REPORT_PHRASES = (
+    "תחזית גלים אשקלון",
+    "גובה גלים לפי שעות היום",
+    "גובה גלים (מטר)",
+    "תאריך ויום",
+    "בוקר (06:00)",
+    "צהרים (12:00)",
+    "ערב (18:00)",
+    "גלים מעולים ב",
+    "מושלם לגלישה!",
+    "תנאי גלישה מעולים:",
+    "גלים טובים ב",
+    "טוב לגלישה!",
+    "ימי גלישה טובים:",
+    "גלים קטנים השבוע",
+    "(כולם מתחת ל-0.3 מ')",
+)
+VOCABULARY = HEBREW_DAYS + HEBREW_DAY_LETTERS + SESSION_NAMES + QUALITY_TERMS + REPORT_PHRASES
+
+_shaper: Optional[Callable[[str], str]] = None
+_preshaped: Dict[str, str] = {}
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def _load_shaper() -> Optional[Callable[[str], str]]:
+    try:
+        import arabic_reshaper
+        from bidi.algorithm import get_display
+    except ImportError:
+        return None
+
+    def shape(text: str) -> str:
+        return get_display(arabic_reshaper.reshape(text))
+
+    return shape
+
+
+def _ensure_initialized() -> None:
+    global _shaper, _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+        _shaper = _load_shaper()
+        if _shaper is not None:
+            for text in VOCABULARY:
+                try:
+                    _preshaped[text] = _shaper(text)
+                except Exception:
+                    _preshaped[text] = text
+        _initialized = True
+
+
+@lru_cache(maxsize=1024)
+def _shape_uncached(text: str) -> str:
+    try:
+        return _shaper(text)
+    except Exception:
+        return text
+
+
+def shape_rtl(text: str) -> str:
+    """Return text reshaped and reordered for left-to-right renderers"""
+    if not text:
+        return text
+    _ensure_initialized()
+    if _shaper is None:
+        return text
+    shaped = _preshaped.get(text)
+    if shaped is not None:
+        return shaped
+    return _shape_uncached(text)
+
+
+def rtl_available() -> bool:
+    """True when arabic_reshaper and python-bidi are installed"""
+    _ensure_initialized()
+    return _shaper is not None
+
+
+def shape_cache_info():
+    """lru_cache statistics for text outside the precomputed vocabulary"""
+    return _shape_uncached.cache_info()
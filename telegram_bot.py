@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Interactive Telegram bot for the surf forecast
+
+Long-polls getUpdates and answers commands from a shared forecast cache:
+
+    /today [beach]   today's sessions
+    /week [beach]    surfable sessions for the coming week
+    /beach <name>    the week for another beach (e.g. /beach netanya)
+    /beaches         list the known beaches
+
+Each beach is fetched at most once per refresh interval and its reply texts
+are rendered when the forecast is stored, so answering a command is a dict
+lookup and upstream traffic does not grow with the number of users. A failed
+fetch is not retried for RETRY_AFTER seconds, and commands that do need a
+fetch are answered from a small worker pool so they never hold up the rest
+of the batch.
+
+Usage:
+    TELEGRAM_BOT_TOKEN=... python telegram_bot.py
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+import requests
+
+from surf_core import ISRAEL_TZ
+from surf_core.log import configure_logging
+from wave_forecast import FourSurfersWaveForecast
+
+DEFAULT_BEACH = 'ashkelon'
+REFRESH_INTERVAL = 3600
+RETRY_AFTER = 300
+SESSION_TIMES = ('06:00', '09:00', '12:00', '18:00')
+
+HELP_TEXT = (
+    "🏄‍♂️ <b>בוט תחזית גלים</b>\n\n"
+    "/today - התחזית להיום\n"
+    "/week - ימי גלישה השבוע\n"
+    "/beach netanya - תחזית לחוף אחר\n"
+    "/beaches - רשימת החופים"
+)
+
+
+def _height_emoji(height: float) -> str:
+    if height >= 0.8:
+        return "🌊🌊"
+    if height >= 0.5:
+        return "🌊"
+    return "〰️"
+
+
+def format_today(forecast: FourSurfersWaveForecast, forecast_data: Dict) -> str:
+    """All of today's sessions (or the first forecast day when today is missing)"""
+    daily = forecast_data.get('daily_forecasts') or {}
+    if not daily:
+        return "❌ אין נתוני תחזית זמינים"
+    today = datetime.now(ISRAEL_TZ).strftime('%Y-%m-%d')
+    date_key = today if today in daily else sorted(daily)[0]
+    day = daily[date_key]
+    beach = forecast_data.get('beach_hebrew') or forecast_data.get('beach', '')
+
+    lines = [f"🌊 <b>תחזית גלים {beach}</b>",
+             f"📅 <b>{day.get('hebrew_day', '')} ({day.get('hebrew_date', date_key[-5:])})</b>"]
+    times = day.get('times', {})
+    for time_key in SESSION_TIMES:
+        info = times.get(time_key)
+        if not info:
+            continue
+        height = info.get('wave_height') or 0
+        quality = (info.get('surf_quality') or '').split('(')[0].strip()
+        session = forecast._get_hebrew_session_name(time_key)
+        lines.append(f"  {_height_emoji(height)} {time_key} {session}: {quality} ({height:.1f}מ')")
+    return "\n".join(lines)
+
+
+class ForecastCache:
+    """Per-beach forecasts with pre-rendered reply texts, refreshed at most once per interval"""
+
+    def __init__(self, forecast: FourSurfersWaveForecast, ttl: float = REFRESH_INTERVAL,
+                 fetchers: Optional[Dict[str, Callable[[], Optional[Dict]]]] = None,
+                 retry_after: float = RETRY_AFTER):
+        """
+        Args:
+            forecast: Forecast object used for fetching and message formatting
+            ttl: Seconds a beach's forecast is served before it is fetched again
+            fetchers: Beach key -> fetch function (default: API for Ashkelon,
+                      browser scrape for the other beach_slugs)
+            retry_after: Seconds after a failed fetch before the beach is tried
+                         again; until then the stale entry (or None) is served
+        """
+        self.forecast = forecast
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.fetchers = fetchers or {}
+        self.entries: Dict[str, Dict] = {}
+        self.failed: Dict[str, float] = {}
+        self.fetches = 0
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _fetch(self, beach: str) -> Optional[Dict]:
+        fetcher = self.fetchers.get(beach)
+        if fetcher is not None:
+            return fetcher()
+        if beach == DEFAULT_BEACH:
+            return self.forecast.get_ashkelon_forecast()
+        return self.forecast.fetch_wave_data(beach)
+
+    def _lock(self, beach: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(beach, threading.Lock())
+
+    def store(self, beach: str, forecast_data: Dict) -> Dict:
+        """Render and cache the reply texts for one beach"""
+        entry = {
+            'forecast_data': forecast_data,
+            'fetched': time.time(),
+            'messages': {
+                'today': format_today(self.forecast, forecast_data),
+                'week': self.forecast.generate_hebrew_wave_summary(forecast_data),
+            },
+        }
+        self.entries[beach] = entry
+        return entry
+
+    def is_ready(self, beach: str) -> bool:
+        """True when get() answers without fetching (fresh entry, or a recent failure)"""
+        now = time.time()
+        entry = self.entries.get(beach)
+        if entry and now - entry['fetched'] < self.ttl:
+            return True
+        failed_at = self.failed.get(beach)
+        return failed_at is not None and now - failed_at < self.retry_after
+
+    def get(self, beach: str) -> Optional[Dict]:
+        """Cached entry for a beach, fetching it when missing or older than ttl"""
+        if self.is_ready(beach):
+            return self.entries.get(beach)
+        # One fetch per beach at a time; concurrent callers wait and reuse it
+        with self._lock(beach):
+            if self.is_ready(beach):
+                return self.entries.get(beach)
+            self.fetches += 1
+            try:
+                forecast_data = self._fetch(beach)
+            except Exception as e:
+                print(f"⚠️ Forecast fetch for {beach} failed: {e}")
+                forecast_data = None
+            if forecast_data and forecast_data.get('daily_forecasts'):
+                self.failed.pop(beach, None)
+                return self.store(beach, forecast_data)
+            # Keep serving the stale forecast (or nothing) until retry_after passes
+            self.failed[beach] = time.time()
+            return self.entries.get(beach)
+
+    def message(self, beach: str, kind: str) -> str:
+        entry = self.get(beach)
+        if entry is None:
+            return "❌ לא ניתן לקבל תחזית כרגע, נסו שוב מאוחר יותר"
+        return entry['messages'][kind]
+
+
+class TelegramBot:
+    """getUpdates long-polling loop answering forecast commands"""
+
+    def __init__(self, bot_token: str, cache: ForecastCache, transport: Any = None,
+                 poll_timeout: int = 30, workers: int = 4):
+        """
+        Args:
+            bot_token: Telegram bot token
+            cache: Shared forecast cache
+            transport: Object with a requests-compatible post() (default: requests.Session)
+            poll_timeout: getUpdates long-poll timeout in seconds
+            workers: Threads answering commands that have to wait for a fetch
+        """
+        self.api_url = f"https://api.telegram.org/bot{bot_token}/"
+        self.cache = cache
+        self.transport = transport or requests.Session()
+        self.poll_timeout = poll_timeout
+        self.offset = 0
+        self.beaches = cache.forecast.beach_slugs
+        self.workers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bot-reply')
+        self.pending: Set = set()
+
+    def resolve_beach(self, name: str) -> Optional[str]:
+        """Beach key from an English key ('tel aviv-jaffa') or Hebrew name ('נתניה')"""
+        key = name.strip().lower().replace(' ', '-')
+        if key in self.beaches:
+            return key
+        for beach, hebrew in self.beaches.items():
+            if hebrew == name.strip():
+                return beach
+        return None
+
+    @staticmethod
+    def _parse_command(text: str) -> Tuple[str, str]:
+        command, _, argument = text.partition(' ')
+        return command.split('@', 1)[0].lower(), argument.strip()
+
+    def command_beach(self, text: str) -> Optional[str]:
+        """Beach whose forecast a command message needs (None when it needs none)"""
+        if not text.startswith('/'):
+            return None
+        command, argument = self._parse_command(text)
+        if command not in ('/today', '/week', '/beach') or (command == '/beach' and not argument):
+            return None
+        return self.resolve_beach(argument) if argument else DEFAULT_BEACH
+
+    def reply_for(self, text: str) -> Optional[str]:
+        """Answer text for a command message (None for non-commands)"""
+        if not text.startswith('/'):
+            return None
+        command, argument = self._parse_command(text)
+
+        if command in ('/start', '/help'):
+            return HELP_TEXT
+        if command == '/beaches':
+            return "🏖️ " + "\n".join(f"{key} - {hebrew}" for key, hebrew in self.beaches.items())
+        if command in ('/today', '/week', '/beach'):
+            if command == '/beach' and not argument:
+                return "ציינו חוף, למשל: /beach netanya"
+            beach = self.resolve_beach(argument) if argument else DEFAULT_BEACH
+            if beach is None:
+                return f"❓ חוף לא מוכר: {argument}\n/beaches לרשימת החופים"
+            return self.cache.message(beach, 'today' if command == '/today' else 'week')
+        return HELP_TEXT
+
+    def _call(self, method: str, payload: Dict, timeout: float = 10) -> Any:
+        response = self.transport.post(self.api_url + method, json=payload, timeout=timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"{method} failed: {response.status_code} - {response.text[:200]}")
+        return response.json().get('result')
+
+    def answer(self, message: Dict) -> None:
+        """Reply to one incoming message (no-op for non-commands)"""
+        reply = self.reply_for(message.get('text') or '')
+        if reply is None:
+            return
+        try:
+            self._call('sendMessage', {
+                'chat_id': message['chat']['id'],
+                'text': reply,
+                'parse_mode': 'HTML',
+                'reply_to_message_id': message.get('message_id'),
+            })
+        except Exception as e:
+            print(f"❌ Error answering chat {message.get('chat', {}).get('id')}: {e}")
+
+    def poll_once(self) -> int:
+        """
+        Fetch one batch of updates and answer them; returns the number handled
+
+        Commands answered from the cache are sent inline. Ones that have to
+        wait for a fetch go to the worker pool, so a slow beach does not delay
+        the replies behind it.
+        """
+        updates = self._call('getUpdates', {
+            'offset': self.offset,
+            'timeout': self.poll_timeout,
+            'allowed_updates': ['message'],
+        }, timeout=self.poll_timeout + 10) or []
+        for update in updates:
+            self.offset = max(self.offset, update['update_id'] + 1)
+            message = update.get('message') or {}
+            beach = self.command_beach(message.get('text') or '')
+            if beach is None or self.cache.is_ready(beach):
+                self.answer(message)
+                continue
+            future = self.workers.submit(self.answer, message)
+            self.pending.add(future)
+            future.add_done_callback(self.pending.discard)
+        return len(updates)
+
+    def wait_pending(self, timeout: Optional[float] = None) -> None:
+        """Block until replies handed to the worker pool have been sent"""
+        wait(list(self.pending), timeout)
+
+    def refresh_loop(self, beaches: Tuple[str, ...] = (DEFAULT_BEACH,), stop: Optional[threading.Event] = None) -> None:
+        """Keep the given beaches warm so user commands never wait for a fetch"""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            for beach in beaches:
+                try:
+                    self.cache.get(beach)
+                except Exception as e:
+                    print(f"⚠️ Forecast refresh for {beach} failed: {e}")
+            stop.wait(max(60.0, self.cache.ttl / 2))
+
+    def run(self, warm_beaches: Tuple[str, ...] = (DEFAULT_BEACH,)) -> None:
+        print("🤖 Telegram bot started (long polling)")
+        threading.Thread(target=self.refresh_loop, args=(warm_beaches,), daemon=True).start()
+        while True:
+            try:
+                self.poll_once()
+            except KeyboardInterrupt:
+                raise
+            except Exception as e:
+                print(f"⚠️ getUpdates failed: {e}")
+                time.sleep(5)
+
+
+def main():
+    configure_logging()
+    bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
+    if not bot_token:
+        print("❌ TELEGRAM_BOT_TOKEN environment variable not set")
+        return
+    forecast = FourSurfersWaveForecast(telegram_bot_token=bot_token)
+    cache = ForecastCache(forecast, ttl=int(os.getenv('BOT_REFRESH_INTERVAL', REFRESH_INTERVAL)),
+                          retry_after=int(os.getenv('BOT_RETRY_AFTER', RETRY_AFTER)))
+    warm = tuple(b for b in os.getenv('BOT_BEACHES', DEFAULT_BEACH).replace(',', ' ').split() if b)
+    try:
+        TelegramBot(bot_token, cache).run(warm)
+    except KeyboardInterrupt:
+        print("\n👋 Bot stopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Telegram delivery queue for surf reports
+
+Messages for any number of chats/channels are written to a local SQLite
+outbox first, then delivered concurrently over one pooled HTTP session:
+
+- A global token bucket keeps sends under Telegram's ~30 messages/second,
+  and per-chat buckets keep each chat under 1 message/second (20/minute for
+  groups and channels, whose chat IDs are negative).
+- HTTP 429 answers pause only the chat that got them and are retried after
+  the ``retry_after`` Telegram returns. A send never waits on a rate limit
+  past deliver()'s max_wait; it is left queued for a later run instead.
+  Network errors and 5xx answers back off exponentially; other 4xx answers
+  (blocked bot, unknown chat) fail the message without retrying.
+- Every message has an idempotency key (by default chat + text + day), so
+  re-running a job does not queue or send the same report twice.
+- editMessageText updates are queued the same way (see notification_state),
+  and the message_id of every sent message is kept for later edits.
+
+Usage:
+    from telegram_delivery import TelegramDelivery
+    delivery = TelegramDelivery(bot_token)
+    delivery.enqueue(['-1001234', '5678'], message)
+    stats = delivery.deliver()
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GLOBAL_RATE = 30.0  # messages per second across all chats
+PRIVATE_CHAT_RATE = 1.0  # messages per second to one user
+GROUP_CHAT_RATE = 20 / 60  # messages per second to one group/channel
+DEFAULT_OUTBOX = 'telegram_outbox.db'
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available"""
+
+    def __init__(self, rate: float, capacity: float = 1.0, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token if available; returns 0, or the seconds to wait for the next one"""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, deadline: Optional[float] = None) -> float:
+        """
+        Block until a token is taken; returns 0
+
+        With a deadline (on this bucket's clock), gives up instead of sleeping
+        past it and returns the seconds still to wait.
+        """
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return 0.0
+            if deadline is not None and self._clock() + wait > deadline:
+                return wait
+            self._sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Drain the bucket so nothing is sent for the given time (after a 429)"""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+@dataclass
+class OutboxMessage:
+    key: str
+    chat_id: str
+    text: str
+    parse_mode: str
+    attempts: int
+    method: str = 'sendMessage'
+    message_id: Optional[int] = None
+
+
+class Outbox:
+    """SQLite-backed message queue; safe to share between threads"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS outbox (
+            key TEXT PRIMARY KEY,
+            chat_id TEXT NOT NULL,
+            text TEXT NOT NULL,
+            parse_mode TEXT NOT NULL DEFAULT 'HTML',
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt REAL NOT NULL DEFAULT 0,
+            last_error TEXT,
+            created REAL NOT NULL,
+            sent REAL,
+            method TEXT NOT NULL DEFAULT 'sendMessage',
+            message_id INTEGER
+        )
+    """
+    # Columns added after the first outbox release: (name, definition)
+    MIGRATIONS = (
+        ('method', "TEXT NOT NULL DEFAULT 'sendMessage'"),
+        ('message_id', 'INTEGER'),
+    )
+
+    def __init__(self, path: str = DEFAULT_OUTBOX):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(self.SCHEMA)
+        columns = {row[1] for row in self._db.execute('PRAGMA table_info(outbox)')}
+        for name, definition in self.MIGRATIONS:
+            if name not in columns:
+                self._db.execute(f'ALTER TABLE outbox ADD COLUMN {name} {definition}')
+        self._db.execute('CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (status, next_attempt)')
+
+    @staticmethod
+    def message_key(chat_id: str, text: str, batch: Optional[str] = None,
+                    edit_message_id: Optional[int] = None) -> str:
+        """Idempotency key: one message per chat, text and batch (default: today's date)"""
+        batch = batch or datetime.now().strftime('%Y-%m-%d')
+        if edit_message_id is not None:
+            chat_id = f"{chat_id}\0edit:{edit_message_id}"
+        return hashlib.sha1(f"{chat_id}\0{batch}\0{text}".encode('utf-8')).hexdigest()
+
+    # Re-queueing a message that is not 'sent' yet (failed, or left pending by an earlier run)
+    # makes it due again with a fresh attempt budget; sent messages stay untouched
+    REQUEUE = ("ON CONFLICT(key) DO UPDATE SET status = 'pending', attempts = 0, next_attempt = 0, "
+               "last_error = NULL WHERE outbox.status != 'sent'")
+
+    def add(self, chat_ids: Iterable[str], text: str, parse_mode: str = 'HTML',
+            batch: Optional[str] = None) -> int:
+        """Queue text for every chat; returns how many messages were newly queued or re-queued after failing"""
+        now = time.time()
+        rows = [(self.message_key(str(chat_id), text, batch), str(chat_id), text, parse_mode, now)
+                for chat_id in chat_ids]
+        with self._lock:
+            keys = [row[0] for row in rows]
+            known = dict(self._db.execute(
+                f"SELECT key, status FROM outbox WHERE key IN ({','.join('?' * len(keys))})", keys).fetchall())
+            self._db.executemany(
+                'INSERT INTO outbox (key, chat_id, text, parse_mode, created) VALUES (?, ?, ?, ?, ?) ' + self.REQUEUE,
+                rows)
+        return sum(1 for key in keys if known.get(key) not in ('pending', 'sent'))
+
+    def add_edit(self, chat_id: str, message_id: int, text: str, parse_mode: str = 'HTML',
+                 batch: Optional[str] = None) -> str:
+        """Queue an editMessageText of an earlier message; returns the outbox key"""
+        key = self.message_key(str(chat_id), text, batch, edit_message_id=message_id)
+        with self._lock:
+            self._db.execute(
+                'INSERT INTO outbox (key, chat_id, text, parse_mode, created, method, message_id) '
+                "VALUES (?, ?, ?, ?, ?, 'editMessageText', ?) " + self.REQUEUE,
+                (key, str(chat_id), text, parse_mode, time.time(), message_id))
+        return key
+
+    def result(self, key: str) -> Tuple[Optional[str], Optional[int]]:
+        """(status, message_id) of a queued message; (None, None) when the key is unknown"""
+        with self._lock:
+            row = self._db.execute('SELECT status, message_id FROM outbox WHERE key = ?', (key,)).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def due(self, now: Optional[float] = None, limit: int = 1000) -> List[OutboxMessage]:
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, chat_id, text, parse_mode, attempts, method, message_id FROM outbox "
+                "WHERE status = 'pending' AND next_attempt <= ? ORDER BY created LIMIT ?",
+                (now, limit)).fetchall()
+        return [OutboxMessage(*row) for row in rows]
+
+    def next_attempt(self) -> Optional[float]:
+        """Earliest retry time among pending messages (None when nothing is pending)"""
+        with self._lock:
+            row = self._db.execute("SELECT MIN(next_attempt) FROM outbox WHERE status = 'pending'").fetchone()
+        return row[0]
+
+    def mark_sent(self, key: str, message_id: Optional[int] = None) -> None:
+        with self._lock:
+            self._db.execute("UPDATE outbox SET status = 'sent', attempts = attempts + 1, sent = ?, "
+                             "last_error = NULL, message_id = COALESCE(?, message_id) WHERE key = ?",
+                             (time.time(), message_id, key))
+
+    def mark_retry(self, key: str, delay: float, error: str) -> None:
+        with self._lock:
+            self._db.execute("UPDATE outbox SET attempts = attempts + 1, next_attempt = ?, last_error = ? "
+                             "WHERE key = ?", (time.time() + delay, error, key))
+
+    def defer(self, key: str, delay: float) -> None:
+        """Push a message back without spending an attempt (rate limited, not sent)"""
+        with self._lock:
+            self._db.execute('UPDATE outbox SET next_attempt = ? WHERE key = ?', (time.time() + delay, key))
+
+    def mark_failed(self, key: str, error: str) -> None:
+        with self._lock:
+            self._db.execute("UPDATE outbox SET status = 'failed', attempts = attempts + 1, last_error = ? "
+                             "WHERE key = ?", (error, key))
+
+    def cancel(self, key: str) -> None:
+        """Drop a message that was not sent yet (e.g. an edit superseded by a new message)"""
+        with self._lock:
+            self._db.execute("UPDATE outbox SET status = 'cancelled' WHERE key = ? AND status != 'sent'", (key,))
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._db.execute('SELECT status, COUNT(*) FROM outbox GROUP BY status').fetchall())
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class TelegramDelivery:
+    """Sends queued outbox messages concurrently within Telegram's rate limits"""
+
+    def __init__(self, bot_token: str, outbox: Optional[Outbox] = None, transport: Any = None,
+                 workers: int = 16, max_attempts: int = 5, timeout: float = 10.0,
+                 clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            bot_token: Telegram bot token
+            outbox: Message queue (default: TELEGRAM_OUTBOX env var or telegram_outbox.db)
+            transport: Object with a requests-compatible post() (default: pooled requests.Session)
+            workers: Concurrent sends
+            max_attempts: Attempts per message before it is marked failed
+            timeout: Per-request timeout in seconds
+            clock, sleep: Time source and sleep of the rate limiters (tests pass fakes)
+        """
+        self.api_url = f"https://api.telegram.org/bot{bot_token}/"
+        self.outbox = outbox or Outbox(os.getenv('TELEGRAM_OUTBOX', DEFAULT_OUTBOX))
+        if transport is None:
+            transport = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+            transport.mount('https://', adapter)
+        self.transport = transport
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.clock = clock
+        self.sleep = sleep
+        self.global_bucket = TokenBucket(GLOBAL_RATE, capacity=GLOBAL_RATE, clock=clock, sleep=sleep)
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    def enqueue(self, chat_ids: Iterable[str], text: str, parse_mode: str = 'HTML',
+                batch: Optional[str] = None) -> int:
+        """Queue a message for many chats (duplicates of already queued messages are ignored)"""
+        return self.outbox.add(chat_ids, text, parse_mode, batch)
+
+    def enqueue_edit(self, chat_id: str, message_id: int, text: str, parse_mode: str = 'HTML',
+                     batch: Optional[str] = None) -> str:
+        """Queue an edit of a message sent earlier; returns the outbox key"""
+        return self.outbox.add_edit(chat_id, message_id, text, parse_mode, batch)
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        with self._buckets_lock:
+            bucket = self._chat_buckets.get(chat_id)
+            if bucket is None:
+                rate = GROUP_CHAT_RATE if chat_id.startswith('-') or chat_id.startswith('@') else PRIVATE_CHAT_RATE
+                bucket = self._chat_buckets[chat_id] = TokenBucket(rate, clock=self.clock, sleep=self.sleep)
+            return bucket
+
+    def _send(self, message: OutboxMessage, deadline: Optional[float] = None) -> str:
+        """
+        Send one message and record the outcome; returns 'sent', 'retry' or 'failed'
+
+        deadline is on self.clock: a rate limit that would hold the message past
+        it defers the message in the outbox instead of blocking this worker.
+        """
+        for bucket in (self._chat_bucket(message.chat_id), self.global_bucket):
+            wait = bucket.acquire(deadline)
+            if wait:
+                self.outbox.defer(message.key, wait)
+                return 'retry'
+        attempt = message.attempts + 1
+        payload = {
+            'chat_id': message.chat_id,
+            'text': message.text,
+            'parse_mode': message.parse_mode,
+        }
+        if message.method == 'editMessageText':
+            payload['message_id'] = message.message_id
+        try:
+            response = self.transport.post(self.api_url + message.method, json=payload, timeout=self.timeout)
+        except Exception as e:
+            return self._retry(message, attempt, 2 ** attempt, f"{type(e).__name__}: {e}")
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        if response.status_code == 200:
+            result = body.get('result')
+            self.outbox.mark_sent(message.key, result.get('message_id') if isinstance(result, dict) else None)
+            return 'sent'
+
+        error = f"{response.status_code}: {body.get('description', response.text[:200])}"
+        if message.method == 'editMessageText' and 'message is not modified' in error:
+            self.outbox.mark_sent(message.key)
+            return 'sent'
+        if response.status_code == 429:
+            retry_after = float((body.get('parameters') or {}).get('retry_after', 1))
+            # Only this chat waits; a long retry_after must not stall every other chat
+            self._chat_bucket(message.chat_id).pause(retry_after)
+            return self._retry(message, attempt, retry_after, error)
+        if response.status_code >= 500:
+            return self._retry(message, attempt, 2 ** attempt, error)
+
+        self.outbox.mark_failed(message.key, error)
+        print(f"❌ Telegram message to {message.chat_id} failed: {error}")
+        return 'failed'
+
+    def _retry(self, message: OutboxMessage, attempt: int, delay: float, error: str) -> str:
+        if attempt >= self.max_attempts:
+            self.outbox.mark_failed(message.key, error)
+            print(f"❌ Telegram message to {message.chat_id} failed after {attempt} attempts: {error}")
+            return 'failed'
+        self.outbox.mark_retry(message.key, delay, error)
+        return 'retry'
+
+    def deliver(self, max_wait: float = 120.0) -> Dict[str, int]:
+        """
+        Send every due message, waiting for scheduled retries up to max_wait seconds
+
+        Returns:
+            Counts of sent/retry/failed outcomes in this run plus the outbox 'pending' total
+        """
+        stats = {'sent': 0, 'retry': 0, 'failed': 0}
+        deadline = time.time() + max_wait
+        bucket_deadline = self.clock() + max_wait
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                due = self.outbox.due()
+                if due:
+                    for outcome in pool.map(lambda message: self._send(message, bucket_deadline), due):
+                        stats[outcome] += 1
+                    continue
+                next_attempt = self.outbox.next_attempt()
+                if next_attempt is None or next_attempt > deadline:
+                    break
+                time.sleep(max(0.0, next_attempt - time.time()))
+        stats['pending'] = self.outbox.counts().get('pending', 0)
+        return stats
+
+
+def parse_chat_ids(value: Optional[str]) -> List[str]:
+    """Split a comma/whitespace separated TELEGRAM_CHAT_ID value into chat IDs"""
+    return [part for part in (value or '').replace(',', ' ').split() if part]
+
+
+def deliver_message(bot_token: str, chat_ids: Iterable[str], message: str, **kwargs) -> bool:
+    """Queue one message for every chat and deliver it; True when nothing failed or is left pending"""
+    delivery = TelegramDelivery(bot_token, **kwargs)
+    try:
+        queued = delivery.enqueue(chat_ids, message)
+        stats = delivery.deliver()
+    finally:
+        delivery.outbox.close()
+    print(f"📬 Telegram delivery: {queued} queued, {stats['sent']} sent, "
+          f"{stats['failed']} failed, {stats['pending']} pending")
+    return stats['failed'] == 0 and stats['pending'] == 0
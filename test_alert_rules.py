@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Test the vectorized per-subscriber alert rules"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alert_rules import AlertRule, ForecastArrays, RuleSet, feet
+from daily_surf_report import (format_telegram_message, get_surf_forecast, has_surfable_waves,
+                                parse_forecast_data, surfable_slots)
+from replay import ReplayTransport
+from surf_core import ISRAEL_TZ, parse_forecast, parse_local
+
+
+def load_sessions():
+    return parse_forecast_data(get_surf_forecast(transport=ReplayTransport()))
+
+
+def session(height_ft, period_s, time_key='06:00'):
+    return {'date': '2025-10-27', 'sessions': [
+        {'time': time_key, 'height_ft': height_ft, 'period_s': period_s, 'wind_kts': 5}]}
+
+
+def test_has_surfable_waves_thresholds():
+    assert has_surfable_waves([session(2.0, 6.5)])
+    assert not has_surfable_waves([session(1.9, 7.9)])
+    assert has_surfable_waves([session(1.8, 8.0)])
+    assert not has_surfable_waves([session(2.0, 6.4)])
+    assert not has_surfable_waves([])
+    assert has_surfable_waves([session(1.5, 6.5)], min_height_ft=1.5)
+    assert not has_surfable_waves([session(2.0, 6.5)], min_period_s=7.0)
+    # A custom standard threshold keeps the quality long-period swell rule
+    assert has_surfable_waves([session(1.8, 8.0)], min_height_ft=3.0)
+
+
+def test_has_surfable_waves_matches_loop():
+    forecast_days = load_sessions()
+    expected = any(
+        (s['height_ft'] >= 2.0 and s['period_s'] >= 6.5) or (s['height_ft'] >= 1.8 and s['period_s'] >= 8.0)
+        for day in forecast_days for s in day['sessions']
+    )
+    assert has_surfable_waves(forecast_days) == expected
+
+
+def test_subscribers_to_alert():
+    days = parse_forecast(ReplayTransport()._payload_for('GetBeachAreaForecast'))
+    arrays = ForecastArrays.from_days(days)
+    start = parse_local('2025-10-27T00:00:00').epoch
+    rules = RuleSet([
+        AlertRule('small', min_height_m=0.3),
+        AlertRule('big', min_height_m=5.0),
+        AlertRule('mornings', min_height_m=0.3, hours=(6,), window_hours=24),
+        AlertRule('other-beach', min_height_m=0.0, beach_id=7),
+        AlertRule('small', min_height_m=0.0, max_wind_kts=-1),
+    ])
+    alerts = rules.subscribers_to_alert(arrays, now=start)
+    assert set(alerts) == {'small', 'mornings'}
+    assert [arrays.labels[i] for i in alerts['mornings']] == [('2025-10-27', '06:00')]
+    assert len(alerts['small']) == int((arrays.height_m >= 0.3).sum())
+
+
+def test_many_subscribers_one_pass():
+    days = parse_forecast(ReplayTransport()._payload_for('GetBeachAreaForecast'))
+    arrays = ForecastArrays.from_days(days)
+    rules = RuleSet(AlertRule(str(i), min_height_m=feet(1 + i % 4), min_period_s=5 + i % 4)
+                    for i in range(5000))
+    start = time.perf_counter()
+    matches = rules.subscriber_matches(arrays, now=0)
+    assert matches.shape == (5000, len(arrays))
+    assert time.perf_counter() - start < 1.0
+
+
+def test_rule_from_dict():
+    rule = AlertRule.from_dict({'subscriber': '42', 'min_height_ft': 2.0, 'hours': [6, 12]})
+    assert rule.min_height_m == feet(2.0) and rule.hours == (6, 12)
+
+
+def test_quality_sessions_follow_surfable_rules():
+    day = {'date': '2025-10-27', 'hebrew_day': 'שני', 'date_display': '27/10', 'sessions': [
+        dict(s, stars='', hebrew_desc='')
+        for h, p, t in ((2.0, 6.5, '06:00'), (1.9, 7.9, '09:00'), (1.8, 8.0, '12:00'))
+        for s in session(h, p, t)['sessions']]}
+    days = [day]
+    assert surfable_slots(days) == {('2025-10-27', '06:00'), ('2025-10-27', '12:00')}
+    message = format_telegram_message(days)
+    assert '06:00' in message and '12:00' in message and '09:00' not in message
+
+
+def test_wave_forecast_report_rules():
+    from wave_forecast import FourSurfersWaveForecast
+
+    forecast = FourSurfersWaveForecast()
+    today = datetime.now(ISRAEL_TZ).strftime('%Y-%m-%d')
+    week_ahead = (datetime.now(ISRAEL_TZ) + timedelta(days=7)).strftime('%Y-%m-%d')
+
+    def forecast_data(days):
+        return {'daily_forecasts': {date: {'times': {time_key: {'wave_height': height}
+                                                     for time_key, height in times.items()}}
+                                    for date, times in days.items()}}
+
+    # Strictly above ankle height, and only within the next 72 hours
+    assert forecast.check_good_waves_next_72h(forecast_data({today: {'00:00': 0.5}}))
+    assert not forecast.check_good_waves_next_72h(forecast_data({today: {'00:00': 0.4}}))
+    assert not forecast.check_good_waves_next_72h(forecast_data({week_ahead: {'06:00': 1.5}}))
+
+    summary = forecast.generate_hebrew_wave_summary(forecast_data({today: {'06:00': 0.3, '12:00': 0.2, '09:00': 1.0}}))
+    assert '0.3' in summary and '0.2' not in summary and '1.0' not in summary
+
+
+if __name__ == '__main__':
+    for name, fn in sorted(globals().items()):
+        if name.startswith('test_'):
+            fn()
+            print(f"✅ {name}")
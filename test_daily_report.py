@@ -1,22 +1,74 @@
 #!/usr/bin/env python3
-"""Test the daily surf report script without Telegram"""
+"""Test the daily surf report script without Telegram
+
+Runs offline against the recorded API payload (api_debug_full.json) by default.
+Use --live to hit the real 4surfers.co.il API instead.
+"""
 
 import sys
 sys.path.insert(0, '.')
 
+import requests
+
 from daily_surf_report import (
     get_surf_forecast,
     parse_forecast_data,
     has_surfable_waves,
     format_telegram_message
 )
+from replay import ReplayTransport
+
+
+def test_fetch_and_parse_replay():
+    """Recorded payload goes through fetch, parse and formatting"""
+    api_data = get_surf_forecast(transport=ReplayTransport())
+    assert api_data and api_data.get('dailyForecastList')
+
+    forecast_days = parse_forecast_data(api_data)
+    assert len(forecast_days) == 3
+    assert forecast_days[0]['date'] == '2025-10-27'
+    assert [s['time'] for s in forecast_days[0]['sessions']] == ['06:00', '09:00', '12:00', '18:00']
+
+    message = format_telegram_message(forecast_days)
+    assert message
+
+
+def test_fetch_simulated_failures():
+    """Simulated upstream failures surface as None, not exceptions"""
+    assert get_surf_forecast(transport=ReplayTransport(failure_rate=1.0)) is None
+    assert get_surf_forecast(transport=ReplayTransport(error_rate=1.0)) is None
+
+
+def test_replay_errors_match_requests():
+    """Replayed failures raise the requests exceptions callers catch"""
+    url = 'https://4surfers.co.il/webapi/BeachArea/GetBeachAreaForecast'
+    for transport, error in ((ReplayTransport(error_rate=1.0), requests.exceptions.ConnectionError),
+                             (ReplayTransport(latency=0.05), requests.exceptions.Timeout)):
+        try:
+            transport.post(url, json={'beachAreaId': 80}, timeout=0.01)
+        except error:
+            pass
+        else:
+            raise AssertionError(f"expected {error.__name__}")
+
+    ReplayTransport().post(url, json={'beachAreaId': 80}).raise_for_status()
+    response = ReplayTransport(failure_rate=1.0).post(url, json={'beachAreaId': 80})
+    try:
+        response.raise_for_status()
+    except requests.exceptions.HTTPError as e:
+        assert e.response is response and '503' in str(e)
+    else:
+        raise AssertionError("expected HTTPError")
+
 
 def main():
-    print("🧪 Testing Daily Surf Report\n")
+    live = '--live' in sys.argv
+    transport = None if live else ReplayTransport()
+    print(f"🧪 Testing Daily Surf Report ({'live API' if live else 'replay'})\n")
     
     # Test 1: Fetch forecast
     print("1️⃣ Testing API fetch...")
-    api_data = get_surf_forecast()
+    api_data = get_surf_forecast(transport=transport)
     if api_data:
         print(f"   ✅ Got API data")
         print(f"   Days in response: {len(api_data.get('dailyForecastList', []))}")
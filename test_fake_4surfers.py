@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Test the fetchers against the local fake 4surfers API server"""
+
+import os
+import sys
+import tempfile
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from daily_surf_report import get_surf_forecast
+from fake_4surfers import FakeFourSurfers
+from fakes import make_health
+from surf_core.endpoints import AREA_DATA_ENDPOINT, FORECAST_ENDPOINT, api_url
+from wave_forecast import FourSurfersWaveForecast
+
+
+def make_forecast(server):
+    os.chdir(tempfile.mkdtemp(prefix='fake_4surfers_'))  # API responses are saved to the cwd
+    return FourSurfersWaveForecast(base_url=server.url, source_health=make_health())
+
+
+def test_daily_report_fetch():
+    with FakeFourSurfers() as server:
+        data = get_surf_forecast(base_url=server.url)
+        assert data and data['dailyForecastList']
+        assert server.stats() == {f'{FORECAST_ENDPOINT} 200': 1}
+
+
+def test_wave_forecast_extended_and_basic_api():
+    with FakeFourSurfers(latency=0.01) as server:
+        forecast = make_forecast(server)
+        result = forecast.get_ashkelon_forecast_api()
+        assert result and len(result['daily_forecasts']) == 10
+        assert forecast._try_basic_forecast_api()
+        assert server.stats()[f'{AREA_DATA_ENDPOINT} 200'] == 1
+
+
+def test_injected_errors():
+    with FakeFourSurfers(error_rate=1.0) as server:
+        assert get_surf_forecast(base_url=server.url) is None
+        assert server.stats() == {f'{FORECAST_ENDPOINT} 503': 1}
+
+    with FakeFourSurfers(jwt_expired_rate=1.0) as server:
+        response = requests.post(api_url(FORECAST_ENDPOINT, server.url), json={'beachAreaId': '80'})
+        assert response.status_code == 401 and 'JWT' in response.json()['message']
+
+    with FakeFourSurfers(check_jwt=True) as server:
+        forecast = make_forecast(server)  # extended API ships a long-expired anonymous token
+        assert forecast.get_ashkelon_forecast_api()  # basic API sends none and still answers
+        assert server.stats() == {f'{FORECAST_ENDPOINT} 401': 1, f'{AREA_DATA_ENDPOINT} 200': 1}
+
+
+def test_synthetic_beaches():
+    with FakeFourSurfers(days=3) as server:
+        data = get_surf_forecast(beach_id='81', base_url=server.url)
+        assert len(data['dailyForecastList']) == 3
+        area = requests.post(api_url(AREA_DATA_ENDPOINT, server.url), json={'beachAreaId': 81}).json()
+        assert area['DailyForecast'] and 'surfHeightDesc' in area['lastCSC']
+        assert requests.get(f'{server.url}/__stats').json() == server.stats()
+
+
+def test_base_url_from_environment():
+    os.environ['FOURSURFERS_BASE_URL'] = 'http://127.0.0.1:1/'
+    try:
+        assert api_url(FORECAST_ENDPOINT) == f'http://127.0.0.1:1/webapi/BeachArea/{FORECAST_ENDPOINT}'
+        assert FourSurfersWaveForecast().base_url == 'http://127.0.0.1:1'
+    finally:
+        del os.environ['FOURSURFERS_BASE_URL']
+
+
+if __name__ == '__main__':
+    for name, fn in sorted(globals().items()):
+        if name.startswith('test_'):
+            fn()
+            print(f"✅ {name}")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Test the custom_components Home Assistant sensor against the recorded payload
+
+Home Assistant itself is not needed: when it is not installed, the handful of
+names sensor.py imports from it are stubbed while the module loads.
+"""
+
+import asyncio
+import dataclasses
+from datetime import date
+import enum
+import importlib
+import importlib.util
+import os
+import sys
+import types
+from unittest import mock
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, REPO_DIR)
+
+from replay import ReplayTransport
+
+
+def homeassistant_stubs():
+    """sys.modules entries for the Home Assistant names the integration imports"""
+    class SensorEntity:
+        hass = None
+
+        def async_on_remove(self, func):
+            pass
+
+        def async_write_ha_state(self):
+            pass
+
+    modules = {name: types.ModuleType(name) for name in (
+        'homeassistant', 'homeassistant.components', 'homeassistant.components.sensor', 'homeassistant.core',
+        'homeassistant.helpers', 'homeassistant.helpers.aiohttp_client', 'homeassistant.helpers.event',
+        'homeassistant.helpers.typing',
+    )}
+    modules['homeassistant.components.sensor'].SensorEntity = SensorEntity
+    modules['homeassistant.components.sensor'].SensorStateClass = enum.Enum('SensorStateClass', {'MEASUREMENT': 'measurement'})
+    core = modules['homeassistant.core']
+    core.HomeAssistant = core.ServiceCall = object
+    core.ServiceResponse = dict
+    core.SupportsResponse = enum.Enum('SupportsResponse', {'NONE': 'none', 'OPTIONAL': 'optional', 'ONLY': 'only'})
+    modules['homeassistant.helpers.aiohttp_client'].async_get_clientsession = lambda hass: None
+    modules['homeassistant.helpers.event'].async_track_time_interval = lambda hass, action, interval: lambda: None
+    modules['homeassistant.helpers.typing'].ConfigType = dict
+    return modules
+
+
+def load_sensor():
+    """Import custom_components.ashkelon_surf.sensor, with stubs only while it loads"""
+    if importlib.util.find_spec('homeassistant') is not None:
+        return importlib.import_module('custom_components.ashkelon_surf.sensor')
+    with mock.patch.dict(sys.modules, homeassistant_stubs()):
+        return importlib.import_module('custom_components.ashkelon_surf.sensor')
+
+
+sensor = load_sensor()
+# Days are picked by Israel-local date; the recorded payload starts on 2025-10-27
+RECORDED_TODAY = date(2025, 10, 27)
+mock.patch.object(sensor, '_israel_today', lambda: RECORDED_TODAY).start()
+
+
+def forecast_data(compact=False):
+    return sensor.SurfForecastData(None, session=ReplayTransport().aiohttp_session(), compact=compact)
+
+
+def fetch(compact=False):
+    return asyncio.run(forecast_data(compact).async_get_data())
+
+
+def test_records_are_frozen_and_slotted():
+    days = forecast_data()._parse_response(ReplayTransport()._payload_for('GetBeachAreaForecast'))
+    assert len(days) == 3
+    day, session = days[0], days[0].sessions[0]
+    for record in (day, session):
+        assert not hasattr(record, '__dict__')
+        try:
+            record.stars = '⭐'
+        except dataclasses.FrozenInstanceError:
+            pass
+        else:
+            raise AssertionError(f"{type(record).__name__} is mutable")
+    # Serialized once and reused
+    assert session.as_dict() is session.as_dict() and day.as_dict() is day.as_dict()
+    assert set(session.as_dict()) == set(sensor.SESSION_FIELDS)
+    assert day.as_dict()['sessions'][0] is session.as_dict()
+    assert day.best_session.height_m == max(s.height_m for s in day.sessions)
+
+
+def test_compact_attributes():
+    full, compact = fetch()['days'], fetch(compact=True)['days']
+    assert len(full) == len(compact) == 3
+    for day, packed in zip(full, compact):
+        assert {k: v for k, v in day.items() if k not in ('sessions', 'best_session')} == \
+            {k: v for k, v in packed.items() if k not in ('sessions', 'best_session')}
+        columns = packed['sessions']
+        assert list(columns) == list(sensor.SESSION_FIELDS)
+        assert [dict(zip(columns, row)) for row in zip(*columns.values())] == day['sessions']
+        assert packed['best_session'] == (day['best_session'] or {}).get('time')
+
+
+def test_days_selected_by_date():
+    payload = ReplayTransport()._payload_for('GetBeachAreaForecast')
+    days = forecast_data()._parse_response(payload)
+    assert [day.date_iso for day in days] == ['2025-10-27', '2025-10-28', '2025-10-29']
+    assert days[0].label == 'Today' and days[1].label != 'Today'
+
+    # A day later the list still starts yesterday: "Today" is the 28th, not the first entry
+    with mock.patch.object(sensor, '_israel_today', lambda: date(2025, 10, 28)):
+        days = forecast_data()._parse_response(payload)
+        assert [day.date_iso for day in days] == ['2025-10-28', '2025-10-29', '2025-10-30']
+        assert days[0].label == 'Today'
+        entity = sensor.AshkelonSurfSensor(forecast_data(), 'Ashkelon Surf Tomorrow', 1)
+        asyncio.run(entity.async_update())
+        assert entity.available and entity.extra_state_attributes['forecast_date'] == '2025-10-29'
+
+    # Dates past the end of the forecast leave the sensor unavailable
+    with mock.patch.object(sensor, '_israel_today', lambda: date(2025, 12, 1)):
+        assert forecast_data()._parse_response(payload) == []
+        entity = sensor.AshkelonSurfSensor(forecast_data(), 'Ashkelon Surf Today', 0)
+        asyncio.run(entity.async_update())
+        assert not entity.available
+
+
+class FakeServices:
+    def __init__(self):
+        self.registered = {}
+
+    def has_service(self, domain, service):
+        return (domain, service) in self.registered
+
+    def async_register(self, domain, service, handler, supports_response=None):
+        self.registered[(domain, service)] = (handler, supports_response)
+
+
+def test_unrecorded_attributes():
+    entity = sensor.AshkelonSurfSensor(forecast_data(), 'Ashkelon Surf Today', 0)
+    asyncio.run(entity.async_update())
+    assert entity.available and entity.native_value == entity.extra_state_attributes['average_height_ft']
+    assert entity._unrecorded_attributes is sensor.UNRECORDED_ATTRIBUTES
+    assert sensor.UNRECORDED_ATTRIBUTES <= set(entity.extra_state_attributes)
+    # The numeric summary stays in the recorder for history and statistics
+    recorded = set(entity.extra_state_attributes) - sensor.UNRECORDED_ATTRIBUTES
+    assert recorded == {'forecast_date', 'average_height_ft', 'average_height_m', 'stars'}
+
+
+def test_refresh_skips_unchanged_writes():
+    data = forecast_data()
+    entity = sensor.AshkelonSurfSensor(data, 'Ashkelon Surf Tomorrow', 1)
+    writes = []
+    entity.async_write_ha_state = lambda: writes.append(entity.native_value)
+
+    asyncio.run(entity._async_refresh())
+    assert len(writes) == 1
+
+    data._last_update = None  # refetch: only last_refreshed changes
+    asyncio.run(entity._async_refresh())
+    assert len(writes) == 1
+
+    changed = dict(data._data['days'][1], average_height_ft=9.9)
+    data._data = dict(data._data, days=[data._data['days'][0], changed, data._data['days'][2]])
+    asyncio.run(entity._async_refresh())
+    assert writes == [writes[0], 9.9]
+
+
+def test_get_forecast_service():
+    hass = types.SimpleNamespace(data={sensor.DOMAIN: {'data': forecast_data()}}, services=FakeServices())
+    added = []
+
+    async def setup():
+        await sensor.async_setup_platform(hass, {}, lambda entities, update: added.extend(entities))
+        await sensor.async_setup_platform(hass, {}, lambda entities, update: None)  # registered once
+        handler, supports_response = hass.services.registered[(sensor.DOMAIN, sensor.SERVICE_GET_FORECAST)]
+        return await handler(None), supports_response
+
+    response, supports_response = asyncio.run(setup())
+    assert supports_response.name == 'ONLY' and len(hass.services.registered) == 1
+    assert [e.unique_id for e in added] == ['ashkelon_surf_0', 'ashkelon_surf_1', 'ashkelon_surf_2']
+    assert len(response['days']) == 3 and response['days'][0]['sessions'][0]['time'] == '06:00'
+
+    # Compact mode only changes the entity attributes; the service keeps the full form
+    hass = types.SimpleNamespace(data={sensor.DOMAIN: {'data': forecast_data(compact=True)}}, services=FakeServices())
+    asyncio.run(sensor.async_setup_platform(hass, {}, lambda entities, update: None))
+    handler, _ = hass.services.registered[(sensor.DOMAIN, sensor.SERVICE_GET_FORECAST)]
+    compact_response = asyncio.run(handler(None))
+    assert compact_response['days'] == response['days']
+    assert compact_response['days'][0]['best_session']['time']
+
+    # A failed fetch answers with an empty forecast rather than None
+    hass = types.SimpleNamespace(data={sensor.DOMAIN: {'data': sensor.SurfForecastData(
+        None, session=ReplayTransport(failure_rate=1.0).aiohttp_session())}}, services=FakeServices())
+    asyncio.run(sensor.async_setup_platform(hass, {}, lambda entities, update: None))
+    handler, _ = hass.services.registered[(sensor.DOMAIN, sensor.SERVICE_GET_FORECAST)]
+    assert asyncio.run(handler(None)) == {'days': []}
+
+
+if __name__ == '__main__':
+    for name, fn in sorted(globals().items()):
+        if name.startswith('test_'):
+            fn()
+            print(f"✅ {name}")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Test hedged GetBeachAreaForecast requests"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from daily_surf_report import get_surf_forecast
+from fakes import make_hedged
+from replay import ReplayResponse, ReplayTransport
+from surf_core.hedge import LatencyWindow
+
+FORECAST_URL = 'https://4surfers.co.il/webapi/BeachArea/GetBeachAreaForecast'
+
+
+class SlowFirstTransport(ReplayTransport):
+    """Every `slow_every`-th call (starting with the first) stalls for `stall` seconds"""
+
+    def __init__(self, stall=0.5, slow_every=1000, **kwargs):
+        super().__init__(**kwargs)
+        self.stall = stall
+        self.slow_every = slow_every
+        self.started = 0
+        self._count_lock = threading.Lock()
+
+    def post(self, url, json=None, **kwargs):
+        with self._count_lock:
+            slow = self.started % self.slow_every == 0
+            self.started += 1
+        if slow:
+            time.sleep(self.stall)
+        return super().post(url, json=json, **kwargs)
+
+
+def test_hedge_wins_over_stalled_request():
+    hedged = make_hedged(SlowFirstTransport(stall=1.0), max_ratio=1.0)
+    start = time.perf_counter()
+    response = hedged.post(FORECAST_URL, json={'beachAreaId': '80'}, timeout=30)
+    assert time.perf_counter() - start < 0.5
+    assert response.status_code == 200 and response.json()['dailyForecastList']
+    assert hedged.stats()['hedge_won'] == 1
+    # The sample is the caller's wait (hedge delay + hedge), not the hedge's own time
+    assert list(hedged.latency.samples)[0] >= 0.05
+    assert get_surf_forecast(transport=hedged)['dailyForecastList']
+
+
+def test_hedge_budget_caps_extra_load():
+    transport = SlowFirstTransport(stall=0.1, slow_every=1)  # every request is slow
+    hedged = make_hedged(transport, max_ratio=0.1, burst=1.0)
+    for _ in range(10):
+        assert hedged.post(FORECAST_URL, json={'beachAreaId': '80'}).status_code == 200
+    stats = hedged.stats()
+    assert stats['capped'] >= 8 and stats['hedge_won'] + stats['hedge_lost'] <= 2
+    time.sleep(0.2)  # let abandoned hedges finish before counting
+    assert transport.started <= 12
+
+
+def test_fast_calls_and_other_endpoints_not_hedged():
+    transport = ReplayTransport({'GetBeachAreaForecast': {'ok': 1}, 'GetBeachAreaData': {'ok': 2}})
+    hedged = make_hedged(transport)
+    for _ in range(12):
+        hedged.post(FORECAST_URL, json={})
+    hedged.post('https://4surfers.co.il/webapi/BeachArea/GetBeachAreaData', json={})
+    assert hedged.stats() == {'primary': 12, 'hedge_won': 0, 'hedge_lost': 0, 'capped': 0}
+    assert transport.calls == 13
+    assert hedged.hedge_delay() == hedged.min_delay  # p95 of ~0s responses
+
+
+def test_failed_primary_falls_back_to_hedge():
+    class FailSlowFirst(SlowFirstTransport):
+        def post(self, url, json=None, **kwargs):
+            if self.started == 0:
+                self.started += 1
+                time.sleep(0.2)
+                raise ConnectionError('reset')
+            return super().post(url, json=json, **kwargs)
+
+    hedged = make_hedged(FailSlowFirst(), max_ratio=1.0)
+    assert isinstance(hedged.post(FORECAST_URL, json={}), ReplayResponse)
+    assert hedged.stats()['hedge_won'] == 1
+
+
+def test_latency_window_percentile():
+    window = LatencyWindow(size=100, min_samples=5)
+    assert window.percentile(0.95) is None
+    for ms in range(1, 101):
+        window.add(ms / 1000)
+    assert window.percentile(0.95) == 0.096
+
+
+if __name__ == '__main__':
+    for name, fn in sorted(globals().items()):
+        if name.startswith('test_'):
+            fn()
+            print(f"✅ {name}")
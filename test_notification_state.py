@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Test per-chat dedup and edit decisions for the Telegram reports"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from daily_surf_report import get_surf_forecast, parse_forecast_data
+from notification_state import NotificationState, notify, report_sessions
+from replay import ReplayResponse, ReplayTransport
+from telegram_delivery import Outbox, TelegramDelivery
+
+API = {'sendMessage': {'ok': True, 'result': {'message_id': 7}},
+       'editMessageText': {'ok': True, 'result': {'message_id': 7}}}
+
+
+class EditGoneTransport(ReplayTransport):
+    """editMessageText answers 400 (message deleted), everything else is replayed"""
+
+    def post(self, url, json=None, **kwargs):
+        if url.endswith('editMessageText'):
+            self.calls += 1
+            return ReplayResponse(400, {'ok': False, 'description': 'Bad Request: message to edit not found'}, url)
+        return super().post(url, json=json, **kwargs)
+
+
+class EditRateLimitedTransport(ReplayTransport):
+    """editMessageText answers 429 with a retry_after longer than deliver() waits"""
+
+    def post(self, url, json=None, **kwargs):
+        if url.endswith('editMessageText'):
+            self.calls += 1
+            return ReplayResponse(429, {'ok': False, 'description': 'Too Many Requests',
+                                        'parameters': {'retry_after': 3600}}, url)
+        return super().post(url, json=json, **kwargs)
+
+
+def setup(transport=None):
+    directory = tempfile.mkdtemp()
+    delivery = TelegramDelivery('TOKEN', outbox=Outbox(os.path.join(directory, 'outbox.db')),
+                                transport=transport or ReplayTransport(API))
+    return delivery, NotificationState(os.path.join(directory, 'state.json'))
+
+
+def test_skip_edit_send():
+    delivery, state = setup()
+    swell = [('2025-10-27', '06:00', 2.0, 7.0)]
+    assert notify(delivery, state, ['1'], 'report', swell)['send'] == 1
+    assert notify(delivery, state, ['1'], 'report again', swell)['skip'] == 1
+
+    bigger = [('2025-10-27', '06:00', 2.3, 7.0)]
+    counts = notify(delivery, state, ['1'], 'bigger', bigger)
+    assert counts['edit'] == 1 and counts['failed'] == 0
+
+    new_swell = bigger + [('2025-10-28', '12:00', 3.0, 9.0)]
+    assert notify(delivery, state, ['1'], 'new swell', new_swell)['send'] == 1
+    assert delivery.transport.calls == 3
+
+    # State survives a reload
+    assert NotificationState(state.path).plan('1', new_swell) == ('skip', None)
+
+
+def test_failed_edit_sends_new_message():
+    delivery, state = setup(EditGoneTransport(API))
+    notify(delivery, state, ['1'], 'report', [('2025-10-27', '06:00', 2.0, 7.0)])
+    counts = notify(delivery, state, ['1'], 'changed', [('2025-10-27', '06:00', 2.5, 7.0)])
+    assert counts == {'send': 0, 'edit': 1, 'skip': 0, 'failed': 0, 'pending': 0}
+    assert state.chats['1']['details'] and delivery.outbox.counts() == {'sent': 2, 'cancelled': 1}
+
+
+def test_pending_edit_is_not_replaced():
+    delivery, state = setup(EditRateLimitedTransport(API))
+    notify(delivery, state, ['1'], 'report', [('2025-10-27', '06:00', 2.0, 7.0)])
+    sent_id = state.chats['1']['message_id']
+    counts = notify(delivery, state, ['1'], 'changed', [('2025-10-27', '06:00', 2.5, 7.0)])
+    assert counts == {'send': 0, 'edit': 1, 'skip': 0, 'failed': 0, 'pending': 1}
+    # No second message: the edit stays queued and the chat still points at the first one
+    assert delivery.outbox.counts() == {'sent': 1, 'pending': 1}
+    assert state.chats['1']['message_id'] == sent_id
+
+
+def test_report_sessions_are_surfable_only():
+    forecast_days = parse_forecast_data(get_surf_forecast(transport=ReplayTransport()))
+    sessions = report_sessions(forecast_days)
+    assert all((s[2] >= 2.0 and s[3] >= 6.5) or (s[2] >= 1.8 and s[3] >= 8.0) for s in sessions)
+
+
+if __name__ == '__main__':
+    for name, fn in sorted(globals().items()):
+        if name.startswith('test_'):
+            fn()
+            print(f"✅ {name}")
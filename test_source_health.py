@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Test the forecast source circuit breaker and adaptive source order"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fakes import FakeClock, make_health
+from replay import ReplayTransport
+from surf_core.health import CLOSED, HALF_OPEN, OPEN
+from wave_forecast import FourSurfersWaveForecast
+
+
+def test_circuit_opens_and_recovers():
+    clock = FakeClock()
+    health = make_health(clock, failure_threshold=2, cooloff=60)
+    assert health.order() == ['extended_api', 'basic_api', 'browser']
+
+    health.record('extended_api', False, 30.0)
+    assert health.state('extended_api') == CLOSED
+    health.record('extended_api', False, 30.0)
+    assert health.state('extended_api') == OPEN
+    assert health.order() == ['basic_api', 'browser']
+
+    clock.now += 60
+    assert health.state('extended_api') == HALF_OPEN
+    assert health.order()[-1] == 'extended_api'  # one trial, after the healthy sources
+    health.record('extended_api', False, 30.0)
+    assert health.snapshot()['extended_api']['retry_in_s'] == 120  # cool-off doubled
+
+    clock.now += 120
+    health.record('extended_api', True, 0.5)
+    assert health.state('extended_api') == CLOSED
+    assert health.order()[0] == 'basic_api'  # recent timeouts still count against it
+    for _ in range(6):
+        health.record('extended_api', True, 0.5)
+    assert health.order()[0] == 'extended_api'
+
+
+def test_fastest_working_source_first():
+    health = make_health(FakeClock())
+    for _ in range(10):
+        health.record('basic_api', True, 0.2)
+        health.record('extended_api', True, 3.0)
+    assert health.order() == ['basic_api', 'extended_api', 'browser']
+
+    # Fast but intermittently timing out loses to slower and reliable
+    for _ in range(5):
+        health.record('basic_api', True, 0.2)
+        health.record('basic_api', False, 30.0)
+    assert health.order()[0] == 'extended_api'
+
+
+def test_all_open_still_tries_one_source():
+    clock = FakeClock()
+    health = make_health(clock, failure_threshold=1, cooloff=60)
+    for name in ('browser', 'extended_api', 'basic_api'):
+        health.record(name, False, 1.0)
+        clock.now += 1
+    assert health.order() == ['browser']
+
+
+def test_forecast_skips_broken_sources(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # API responses are saved to the cwd
+    clock = FakeClock()
+    health = make_health(clock, failure_threshold=2, cooloff=300)
+    transport = ReplayTransport(failure_rate=1.0)
+    forecast = FourSurfersWaveForecast(transport=transport, source_health=health)
+    browser_calls = []
+    forecast.fetch_wave_data_direct_url = lambda: browser_calls.append(1)
+
+    for _ in range(2):
+        assert forecast.get_ashkelon_forecast() is None
+    assert transport.calls == 4 and len(browser_calls) == 2
+
+    # Every circuit is open: one source is still tried, not all three
+    assert forecast.get_ashkelon_forecast() is None
+    assert transport.calls + len(browser_calls) == 7
+
+    # Upstream recovers; after the cool-off the API is tried again and wins
+    forecast.transport = ReplayTransport()
+    clock.now += 600
+    result = forecast.get_ashkelon_forecast()
+    assert result and result['daily_forecasts']
+    assert forecast.transport.calls == 1
+    assert health.state('extended_api') == CLOSED
+
+
+if __name__ == '__main__':
+    import inspect
+    import tempfile
+    from pathlib import Path
+
+    import pytest
+
+    for name, fn in sorted(globals().items()):
+        if name.startswith('test_'):
+            with pytest.MonkeyPatch.context() as monkeypatch, tempfile.TemporaryDirectory() as tmp:
+                fixtures = {'monkeypatch': monkeypatch, 'tmp_path': Path(tmp)}
+                fn(**{arg: fixtures[arg] for arg in inspect.signature(fn).parameters})
+            print(f"✅ {name}")
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Test the shared surf_core forecast parser and its vendored copies"""
+
+import filecmp
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, REPO_DIR)
+
+from surf_core import local_epoch, parse_forecast, parse_hour, parse_local, rtl_available, shape_rtl, surf_quality_english
+from surf_core.log import configure_logging, get_logger, parse_levels, shutdown_logging
+from surf_core.metrics import Registry, timed
+from surf_core.profiling import RunProfiler, record_stage, stage
+from surf_core.rtl import shape_cache_info
+
+# The Home Assistant integrations only ship the parser; metrics, logging, profiling,
+# source health and hedging are used by the scripts and the add-on
+HA_MODULES = ('__init__.py', 'endpoints.py', 'parse.py', 'records.py', 'rtl.py', 'timestamps.py')
+VENDORED_COPIES = {
+    'addons/ashkelon-surf-forecast/surf_core': None,  # every module
+    'custom_components/ashkelon_surf/surf_core': HA_MODULES,
+    'home-assistant/surf_core': HA_MODULES,
+}
+
+
+def load_recording():
+    with open(os.path.join(REPO_DIR, 'api_debug_full.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_parse_recording():
+    days = parse_forecast(load_recording())
+    assert len(days) == 10
+    first = days[0]
+    assert first.date_key == '2025-10-27'
+    assert first.display_date == '27/10'
+    assert (first.hebrew_day, first.hebrew_day_letter, first.english_day) == ('שני', "ב'", 'Monday')
+    assert first.by_time()['06:00'].height_m == 0.6
+    assert first.by_time()['06:00'].wind_kts == 3
+
+
+def test_height_falls_back_to_wave_height():
+    hour = parse_hour({'forecastLocalHour': '2025-10-27T09:00:00', 'WaveHeight': 0.54,
+                       'SurfHeightFrom': 0, 'SurfHeightTo': 0})
+    assert (hour.hour, hour.time_key, hour.height_m) == (9, '09:00', 0.54)
+    assert parse_hour({'waveHeight': 1.2, 'forecastLocalHour': '2025-10-27T12:00:00'}).height_m == 1.2
+    assert parse_hour({'forecastLocalHour': 'bad'}) is None
+
+
+def test_sunday_letter():
+    days = parse_forecast({'dailyForecastList': [{'forecastLocalTime': '2025-11-02T06:00:00', 'forecastHours': []}]})
+    assert (days[0].hebrew_day, days[0].hebrew_day_letter) == ('ראשון', "א'")
+
+
+def test_surf_quality_english():
+    assert surf_quality_english('קרסול עד ברך') == 'ankle_to_knee'
+    assert surf_quality_english('מעל ברך') == 'above_knee'
+    assert surf_quality_english('') == 'unknown'
+
+
+def test_timestamps_resolve_offsets():
+    summer = parse_local('2025-07-01T06:00:00')
+    assert summer.epoch == parse_local('2025-07-01T06:00:00+03:00').epoch == parse_local('2025-07-01T03:00:00Z').epoch
+    winter = parse_local('2025-12-01T06:00:00+02:00')
+    assert (winter.date_key, winter.time_key, winter.hour) == ('2025-12-01', '06:00', 6)
+    assert winter.epoch == parse_local('2025-12-01T06:00:00').epoch
+    assert parse_local('2025-12-01T04:00:00Z').time_key == '06:00'
+    assert local_epoch('2025-12-01', '06:00') == winter.epoch
+    assert parse_local('not a date') is None
+
+
+def test_shape_rtl_cached():
+    assert shape_rtl('') == ''
+    if not rtl_available():
+        assert shape_rtl('שני') == 'שני'
+        return
+    assert shape_rtl('שני') == 'ינש'  # precomputed vocabulary
+    before = shape_cache_info()
+    assert shape_rtl('טקסט חופשי') == shape_rtl('טקסט חופשי')
+    after = shape_cache_info()
+    assert (after.misses - before.misses, after.hits - before.hits) == (1, 1)
+
+
+def test_metrics_render_prometheus_text():
+    registry = Registry()
+
+    @timed('fetch_seconds', 'Fetch latency', registry=registry, method='api')
+    def fetch(ok):
+        if ok is None:
+            raise RuntimeError('boom')
+        return ok
+
+    fetch({'x': 1})
+    fetch({})
+    try:
+        fetch(None)
+    except RuntimeError:
+        pass
+    registry.counter('hits_total', 'Hits', ('cache',)).inc(cache='chart')
+    histogram = registry.get('fetch_seconds')
+    assert [histogram.count(method='api', outcome=o) for o in ('ok', 'empty', 'error')] == [1, 1, 1]
+
+    text = registry.render()
+    assert '# TYPE fetch_seconds histogram' in text
+    assert 'fetch_seconds_bucket{method="api",outcome="ok",le="+Inf"} 1' in text
+    assert 'hits_total{cache="chart"} 1' in text
+
+
+def test_logging_levels_and_json_output():
+    assert parse_levels('wave_forecast.parse=DEBUG, x=warning,bogus,y=LOUD') == {'wave_forecast.parse': 10, 'x': 30}
+
+    stream = io.StringIO()
+    configure_logging(level='INFO', levels='surf_test.parse=DEBUG', fmt='json', stream=stream)
+    try:
+        get_logger('surf_test').debug('hidden %s', 1)
+        get_logger('surf_test.parse').debug('Mapped %s -> %sm', '27/10', 1.2)
+        get_logger('surf_test').info('done', extra={'days': 7})
+    finally:
+        shutdown_logging()
+    entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [e['message'] for e in entries] == ['Mapped 27/10 -> 1.2m', 'done']
+    assert entries[0]['level'] == 'DEBUG' and entries[1]['days'] == 7
+
+
+def test_run_profiler_writes_stage_report():
+    with stage('parse'):  # no active run: no-op
+        pass
+    output_dir = tempfile.mkdtemp()
+    with RunProfiler('test', output_dir=output_dir, interval=0.001) as profiler:
+        with stage('fetch'):
+            time.sleep(0.02)
+        for _ in range(2):
+            with stage('parse'):
+                sum(i * i for i in range(20000))
+        record_stage('render.pdf', 0.5)
+    with open(profiler.paths['json'], encoding='utf-8') as f:
+        report = json.load(f)
+    assert list(report['stages']) == ['fetch', 'parse', 'render.pdf']
+    assert report['stages']['parse']['calls'] == 2 and report['stages']['fetch']['wall_s'] >= 0.02
+    with open(profiler.paths['collapsed'], encoding='utf-8') as f:
+        assert all(line.rsplit(' ', 1)[1].strip().isdigit() for line in f)
+    assert os.path.getsize(profiler.paths['prof']) > 0
+
+
+def test_vendored_copies_identical():
+    source = os.path.join(REPO_DIR, 'surf_core')
+    all_modules = sorted(name for name in os.listdir(source) if name.endswith('.py'))
+    for copy_dir, shipped in VENDORED_COPIES.items():
+        modules = sorted(shipped or all_modules)
+        copy_path = os.path.join(REPO_DIR, copy_dir)
+        present = sorted(name for name in os.listdir(copy_path) if name.endswith('.py'))
+        assert present == modules, f"{copy_dir} ships {present}, expected {modules}"
+        _, mismatch, errors = filecmp.cmpfiles(source, copy_path, modules, shallow=False)
+        assert not mismatch and not errors, f"{copy_dir} out of sync: {mismatch + errors}"
+
+
+if __name__ == '__main__':
+    for name, fn in sorted(globals().items()):
+        if name.startswith('test_'):
+            fn()
+            print(f"✅ {name}")
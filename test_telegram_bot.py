@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Test the Telegram bot commands against a local getUpdates/sendMessage stub"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from replay import ReplayResponse, ReplayTransport
+from telegram_bot import ForecastCache, TelegramBot
+from wave_forecast import FourSurfersWaveForecast
+
+
+class StubTelegram:
+    """Serves queued updates from getUpdates and records sendMessage calls"""
+
+    def __init__(self, texts):
+        self.updates = [{'update_id': 100 + i, 'message': {'message_id': i, 'chat': {'id': 1000 + i}, 'text': text}}
+                        for i, text in enumerate(texts)]
+        self.sent = []
+
+    def post(self, url, json=None, **kwargs):
+        method = url.rsplit('/', 1)[-1]
+        if method == 'getUpdates':
+            pending = [u for u in self.updates if u['update_id'] >= json['offset']]
+            return ReplayResponse(200, {'ok': True, 'result': pending}, url)
+        self.sent.append(json)
+        return ReplayResponse(200, {'ok': True, 'result': {'message_id': len(self.sent)}}, url)
+
+
+def make_bot(texts, fetchers=None):
+    forecast = FourSurfersWaveForecast()
+    payload = ReplayTransport()._payload_for('GetBeachAreaForecast')
+    calls = []
+
+    def fetch_ashkelon():
+        calls.append('ashkelon')
+        return forecast._parse_extended_api_response(payload)
+
+    cache = ForecastCache(forecast, fetchers={'ashkelon': fetch_ashkelon, **(fetchers or {})})
+    stub = StubTelegram(texts)
+    return TelegramBot('TOKEN', cache, transport=stub), stub, calls
+
+
+def test_commands_answered_from_cache():
+    bot, stub, calls = make_bot(['/today', '/week', '/today@surf_bot', 'hello', '/beach', '/beach atlantis'])
+    bot.cache.get('ashkelon')
+    assert bot.poll_once() == 6
+    assert not bot.pending  # everything was answered inline
+    assert bot.poll_once() == 0  # offset advanced past handled updates
+    replies = [m['text'] for m in stub.sent]
+    assert len(replies) == 5
+    assert 'אשקלון' in replies[0] and replies[0] == replies[2]
+    assert 'תחזית גלים אשקלון' in replies[1]
+    assert '/beach netanya' in replies[3] and 'atlantis' in replies[4]
+    assert calls == ['ashkelon']
+
+
+def test_beach_lookup_and_single_fetch():
+    netanya = []
+    bot, stub, _ = make_bot([], fetchers={'netanya': lambda: netanya.append(1)})
+    assert bot.resolve_beach('Tel Aviv-Jaffa') == 'tel-aviv-jaffa'
+    assert bot.resolve_beach('נתניה') == 'netanya'
+    assert 'לא ניתן' in bot.reply_for('/beach netanya')
+
+    threads = [threading.Thread(target=bot.reply_for, args=('/week',)) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert bot.cache.fetches == 2  # netanya once (failed) + ashkelon once for 20 users
+
+    # The failure is cached: no refetch until retry_after has passed
+    assert 'לא ניתן' in bot.reply_for('/beach netanya')
+    assert bot.cache.fetches == 2 and netanya == [1]
+    bot.cache.failed['netanya'] -= bot.cache.retry_after
+    bot.reply_for('/beach netanya')
+    assert bot.cache.fetches == 3 and netanya == [1, 1]
+
+
+def test_cache_miss_does_not_block_the_batch():
+    release = threading.Event()
+
+    def slow_netanya():
+        release.wait(5)
+        raise RuntimeError('upstream timeout')
+
+    bot, stub, _ = make_bot(['/beach netanya', '/today'], fetchers={'netanya': slow_netanya})
+    bot.cache.get('ashkelon')
+    start = time.monotonic()
+    assert bot.poll_once() == 2
+    assert time.monotonic() - start < 1
+    assert [m['chat_id'] for m in stub.sent] == [1001]  # /today answered while netanya is fetching
+    release.set()
+    bot.wait_pending(5)
+    assert [m['chat_id'] for m in stub.sent] == [1001, 1000]
+    assert 'לא ניתן' in stub.sent[1]['text']
+
+
+if __name__ == '__main__':
+    for name, fn in sorted(globals().items()):
+        if name.startswith('test_'):
+            fn()
+            print(f"✅ {name}")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Test the Telegram outbox delivery against replayed Bot API responses"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fakes import FakeClock
+from replay import ReplayResponse, ReplayTransport
+from telegram_delivery import Outbox, TelegramDelivery, TokenBucket, parse_chat_ids
+
+SENT = {'sendMessage': {'ok': True, 'result': {'message_id': 1}}}
+
+
+class FloodOnceTransport(ReplayTransport):
+    """Answers the first request with 429 retry_after, then replays normally"""
+
+    def post(self, url, json=None, **kwargs):
+        if self.calls == 0:
+            self.calls += 1
+            return ReplayResponse(429, {'ok': False, 'description': 'Too Many Requests',
+                                        'parameters': {'retry_after': 0.1}}, url)
+        return super().post(url, json=json, **kwargs)
+
+
+class FloodChatTransport(ReplayTransport):
+    """Chat '1' is flood limited for an hour; every other chat is replayed"""
+
+    def post(self, url, json=None, **kwargs):
+        if json['chat_id'] == '1':
+            self.calls += 1
+            return ReplayResponse(429, {'ok': False, 'description': 'Too Many Requests',
+                                        'parameters': {'retry_after': 3600}}, url)
+        return super().post(url, json=json, **kwargs)
+
+
+def make_delivery(transport, **kwargs):
+    outbox = Outbox(os.path.join(tempfile.mkdtemp(), 'outbox.db'))
+    return TelegramDelivery('TOKEN', outbox=outbox, transport=transport, **kwargs)
+
+
+def test_delivery_is_idempotent():
+    transport = ReplayTransport(SENT)
+    delivery = make_delivery(transport)
+    chats = [str(1000 + i) for i in range(20)]
+    assert delivery.enqueue(chats, 'report') == 20
+    assert delivery.enqueue(chats, 'report') == 0
+    assert delivery.deliver() == {'sent': 20, 'retry': 0, 'failed': 0, 'pending': 0}
+    assert delivery.enqueue(chats, 'report') == 0
+    assert delivery.deliver()['sent'] == 0
+    assert transport.calls == 20
+
+
+def test_delivery_retries_flood_and_errors():
+    delivery = make_delivery(FloodOnceTransport(SENT))
+    delivery.enqueue(['1'], 'report')
+    stats = delivery.deliver(max_wait=5)
+    assert (stats['retry'], stats['sent'], stats['pending']) == (1, 1, 0)
+
+    failing = make_delivery(ReplayTransport(SENT, failure_rate=1.0), max_attempts=1)
+    failing.enqueue(['1'], 'report')
+    assert failing.deliver()['failed'] == 1
+    assert failing.outbox.counts() == {'failed': 1}
+
+
+def test_long_retry_after_does_not_outlast_max_wait():
+    clock = FakeClock()
+
+    def sleep(seconds):
+        clock.now += seconds
+
+    delivery = make_delivery(FloodChatTransport(SENT), workers=1, clock=clock, sleep=sleep)
+    delivery.enqueue(['1', '2', '3'], 'report')
+    start = time.monotonic()
+    stats = delivery.deliver(max_wait=5)
+    assert (stats['sent'], stats['retry'], stats['pending']) == (2, 1, 1)  # other chats still go out
+
+    # The flooded chat's next message is deferred, not waited for
+    delivery.enqueue(['1'], 'update')
+    stats = delivery.deliver(max_wait=5)
+    assert (stats['sent'], stats['retry'], stats['pending']) == (0, 1, 2)
+    assert delivery.transport.calls == 3  # the update was never sent into the flood limit
+    assert clock.now - 1_000_000.0 <= 5 and time.monotonic() - start < 5
+
+
+def test_failed_and_stale_pending_messages_are_requeued():
+    outbox_path = os.path.join(tempfile.mkdtemp(), 'outbox.db')
+    failing = TelegramDelivery('TOKEN', outbox=Outbox(outbox_path),
+                               transport=ReplayTransport(SENT, failure_rate=1.0), max_attempts=1)
+    failing.enqueue(['1', '2'], 'report')
+    assert failing.deliver()['failed'] == 2
+
+    # Next workflow run, Telegram reachable again: the cached outbox must not swallow the report
+    transport = ReplayTransport(SENT)
+    delivery = TelegramDelivery('TOKEN', outbox=Outbox(outbox_path), transport=transport)
+    assert delivery.enqueue(['1', '2'], 'report') == 2
+    assert delivery.deliver()['sent'] == 2
+    assert delivery.enqueue(['1', '2'], 'report') == 0  # sent rows stay sent
+    assert delivery.deliver()['sent'] == 0 and transport.calls == 2
+
+    # A row left pending with a far-off retry becomes due again
+    delivery.outbox.add(['3'], 'report')
+    key = Outbox.message_key('3', 'report')
+    delivery.outbox.mark_retry(key, 3600, 'timeout')
+    assert delivery.deliver()['sent'] == 0
+    delivery.enqueue(['3'], 'report')
+    assert delivery.deliver()['sent'] == 1
+    assert delivery.outbox.result(key)[0] == 'sent'
+
+
+def test_token_bucket():
+    now = [0.0]
+    bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0])
+    assert bucket.try_acquire() == 0 and bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0.5
+    now[0] = 0.5
+    assert bucket.try_acquire() == 0
+
+
+def test_parse_chat_ids():
+    assert parse_chat_ids('-100123, 456 @surf') == ['-100123', '456', '@surf']
+    assert parse_chat_ids(None) == []
+
+
+if __name__ == '__main__':
+    for name, fn in sorted(globals().items()):
+        if name.startswith('test_'):
+            fn()
+            print(f"✅ {name}")
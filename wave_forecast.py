@@ -12,18 +12,64 @@ import numpy as np
 from datetime import datetime, timedelta
 import json
 import time
-import requests
 from typing import Dict, List, Optional
 import re
+from dataclasses import replace
+
+from alert_rules import AlertRule, ForecastArrays, RuleSet
+from surf_core import ISRAEL_TZ, epoch_now, local_epoch, parse_forecast, parse_local, rtl_available, shape_rtl, surf_quality_english
+from surf_core.endpoints import AREA_DATA_ENDPOINT, FORECAST_ENDPOINT, api_url, base_url as resolve_base_url
+from surf_core.health import OPEN, SourceHealth
+from surf_core.hedge import default_transport
+from surf_core.log import configure_logging, get_logger
+from surf_core.metrics import REGISTRY, timed
+from surf_core.profiling import RunProfiler, profile_requested, record_stage, stage
+
+log = get_logger('wave_forecast')
+# Per-element parser output (every chart point and forecast time) is DEBUG on its own
+# logger so it can be enabled separately: SURF_LOG_LEVELS=wave_forecast.parse=DEBUG
+parse_log = get_logger('wave_forecast.parse')
+
+FORECAST_SOURCE = REGISTRY.counter(
+    'surf_forecast_source_total',
+    'Fetch path that produced the forecast (extended_api, basic_api, browser, none)',
+    ('source',),
+)
+SOURCE_AVAILABLE = REGISTRY.gauge('surf_source_available', 'Whether a forecast source is tried (0 while its circuit is open)',
+                                  ('source',))
+
+# Expected seconds per source before any measurement; the order is the default preference
+SOURCE_HEALTH = SourceHealth({'extended_api': 1.0, 'basic_api': 1.5, 'browser': 30.0})
+
+# Telegram report thresholds as alert rules: the report is sent only when some slot is
+# strictly above ankle height (0.4m; the look-ahead window is set per run), and the
+# Hebrew summary lists the 06:00/12:00/18:00 sessions of at least 0.3m
+ABOVE_ANKLE = AlertRule(min_height_m=float(np.nextafter(0.4, np.inf)))
+SUMMARY_SESSIONS = RuleSet([AlertRule(min_height_m=0.3)])
+SUMMARY_TIMES = ('06:00', '12:00', '18:00')
 
 
 class FourSurfersWaveForecast:
     """Main class for wave forecasting from 4surfers.co.il"""
     
-    def __init__(self, telegram_bot_token=None):
-        self.base_url = "https://4surfers.co.il"
-        self.ashkelon_url = "https://4surfers.co.il/#/beachArea?beachAreaId=80"
+    def __init__(self, telegram_bot_token=None, transport=None, source_health=None, base_url=None):
+        """
+        Args:
+            telegram_bot_token: Telegram bot token for notifications
+            transport: Object with a requests-compatible post() used for API calls
+                       (defaults to requests, hedged when SURF_HEDGE=true; see
+                       replay.ReplayTransport and surf_core.hedge)
+            source_health: SourceHealth used to order the fetch sources (defaults to
+                           the process-wide SOURCE_HEALTH, so short-lived instances
+                           still learn from earlier refreshes)
+            base_url: Site/API root (default FOURSURFERS_BASE_URL or https://4surfers.co.il;
+                      point it at fake_4surfers.py for load and integration tests)
+        """
+        self.base_url = resolve_base_url(base_url)
+        self.transport = default_transport(transport)
+        self.ashkelon_url = f"{self.base_url}/#/beachArea?beachAreaId=80"
         self.telegram_bot_token = telegram_bot_token
+        self.source_health = source_health or SOURCE_HEALTH
         self.beach_slugs = {
             "nahariya": "נהריה",
             "haifa-bay": "חיפה-מפרץ", 
@@ -35,6 +81,7 @@ class FourSurfersWaveForecast:
             "ashkelon": "אשקלון"
         }
     
+    @timed('surf_fetch_seconds', 'Forecast fetch latency by method', method='extended_api')
     def _try_extended_forecast_api(self) -> Optional[Dict]:
         """
         Try the extended forecast API that provides 10 days with detailed hourly data
@@ -43,9 +90,9 @@ class FourSurfersWaveForecast:
             Dictionary with extended forecast data or None if failed
         """
         try:
-            print("🔥 Trying extended forecast API (10 days detailed data)...")
+            log.info("🔥 Trying extended forecast API (10 days detailed data)...")
             
-            url = 'https://4surfers.co.il/webapi/BeachArea/GetBeachAreaForecast'
+            url = api_url(FORECAST_ENDPOINT, self.base_url)
             
             headers = {
                 'Accept': 'application/json, text/plain, */*',
@@ -67,52 +114,60 @@ class FourSurfersWaveForecast:
             
             data = {"beachAreaId": "80"}
             
-            response = requests.post(url, json=data, headers=headers, timeout=30)
+            with stage('fetch'):
+                response = self.transport.post(url, json=data, headers=headers, timeout=30)
             
             if response.status_code == 200:
-                api_data = response.json()
-                print("🎉 Extended API successful!")
-                print(f"📊 Extended API response size: {len(str(api_data))} characters")
+                with stage('decode'):
+                    api_data = response.json()
+                log.info("🎉 Extended API successful!")
+                log.info("📊 Extended API response size: %s characters", len(str(api_data)))
                 
                 # Check if we got daily forecast data
                 if 'dailyForecastList' in api_data and api_data['dailyForecastList']:
                     forecast_days = len(api_data['dailyForecastList'])
-                    print(f"📅 Got {forecast_days} days of detailed forecast data!")
+                    log.info("📅 Got %s days of detailed forecast data!", forecast_days)
                     
                     # Save raw extended API response
                     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                     extended_filename = f"extended_api_response_{timestamp}.json"
                     with open(extended_filename, 'w', encoding='utf-8') as f:
                         json.dump(api_data, f, indent=2, ensure_ascii=False)
-                    print(f"💾 Extended API response saved: {extended_filename}")
+                    log.info("💾 Extended API response saved: %s", extended_filename)
                     
                     # Parse the extended API response
-                    return self._parse_extended_api_response(api_data)
+                    with stage('parse'):
+                        return self._parse_extended_api_response(api_data)
                 else:
-                    print("⚠️ Extended API response doesn't contain dailyForecastList")
+                    log.warning("⚠️ Extended API response doesn't contain dailyForecastList")
                     return None
             else:
-                print(f"❌ Extended API request failed: {response.status_code}")
+                log.error("❌ Extended API request failed: %s", response.status_code)
                 return None
                 
         except Exception as e:
-            print(f"❌ Extended API error: {e}")
+            log.error("❌ Extended API error: %s", e)
             return None
 
+    @timed('surf_fetch_seconds', 'Forecast fetch latency by method', method='api')
     def get_ashkelon_forecast_api(self) -> Optional[Dict]:
         """Get wave forecast for Ashkelon using direct API method (faster)"""
+        log.info("🚀 Using direct 4surfers API...")
+        
+        # Try extended forecast API first (10 days with detailed hourly data)
+        extended_result = self._try_extended_forecast_api()
+        if extended_result:
+            return extended_result
+        
+        log.info("🔄 Extended API failed, falling back to basic API...")
+        return self._try_basic_forecast_api()
+    
+    @timed('surf_fetch_seconds', 'Forecast fetch latency by method', method='basic_api')
+    def _try_basic_forecast_api(self) -> Optional[Dict]:
+        """Basic API endpoint (current conditions); None if it failed"""
         try:
-            print("🚀 Using direct 4surfers API...")
-            
-            # Try extended forecast API first (10 days with detailed hourly data)
-            extended_result = self._try_extended_forecast_api()
-            if extended_result:
-                return extended_result
-            
-            print("🔄 Extended API failed, falling back to basic API...")
-            
             # Fallback to basic API endpoint for current conditions
-            url = 'https://4surfers.co.il/webapi/BeachArea/GetBeachAreaData'
+            url = api_url(AREA_DATA_ENDPOINT, self.base_url)
             
             headers = {
                 'Accept': 'application/json, text/plain, */*',
@@ -135,30 +190,34 @@ class FourSurfersWaveForecast:
             data = {"beachAreaId": "80"}
             
             # Make the API request
-            response = requests.post(url, json=data, headers=headers, timeout=30)
+            with stage('fetch'):
+                response = self.transport.post(url, json=data, headers=headers, timeout=30)
             
             if response.status_code == 200:
-                api_data = response.json()
-                print("✅ Successfully retrieved data from 4surfers API!")
-                print(f"📊 API response size: {len(str(api_data))} characters")
+                with stage('decode'):
+                    api_data = response.json()
+                log.info("✅ Successfully retrieved data from 4surfers API!")
+                log.info("📊 API response size: %s characters", len(str(api_data)))
                 
                 # Save raw API response for debugging
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 api_filename = f"api_response_ashkelon_{timestamp}.json"
                 with open(api_filename, 'w', encoding='utf-8') as f:
                     json.dump(api_data, f, indent=2, ensure_ascii=False)
-                print(f"💾 Raw API response saved: {api_filename}")
+                log.info("💾 Raw API response saved: %s", api_filename)
                 
                 # Parse the API response into our format
-                return self._parse_api_response(api_data)
+                with stage('parse'):
+                    return self._parse_api_response(api_data)
             else:
-                print(f"❌ API request failed: {response.status_code}")
+                log.error("❌ API request failed: %s", response.status_code)
                 return None
                 
         except Exception as e:
-            print(f"❌ API method error: {e}")
+            log.error("❌ API method error: %s", e)
             return None
     
+    @timed('surf_parse_seconds', 'Forecast parse time by parser', parser='basic_api')
     def _parse_api_response(self, api_data: Dict) -> Optional[Dict]:
         """Parse the API response into our standard format"""
         try:
@@ -172,11 +231,11 @@ class FourSurfersWaveForecast:
                 'surf_quality_counts': {}
             }
             
-            print("📊 Parsing API response data...")
+            parse_log.debug("📊 Parsing API response data...")
             
             # Look for forecast data in the API response
             if isinstance(api_data, dict):
-                print(f"📋 API data keys: {list(api_data.keys())}")
+                parse_log.debug("📋 API data keys: %s", list(api_data.keys()))
                 
                 # Extract surf quality indicators from the response
                 surf_terms = {
@@ -198,16 +257,16 @@ class FourSurfersWaveForecast:
                         })
                         forecast_data['surf_quality_counts'][hebrew_term] = count
                 
-                print(f"🔍 Found {len(forecast_data['surf_quality_indicators'])} surf quality indicators")
+                parse_log.debug("🔍 Found %s surf quality indicators", len(forecast_data['surf_quality_indicators']))
                 
                 # Try to extract daily forecasts from API structure
                 daily_count = self._extract_daily_forecasts_from_api(api_data, forecast_data)
-                print(f"📅 Extracted {daily_count} days of forecast data")
+                parse_log.debug("📅 Extracted %s days of forecast data", daily_count)
             
             return forecast_data
             
         except Exception as e:
-            print(f"Error parsing API response: {e}")
+            parse_log.warning("Error parsing API response: %s", e)
             return None
     
     def _extract_daily_forecasts_from_api(self, api_data: Dict, forecast_data: Dict) -> int:
@@ -222,7 +281,7 @@ class FourSurfersWaveForecast:
             # Process DailyForecast array
             if 'DailyForecast' in api_data and isinstance(api_data['DailyForecast'], list):
                 daily_forecast = api_data['DailyForecast']
-                print(f"📊 Processing {len(daily_forecast)} DailyForecast entries")
+                parse_log.debug("📊 Processing %s DailyForecast entries", len(daily_forecast))
                 
                 # Group forecasts by date
                 daily_groups = {}
@@ -233,38 +292,33 @@ class FourSurfersWaveForecast:
                         forecast_time = item.get('forecastLocalHour', '')
                         wave_height = item.get('waveHeight', 0)
                         
-                        try:
-                            # Parse the datetime string (e.g., "2025-10-20T06:00:00+03:00")
-                            dt = datetime.fromisoformat(forecast_time.replace('+03:00', ''))
-                            date_key = dt.strftime('%Y-%m-%d')
-                            time_key = dt.strftime('%H:%M')
-                            
-                            # Get Hebrew day name
-                            hebrew_day = hebrew_days.get(dt.weekday(), 'לא ידוע')
-                            
-                            # Initialize date group if needed
-                            if date_key not in daily_groups:
-                                daily_groups[date_key] = {
-                                    'hebrew_day': hebrew_day,
-                                    'english_day': self._get_english_day(dt.weekday()),
-                                    'hebrew_date': dt.strftime('%d/%m'),
-                                    'times': {}
-                                }
-                            
-                            # Add time data - focus on key times
-                            if time_key in ['06:00', '12:00', '18:00']:
-                                # Determine surf quality based on wave height
-                                surf_quality = self._wave_height_to_quality(wave_height)
-                                
-                                daily_groups[date_key]['times'][time_key] = {
-                                    'wave_height': wave_height,
-                                    'surf_quality': surf_quality,
-                                    'source': 'api'
-                                }
-                        
-                        except Exception as e:
-                            print(f"Error parsing forecast item: {e}")
+                        # Offsets (+03:00 summer, +02:00 winter) are resolved against Asia/Jerusalem
+                        local = parse_local(forecast_time)
+                        if local is None:
+                            parse_log.warning("Error parsing forecast item: %r", forecast_time)
                             continue
+                        date_key = local.date_key
+                        time_key = local.time_key
+                        
+                        # Initialize date group if needed
+                        if date_key not in daily_groups:
+                            daily_groups[date_key] = {
+                                'hebrew_day': hebrew_days.get(local.weekday, 'לא ידוע'),
+                                'english_day': self._get_english_day(local.weekday),
+                                'hebrew_date': local.display_date,
+                                'times': {}
+                            }
+                        
+                        # Add time data - focus on key times
+                        if time_key in ['06:00', '12:00', '18:00']:
+                            # Determine surf quality based on wave height
+                            surf_quality = self._wave_height_to_quality(wave_height)
+                            
+                            daily_groups[date_key]['times'][time_key] = {
+                                'wave_height': wave_height,
+                                'surf_quality': surf_quality,
+                                'source': 'api'
+                            }
                 
                 # Convert grouped data to our format
                 for date_key, day_data in daily_groups.items():
@@ -272,21 +326,22 @@ class FourSurfersWaveForecast:
                         forecast_data['daily_forecasts'][date_key] = day_data
                         daily_count += 1
                 
-                print(f"✅ Extracted {daily_count} days of forecast data from API")
+                parse_log.info("✅ Extracted %s days of forecast data from API", daily_count)
             
             # Also check current conditions from 'lastCSC'
             if 'lastCSC' in api_data:
                 current = api_data['lastCSC']
                 wave_height = current.get('surfHeightFrom', 0)
                 if wave_height > 0:
-                    print(f"🌊 Current conditions: {wave_height}m - {current.get('surfHeightDesc', 'N/A')}")
+                    parse_log.debug("🌊 Current conditions: %sm - %s", wave_height, current.get('surfHeightDesc', 'N/A'))
             
             return daily_count
             
         except Exception as e:
-            print(f"Error extracting daily forecasts from API: {e}")
+            parse_log.warning("Error extracting daily forecasts from API: %s", e)
             return 0
     
+    @timed('surf_parse_seconds', 'Forecast parse time by parser', parser='extended_api')
     def _parse_extended_api_response(self, api_data: Dict) -> Optional[Dict]:
         """
         Parse the extended API response from GetBeachAreaForecast endpoint
@@ -299,134 +354,72 @@ class FourSurfersWaveForecast:
         """
         try:
             if 'dailyForecastList' not in api_data:
-                print("❌ No dailyForecastList in extended API response")
+                parse_log.error("❌ No dailyForecastList in extended API response")
                 return None
             
             daily_forecast_list = api_data['dailyForecastList']
-            print(f"📊 Processing {len(daily_forecast_list)} days from extended API...")
-            
-            # Hebrew day names mapping
-            hebrew_days = {
-                0: 'שני',    # Monday
-                1: 'שלישי',  # Tuesday
-                2: 'רביעי',  # Wednesday
-                3: 'חמישי',  # Thursday
-                4: 'שישי',   # Friday
-                5: 'שבת',    # Saturday
-                6: 'ראשון'   # Sunday
-            }
+            parse_log.debug("📊 Processing %s days from extended API...", len(daily_forecast_list))
             
             daily_forecasts = {}
             surf_quality_counts = {}
             
-            for day_forecast in daily_forecast_list:
-                if 'forecastLocalTime' not in day_forecast:
-                    continue
-                    
-                # Parse the forecast date
-                forecast_date = day_forecast['forecastLocalTime']
-                try:
-                    dt = datetime.fromisoformat(forecast_date.replace('T', ' ').replace('+03:00', ''))
-                    date_key = dt.strftime('%Y-%m-%d')
-                    hebrew_date = dt.strftime('%d/%m')
-                    hebrew_day = hebrew_days.get(dt.weekday(), 'לא ידוע')
-                    english_day = dt.strftime('%A')
-                    
-                    # Process hourly forecasts for this day
-                    forecast_hours = day_forecast.get('forecastHours', [])
+            for day in parse_forecast(api_data):
+                times_data = {}
+                
+                for hour in day.hours:
+                    wave_height = round(hour.height_m or 0, 2)
+                    surf_quality_hebrew = hour.surf_desc
                     
-                    if forecast_hours:
-                        times_data = {}
-                        
-                        for hour_forecast in forecast_hours:
-                            hour_time = hour_forecast.get('forecastLocalHour', '')
-                            wave_height = hour_forecast.get('waveHeight', 0)
-                            surf_quality_hebrew = hour_forecast.get('surfHeightDesc', '')
-                            
-                            # Parse hour for time key
-                            try:
-                                hour_dt = datetime.fromisoformat(hour_time.replace('T', ' ').replace('+03:00', ''))
-                                time_key = hour_dt.strftime('%H:%M')
-                                
-                                # Convert to surf quality with English
-                                surf_quality_english = self._wave_height_to_quality(wave_height).split('(')[1].replace(')', '') if '(' in self._wave_height_to_quality(wave_height) else 'unknown'
-                                surf_quality = f"{surf_quality_hebrew} ({surf_quality_english})" if surf_quality_hebrew else self._wave_height_to_quality(wave_height)
-                                
-                                times_data[time_key] = {
-                                    'wave_height': wave_height,
-                                    'surf_quality': surf_quality,
-                                    'hebrew_time': self._get_hebrew_time_period(hour_dt.hour),
-                                    'english_time': time_key,
-                                    'source': 'extended_api'
-                                }
-                                
-                                # Count surf qualities
-                                if surf_quality_hebrew:
-                                    surf_quality_counts[surf_quality_hebrew] = surf_quality_counts.get(surf_quality_hebrew, 0) + 1
-                                    
-                            except Exception as e:
-                                print(f"Error parsing hour {hour_time}: {e}")
-                                continue
-                        
-                        if times_data:
-                            daily_forecasts[date_key] = {
-                                'date': date_key,
-                                'hebrew_date': hebrew_date,
-                                'hebrew_day': hebrew_day,
-                                'english_day': english_day,
-                                'times': times_data
-                            }
-                            
-                except Exception as e:
-                    print(f"Error parsing date {forecast_date}: {e}")
-                    continue
+                    if surf_quality_hebrew:
+                        surf_quality = f"{surf_quality_hebrew} ({surf_quality_english(surf_quality_hebrew)})"
+                        # Count surf qualities
+                        surf_quality_counts[surf_quality_hebrew] = surf_quality_counts.get(surf_quality_hebrew, 0) + 1
+                    else:
+                        surf_quality = self._wave_height_to_quality(wave_height)
+                    
+                    times_data[hour.time_key] = {
+                        'wave_height': wave_height,
+                        'surf_quality': surf_quality,
+                        'hebrew_time': self._get_hebrew_time_period(hour.hour),
+                        'english_time': hour.time_key,
+                        'source': 'extended_api'
+                    }
+                
+                if times_data:
+                    daily_forecasts[day.date_key] = {
+                        'date': day.date_key,
+                        'hebrew_date': day.display_date,
+                        'hebrew_day': day.hebrew_day,
+                        'english_day': day.english_day,
+                        'times': times_data
+                    }
             
             # Create surf quality indicators list
-            surf_quality_indicators = []
-            for hebrew_quality, count in surf_quality_counts.items():
-                english_quality = "unknown"
-                if "פלטה" in hebrew_quality or "שטוח" in hebrew_quality:
-                    english_quality = "flat"
-                elif "קרסול עד ברך" in hebrew_quality:
-                    english_quality = "ankle_to_knee"
-                elif "קרסול" in hebrew_quality:
-                    english_quality = "ankle_high"
-                elif "מעל ברך" in hebrew_quality:
-                    english_quality = "above_knee"
-                elif "ברך" in hebrew_quality:
-                    english_quality = "knee_high"
-                elif "מעל כתף" in hebrew_quality:
-                    english_quality = "above_shoulder"
-                elif "כתף" in hebrew_quality:
-                    english_quality = "shoulder_high"
-                elif "מותן" in hebrew_quality:
-                    english_quality = "waist_high"
-                elif "מעל ראש" in hebrew_quality:
-                    english_quality = "overhead"
-                elif "ראש" in hebrew_quality:
-                    english_quality = "head_high"
-                
-                surf_quality_indicators.append({
+            surf_quality_indicators = [
+                {
                     'hebrew': hebrew_quality,
-                    'english': english_quality,
+                    'english': surf_quality_english(hebrew_quality),
                     'count': count
-                })
+                }
+                for hebrew_quality, count in surf_quality_counts.items()
+            ]
             
-            print(f"✅ Successfully parsed {len(daily_forecasts)} days from extended API")
-            print(f"🔍 Found {len(surf_quality_indicators)} surf quality indicators")
+            parse_log.info("✅ Successfully parsed %s days from extended API", len(daily_forecasts))
+            parse_log.debug("🔍 Found %s surf quality indicators", len(surf_quality_indicators))
             
             return {
                 'beach': 'ashkelon',
                 'beach_hebrew': 'אשקלון',
                 'source': '4surfers.co.il Extended API',
                 'timestamp': datetime.now().isoformat(),
+                'forecast_updated': api_data.get('forecastUpdatedDate'),
                 'daily_forecasts': daily_forecasts,
                 'surf_quality_indicators': surf_quality_indicators,
                 'surf_quality_counts': surf_quality_counts
             }
             
         except Exception as e:
-            print(f"❌ Error parsing extended API response: {e}")
+            parse_log.error("❌ Error parsing extended API response: %s", e)
             return None
     
     def _get_hebrew_time_period(self, hour: int) -> str:
@@ -470,34 +463,45 @@ class FourSurfersWaveForecast:
         days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
         return days[weekday] if 0 <= weekday <= 6 else 'Unknown'
 
+    @timed('surf_fetch_seconds', 'Forecast fetch latency by method', method='forecast')
     def get_ashkelon_forecast(self) -> Optional[Dict]:
         """
-        Get wave forecast specifically for Ashkelon - try API first for best data, fallback to browser
+        Get wave forecast specifically for Ashkelon from the healthiest source
+        
+        Sources are tried in the order self.source_health suggests: the fastest
+        working one first (normally the extended API), skipping sources whose
+        circuit is open after repeated failures.
         
         Returns:
             Dictionary containing wave forecast data or None if failed
         """
-        # Try API method first (now provides 10 days with detailed hourly data)
-        print("� Attempting enhanced API method first...")
-        api_result = self.get_ashkelon_forecast_api()
-        
-        if api_result and api_result.get('daily_forecasts'):
-            forecast_days = len(api_result.get('daily_forecasts', {}))
-            print(f"✅ API method successful! Got {forecast_days} days of detailed forecast data")
-            return api_result
+        fetchers = {
+            'extended_api': self._try_extended_forecast_api,
+            'basic_api': self._try_basic_forecast_api,
+            'browser': self.fetch_wave_data_direct_url,
+        }
+        order = self.source_health.order()
+        skipped = [name for name in fetchers if name not in order]
+        if skipped:
+            log.info("⏭️ Skipping sources cooling off after failures: %s", ', '.join(skipped))
         
-        # Fallback to browser method
-        print("🔄 API method failed, trying browser method...")
-        browser_result = self.fetch_wave_data_direct_url()
+        for source in order:
+            log.info("🔎 Trying %s...", source)
+            with self.source_health.attempt(source) as attempt:
+                result = fetchers[source]()
+                attempt.ok = bool(result and result.get('daily_forecasts'))
+            SOURCE_AVAILABLE.set(0 if self.source_health.state(source) == OPEN else 1, source=source)
+            if attempt.ok:
+                log.info("✅ %s successful! Got %s days of forecast data", source, len(result['daily_forecasts']))
+                FORECAST_SOURCE.inc(source=source)
+                return result
+            log.info("🔄 %s failed", source)
         
-        if browser_result and browser_result.get('daily_forecasts'):
-            forecast_days = len(browser_result.get('daily_forecasts', {}))
-            print(f"✅ Browser method successful! Got {forecast_days} days of forecast data")
-            return browser_result
-            
-        print("❌ Both methods failed!")
+        log.error("❌ All forecast sources failed!")
+        FORECAST_SOURCE.inc(source='none')
         return None
     
+    @timed('surf_fetch_seconds', 'Forecast fetch latency by method', method='browser')
     def fetch_wave_data_direct_url(self) -> Optional[Dict]:
         """
         Fetch wave data from Ashkelon direct URL
@@ -506,8 +510,8 @@ class FourSurfersWaveForecast:
             Dictionary containing wave data or None if failed
         """
         try:
-            print(f"Fetching wave data for Ashkelon using direct URL...")
-            print(f"URL: {self.ashkelon_url}")
+            log.debug("Fetching wave data for Ashkelon using direct URL...")
+            log.debug("URL: %s", self.ashkelon_url)
             
             with sync_playwright() as p:
                 # Launch browser
@@ -524,22 +528,22 @@ class FourSurfersWaveForecast:
                 
                 try:
                     # Load Ashkelon page directly
-                    print("Loading Ashkelon forecast page...")
+                    log.debug("Loading Ashkelon forecast page...")
                     page.goto(self.ashkelon_url, wait_until='networkidle', timeout=30000)
                     
                     # Wait for forecast data to load
-                    print("Waiting for forecast data to load...")
+                    log.debug("Waiting for forecast data to load...")
                     time.sleep(8)  # Give more time for the specific page to load
                     
                     # Wait for network to settle
                     try:
                         page.wait_for_load_state("networkidle", timeout=15000)
-                        print("Page fully loaded")
+                        log.debug("Page fully loaded")
                     except:
-                        print("Timeout waiting for network idle, proceeding...")
+                        log.warning("Timeout waiting for network idle, proceeding...")
                     
                     # Look for and click the forecast tab (תחזית)
-                    print("Looking for forecast tab 'תחזית'...")
+                    log.debug("Looking for forecast tab 'תחזית'...")
                     
                     forecast_tab_found = False
                     
@@ -557,45 +561,45 @@ class FourSurfersWaveForecast:
                         try:
                             forecast_tab = page.locator(selector)
                             if forecast_tab.count() > 0:
-                                print(f"Found forecast tab with selector: {selector}")
+                                log.debug("Found forecast tab with selector: %s", selector)
                                 forecast_tab.first.click(timeout=5000)
                                 forecast_tab_found = True
-                                print("✅ Successfully clicked on תחזית tab!")
+                                log.info("✅ Successfully clicked on תחזית tab!")
                                 time.sleep(5)  # Wait for forecast content to load
                                 break
                         except Exception as e:
-                            print(f"Could not click forecast tab with {selector}: {str(e)[:100]}")
+                            log.warning("Could not click forecast tab with %s: %s", selector, str(e)[:100])
                             continue
                     
                     if not forecast_tab_found:
-                        print("Forecast tab not found, trying alternative methods...")
+                        log.debug("Forecast tab not found, trying alternative methods...")
                         
                         # Try to find any tabs and look for the one with forecast text
                         nav_tabs = page.locator('.nav-tabs li, .nav-tabs a, [class*="tab"]')
                         tab_count = nav_tabs.count()
                         
-                        print(f"Found {tab_count} potential tabs")
+                        log.debug("Found %s potential tabs", tab_count)
                         
                         for i in range(min(10, tab_count)):
                             try:
                                 tab = nav_tabs.nth(i)
                                 tab_text = tab.inner_text()
-                                print(f"Tab {i}: '{tab_text}'")
+                                log.debug("Tab %s: '%s'", i, tab_text)
                                 
                                 if 'תחזית' in tab_text:
-                                    print(f"Found תחזית in tab {i}, clicking...")
+                                    log.debug("Found תחזית in tab %s, clicking...", i)
                                     tab.click(timeout=5000)
                                     forecast_tab_found = True
                                     time.sleep(5)
                                     break
                             except Exception as e:
-                                print(f"Could not interact with tab {i}: {str(e)[:50]}")
+                                log.warning("Could not interact with tab %s: %s", i, str(e)[:50])
                                 continue
                     
                     # Also try clicking the beachAreaForecastTabClicked function if available
                     if not forecast_tab_found:
                         try:
-                            print("Trying to trigger forecast tab function...")
+                            log.debug("Trying to trigger forecast tab function...")
                             page.evaluate("if(window.beachAreaForecastTabClicked) window.beachAreaForecastTabClicked()")
                             time.sleep(3)
                             forecast_tab_found = True
@@ -603,28 +607,28 @@ class FourSurfersWaveForecast:
                             pass
                     
                     if forecast_tab_found:
-                        print("✅ Forecast tab activated, waiting for weekly data...")
+                        log.info("✅ Forecast tab activated, waiting for weekly data...")
                         
                         # Wait for forecast content to load
                         try:
                             page.wait_for_load_state("networkidle", timeout=10000)
                         except:
-                            print("Timeout waiting for network idle after tab click")
+                            log.warning("Timeout waiting for network idle after tab click")
                         
                         time.sleep(5)  # Additional wait for dynamic content
                         
                         # Look for weekly forecast elements
-                        print("Looking for weekly forecast elements...")
+                        log.debug("Looking for weekly forecast elements...")
                         weekly_indicators = ['יום', 'תאריך', 'ראשון', 'שני', 'שלישי', 'רביעי', 'חמישי', 'שישי', 'שבת']
                         for indicator in weekly_indicators:
                             try:
                                 count = page.locator(f'text*="{indicator}"').count()
                                 if count > 0:
-                                    print(f"Found {count} instances of weekly indicator '{indicator}'")
+                                    log.debug("Found %s instances of weekly indicator '%s'", count, indicator)
                             except:
                                 continue
                     else:
-                        print("❌ Could not activate forecast tab, proceeding with current page content...")
+                        log.warning("❌ Could not activate forecast tab, proceeding with current page content...")
                     
                     # Look for forecast indicators to ensure data is loaded
                     forecast_indicators = ['קרסול', 'ברך', 'כתף', 'מותן']
@@ -634,7 +638,7 @@ class FourSurfersWaveForecast:
                             count = page.locator(f'text="{indicator}"').count()
                             if count > 0:
                                 indicators_found += 1
-                                print(f"Found {count} instances of '{indicator}'")
+                                log.debug("Found %s instances of '%s'", count, indicator)
                         except:
                             continue
                     
@@ -646,7 +650,7 @@ class FourSurfersWaveForecast:
                             count = page.locator(f'text="{time_str}"').count()
                             if count > 0:
                                 times_found += 1
-                                print(f"Found {count} instances of time '{time_str}'")
+                                log.debug("Found %s instances of time '%s'", count, time_str)
                         except:
                             continue
                     
@@ -656,17 +660,17 @@ class FourSurfersWaveForecast:
                         try:
                             count = page.locator(f'text*="{pattern}"').count()
                             if count > 0:
-                                print(f"Found {count} instances of date pattern '{pattern}'")
+                                log.debug("Found %s instances of date pattern '%s'", count, pattern)
                         except:
                             continue
                     
                     if indicators_found > 0:
-                        print(f"Found {indicators_found} different surf quality indicators")
+                        log.debug("Found %s different surf quality indicators", indicators_found)
                     if times_found > 0:
-                        print(f"Found {times_found} different time indicators")
+                        log.debug("Found %s different time indicators", times_found)
                     
                     if indicators_found == 0 and times_found == 0:
-                        print("No forecast indicators found, trying to scroll and load more content...")
+                        log.debug("No forecast indicators found, trying to scroll and load more content...")
                         try:
                             # Scroll down to load more content
                             page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
@@ -679,15 +683,15 @@ class FourSurfersWaveForecast:
                     # Take screenshot for debugging
                     try:
                         page.screenshot(path="ashkelon_direct.png", full_page=True)
-                        print("Screenshot saved as ashkelon_direct.png")
+                        log.debug("Screenshot saved as ashkelon_direct.png")
                     except Exception as e:
-                        print(f"Could not save screenshot: {e}")
+                        log.warning("Could not save screenshot: %s", e)
                     
                     # Get the page content after all loading
                     html = page.content()
                     
                     # Look for and extract Highcharts data
-                    print("Looking for Highcharts data...")
+                    log.debug("Looking for Highcharts data...")
                     highcharts_data = self._extract_highcharts_data(page, html)
                     
                     # Parse the HTML content for forecast data
@@ -700,7 +704,7 @@ class FourSurfersWaveForecast:
                     return forecast_data
                     
                 except Exception as e:
-                    print(f"Error during page interaction: {e}")
+                    log.error("Error during page interaction: %s", e)
                     try:
                         html = page.content()
                         return self._parse_forecast_html_enhanced(html, "ashkelon", "אשקלון")
@@ -711,7 +715,7 @@ class FourSurfersWaveForecast:
                     browser.close()
                     
         except Exception as e:
-            print(f"Error fetching wave data: {e}")
+            log.error("Error fetching wave data: %s", e)
             return None
     
     def fetch_wave_data(self, beach_name: str) -> Optional[Dict]:
@@ -727,10 +731,10 @@ class FourSurfersWaveForecast:
         try:
             slug = self.beach_slugs.get(beach_name.lower().replace(" ", "-"), "")
             if not slug:
-                print(f"Beach '{beach_name}' not found. Available beaches: {list(self.beach_slugs.keys())}")
+                log.error("Beach '%s' not found. Available beaches: %s", beach_name, list(self.beach_slugs.keys()))
                 return None
             
-            print(f"Fetching wave data for {beach_name} ({slug}) from 4surfers.co.il...")
+            log.debug("Fetching wave data for %s (%s) from 4surfers.co.il...", beach_name, slug)
             
             with sync_playwright() as p:
                 # Launch browser (set headless=False for debugging)
@@ -747,12 +751,12 @@ class FourSurfersWaveForecast:
                 
                 try:
                     # Load main page
-                    print("Loading 4surfers.co.il...")
+                    log.debug("Loading 4surfers.co.il...")
                     page.goto(f"{self.base_url}/#/", wait_until='networkidle', timeout=30000)
                     time.sleep(3)  # Wait for JavaScript to initialize
                     
                     # Try to find and click the beach selection
-                    print(f"Looking for {slug} beach option...")
+                    log.debug("Looking for %s beach option...", slug)
                     
                     # Try multiple selectors to find the beach selection
                     selectors_to_try = [
@@ -768,17 +772,17 @@ class FourSurfersWaveForecast:
                     for selector in selectors_to_try:
                         try:
                             if page.locator(selector).count() > 0:
-                                print(f"Found beach selector: {selector}")
+                                log.debug("Found beach selector: %s", selector)
                                 page.click(selector, timeout=5000)
                                 beach_found = True
                                 break
                         except Exception as e:
-                            print(f"Selector {selector} failed: {str(e)[:100]}")
+                            log.debug("Selector %s failed: %s", selector, str(e)[:100])
                             continue
                     
                     if not beach_found:
                         # Try to look for any clickable elements containing the beach name
-                        print("Trying to find beach in dropdown or menu...")
+                        log.debug("Trying to find beach in dropdown or menu...")
                         page.screenshot(path="debug_main_page.png")  # For debugging
                         
                         # Look for dropdown or menu elements
@@ -795,13 +799,13 @@ class FourSurfersWaveForecast:
                                 continue
                     
                     if beach_found:
-                        print("Beach selected, waiting for forecast data...")
+                        log.debug("Beach selected, waiting for forecast data...")
                         
                         # Wait for network requests and dynamic content
                         try:
                             # Wait for network activity to settle
                             page.wait_for_load_state("networkidle", timeout=15000)
-                            print("Network activity settled")
+                            log.debug("Network activity settled")
                             
                             # Wait a bit more for JavaScript to update content
                             time.sleep(5)
@@ -816,27 +820,27 @@ class FourSurfersWaveForecast:
                             for indicator in forecast_indicators:
                                 try:
                                     if page.locator(f'text="{indicator}"').count() > 0:
-                                        print(f"Found forecast indicator: {indicator}")
+                                        log.debug("Found forecast indicator: %s", indicator)
                                         break
                                 except:
                                     continue
                             
                         except Exception as e:
-                            print(f"Timeout or error waiting for content: {str(e)[:100]}")
-                            print("Proceeding with current page content...")
+                            log.warning("Timeout or error waiting for content: %s", str(e)[:100])
+                            log.debug("Proceeding with current page content...")
                         
                         # Additional wait for any remaining dynamic updates
                         time.sleep(2)
                         
                     else:
-                        print("Could not find beach selector, trying to parse main page...")
+                        log.warning("Could not find beach selector, trying to parse main page...")
                     
                     # Take screenshot for debugging
                     try:
                         page.screenshot(path=f"forecast_{beach_name}.png")
-                        print(f"Screenshot saved as forecast_{beach_name}.png")
+                        log.debug("Screenshot saved as forecast_%s.png", beach_name)
                     except Exception as e:
-                        print(f"Could not save screenshot: {e}")
+                        log.warning("Could not save screenshot: %s", e)
                     
                     # Get the page content after all loading
                     html = page.content()
@@ -847,7 +851,7 @@ class FourSurfersWaveForecast:
                     return forecast_data
                     
                 except Exception as e:
-                    print(f"Error during page interaction: {e}")
+                    log.error("Error during page interaction: %s", e)
                     # Still try to parse whatever we have
                     try:
                         html = page.content()
@@ -859,9 +863,10 @@ class FourSurfersWaveForecast:
                     browser.close()
                     
         except Exception as e:
-            print(f"Error fetching wave data: {e}")
+            log.error("Error fetching wave data: %s", e)
             return None
     
+    @timed('surf_parse_seconds', 'Forecast parse time by parser', parser='html')
     def _parse_forecast_html(self, html: str, beach_name: str, slug: str) -> Dict:
         """
         Parse forecast data from HTML content, specifically looking for 
@@ -1049,11 +1054,12 @@ class FourSurfersWaveForecast:
                 forecast_data['forecast_times_found'] = 0
                 
         except Exception as e:
-            print(f"Error parsing HTML: {e}")
+            parse_log.warning("Error parsing HTML: %s", e)
             forecast_data['parsing_error'] = str(e)
         
         return forecast_data
     
+    @timed('surf_parse_seconds', 'Forecast parse time by parser', parser='html_enhanced')
     def _parse_forecast_html_enhanced(self, html: str, beach_name: str, slug: str) -> Dict:
         """
         Enhanced parsing for forecast data with dates and times
@@ -1161,7 +1167,7 @@ class FourSurfersWaveForecast:
             }
             
         except Exception as e:
-            print(f"Error in enhanced parsing: {e}")
+            parse_log.warning("Error in enhanced parsing: %s", e)
             forecast_data['parsing_error'] = str(e)
         
         return forecast_data
@@ -1205,7 +1211,7 @@ class FourSurfersWaveForecast:
                         }
                         
         except Exception as e:
-            print(f"Error parsing table: {e}")
+            parse_log.warning("Error parsing table: %s", e)
     
     def _parse_forecast_container(self, container, forecast_data: Dict, target_times: list, surf_quality_terms: Dict):
         """Parse forecast data from div/section containers"""
@@ -1233,7 +1239,7 @@ class FourSurfersWaveForecast:
                     }
                     
         except Exception as e:
-            print(f"Error parsing container: {e}")
+            parse_log.warning("Error parsing container: %s", e)
     
     def _parse_weekly_forecast_sections(self, soup, forecast_data: Dict, target_times: list, surf_quality_terms: Dict):
         """Parse weekly forecast sections with dates and times, including Highcharts data"""
@@ -1299,10 +1305,10 @@ class FourSurfersWaveForecast:
                                     'original_date': date_found
                                 }
                                 
-                                print(f"Found forecast: {date_key} {time_str} -> {surf_condition}")
+                                parse_log.debug("Found forecast: %s %s -> %s", date_key, time_str, surf_condition)
             
         except Exception as e:
-            print(f"Error parsing weekly forecast sections: {e}")
+            parse_log.warning("Error parsing weekly forecast sections: %s", e)
     
     def _parse_highcharts_data(self, soup, forecast_data: Dict):
         """Parse Highcharts SVG data to extract wave height forecasts"""
@@ -1311,10 +1317,10 @@ class FourSurfersWaveForecast:
             highcharts_containers = soup.find_all('div', class_=re.compile(r'highcharts-container'))
             
             if not highcharts_containers:
-                print("No Highcharts container found")
+                parse_log.debug("No Highcharts container found")
                 return
             
-            print(f"Found {len(highcharts_containers)} Highcharts container(s)")
+            parse_log.debug("Found %s Highcharts container(s)", len(highcharts_containers))
             
             for container in highcharts_containers:
                 # Look for SVG within the container
@@ -1323,7 +1329,7 @@ class FourSurfersWaveForecast:
                 if not svg_element:
                     continue
                 
-                print("Found Highcharts SVG, extracting data...")
+                parse_log.debug("Found Highcharts SVG, extracting data...")
                 
                 # Extract date labels from x-axis
                 date_labels = []
@@ -1355,7 +1361,7 @@ class FourSurfersWaveForecast:
                             except:
                                 continue
                 
-                print(f"Extracted {len(date_labels)} date labels from chart")
+                parse_log.debug("Extracted %s date labels from chart", len(date_labels))
                 
                 # Extract wave height data from data labels
                 wave_heights = []
@@ -1392,7 +1398,7 @@ class FourSurfersWaveForecast:
                                 except:
                                     continue
                 
-                print(f"Extracted {len(wave_heights)} wave height data points from chart")
+                parse_log.debug("Extracted %s wave height data points from chart", len(wave_heights))
                 
                 # Map wave heights to dates and times
                 # Highcharts typically shows 3 data points per date (morning, noon, evening)
@@ -1441,12 +1447,12 @@ class FourSurfersWaveForecast:
                                     'display_date': date_info['display_date']
                                 }
                                 
-                                print(f"Mapped: {date_info['display_date']} ({date_info['hebrew_day']}) {time_str} -> {height}m ({condition})")
+                                parse_log.debug("Mapped: %s (%s) %s -> %sm (%s)", date_info['display_date'], date_info['hebrew_day'], time_str, height, condition)
                 
                 break  # Process first chart found
                 
         except Exception as e:
-            print(f"Error parsing Highcharts data: {e}")
+            parse_log.warning("Error parsing Highcharts data: %s", e)
             import traceback
             traceback.print_exc()
     
@@ -1499,7 +1505,7 @@ class FourSurfersWaveForecast:
             return date_found
             
         except Exception as e:
-            print(f"Error normalizing date: {e}")
+            parse_log.warning("Error normalizing date: %s", e)
             return date_found
     
     def _extract_highcharts_data(self, page, html: str) -> Dict:
@@ -1526,7 +1532,7 @@ class FourSurfersWaveForecast:
             highcharts_containers = soup.find_all(['div'], class_=re.compile(r'highcharts-container'))
             
             if highcharts_containers:
-                print(f"Found {len(highcharts_containers)} Highcharts container(s)")
+                parse_log.debug("Found %s Highcharts container(s)", len(highcharts_containers))
                 chart_data['highcharts_found'] = True
                 
                 # Try to extract data using Playwright/JavaScript
@@ -1566,14 +1572,14 @@ class FourSurfersWaveForecast:
                     """)
                     
                     if chart_js_data:
-                        print(f"Extracted data from {len(chart_js_data)} chart(s) via JavaScript")
+                        parse_log.debug("Extracted data from %s chart(s) via JavaScript", len(chart_js_data))
                         chart_data['js_chart_data'] = chart_js_data
                         
                         # Process JavaScript chart data for structured forecasts
                         self._process_js_chart_data(chart_data, chart_js_data)
                     
                 except Exception as e:
-                    print(f"Could not extract chart data via JavaScript: {e}")
+                    parse_log.debug("Could not extract chart data via JavaScript: %s", e)
                 
                 # Parse HTML for chart data
                 for container in highcharts_containers:
@@ -1591,7 +1597,7 @@ class FourSurfersWaveForecast:
                         matches = re.findall(pattern, container_html)
                         dates_found.extend(matches)
                     
-                    print(f"Extracted {len(dates_found)} date labels from chart: {dates_found}")
+                    parse_log.debug("Extracted %s date labels from chart: %s", len(dates_found), dates_found)
                     chart_data['chart_dates'] = dates_found
                     
                     # Extract Hebrew day names
@@ -1605,7 +1611,7 @@ class FourSurfersWaveForecast:
                         matches = re.findall(pattern, container_html)
                         hebrew_days.extend(matches)
                     
-                    print(f"Extracted Hebrew days: {hebrew_days}")
+                    parse_log.debug("Extracted Hebrew days: %s", hebrew_days)
                     chart_data['hebrew_days'] = hebrew_days
                     
                     # Extract wave height data from chart labels
@@ -1625,7 +1631,7 @@ class FourSurfersWaveForecast:
                             except:
                                 continue
                     
-                    print(f"Extracted {len(wave_heights)} wave height data points from chart: {wave_heights}")
+                    parse_log.debug("Extracted %s wave height data points from chart: %s", len(wave_heights), wave_heights)
                     chart_data['chart_wave_data'] = wave_heights
                     
                     # Extract tooltip data which contains detailed time/height info
@@ -1639,7 +1645,7 @@ class FourSurfersWaveForecast:
                         matches = re.findall(pattern, container_html)
                         time_data.extend(matches)
                     
-                    print(f"Extracted time/height data: {time_data}")
+                    parse_log.debug("Extracted time/height data: %s", time_data)
                     chart_data['time_height_data'] = time_data
                     
                     # Create structured daily forecasts from extracted data
@@ -1647,12 +1653,12 @@ class FourSurfersWaveForecast:
                         self._create_structured_forecast_from_chart(chart_data, dates_found, hebrew_days, time_data)
             
             else:
-                print("No Highcharts containers found")
+                parse_log.debug("No Highcharts containers found")
             
             return chart_data
             
         except Exception as e:
-            print(f"Error extracting Highcharts data: {e}")
+            parse_log.warning("Error extracting Highcharts data: %s", e)
             return {}
     
     def _create_structured_forecast_from_chart(self, chart_data: Dict, dates: list, hebrew_days: list, time_data: list):
@@ -1735,17 +1741,17 @@ class FourSurfersWaveForecast:
                                         'source': 'highcharts'
                                     }
                                     
-                                    print(f"Chart data: {date_str} ({hebrew_day}) {hebrew_time} -> {height}m ({quality_hebrew})")
+                                    parse_log.debug("Chart data: %s (%s) %s -> %sm (%s)", date_str, hebrew_day, hebrew_time, height, quality_hebrew)
                                     
                                 except ValueError:
                                     continue
                     
                 except Exception as e:
-                    print(f"Error processing date {date_str}: {e}")
+                    parse_log.warning("Error processing date %s: %s", date_str, e)
                     continue
             
         except Exception as e:
-            print(f"Error creating structured forecast: {e}")
+            parse_log.warning("Error creating structured forecast: %s", e)
     
     def _process_js_chart_data(self, chart_data: Dict, js_chart_data: list):
         """Process JavaScript-extracted chart data into structured forecasts"""
@@ -1772,13 +1778,13 @@ class FourSurfersWaveForecast:
                     
                 # Skip if this looks like tidal data (has timestamps)
                 if any(isinstance(point.get('x'), (int, float)) and point.get('x') > 1000000000 for series in chart.get('series', []) for point in series.get('data', [])):
-                    print("Skipping tidal data chart")
+                    parse_log.debug("Skipping tidal data chart")
                     continue
                 
                 categories = chart['categories']
                 series = chart['series']
                 
-                print(f"Processing chart with {len(categories)} dates and {len(series)} time series")
+                parse_log.debug("Processing chart with %s dates and %s time series", len(categories), len(series))
                 
                 # Create mapping of series names to data
                 series_map = {}
@@ -1854,17 +1860,17 @@ class FourSurfersWaveForecast:
                                             'source': 'javascript_highcharts'
                                         }
                                         
-                                        print(f"JS Chart: {date_str} ({hebrew_day}) {hebrew_time} -> {height}m ({quality_hebrew})")
+                                        parse_log.debug("JS Chart: %s (%s) %s -> %sm (%s)", date_str, hebrew_day, hebrew_time, height, quality_hebrew)
                         
                     except Exception as e:
-                        print(f"Error processing category {category}: {e}")
+                        parse_log.warning("Error processing category %s: %s", category, e)
                         continue
                 
                 # Only process the first valid chart (wave forecast)
                 break
                 
         except Exception as e:
-            print(f"Error processing JavaScript chart data: {e}")
+            parse_log.warning("Error processing JavaScript chart data: %s", e)
     
     def _extract_general_conditions(self, full_text: str, forecast_data: Dict):
         """Extract general wave and weather conditions"""
@@ -1902,7 +1908,7 @@ class FourSurfersWaveForecast:
             self._extract_wave_height_timeline(full_text, forecast_data)
                 
         except Exception as e:
-            print(f"Error extracting general conditions: {e}")
+            parse_log.warning("Error extracting general conditions: %s", e)
     
     def _extract_wave_height_timeline(self, full_text: str, forecast_data: Dict):
         """Extract wave height data for timeline chart"""
@@ -1973,12 +1979,16 @@ class FourSurfersWaveForecast:
             forecast_data['wave_timeline'] = wave_timeline
             
         except Exception as e:
-            print(f"Error creating wave timeline: {e}")
+            parse_log.warning("Error creating wave timeline: %s", e)
     
     def create_wave_height_chart(self, forecast_data: Dict, filename: str = None) -> str:
         """
         Create a 4surfers-style bar chart with Hebrew font support and RTL text
         
+        Rendering goes through the process-wide wave_chart renderer, which keeps
+        the figure template between calls and skips matplotlib entirely when
+        the forecast has not changed since the last chart.
+        
         Args:
             forecast_data: The forecast data dictionary
             filename: Optional filename for the chart image
@@ -1986,198 +1996,36 @@ class FourSurfersWaveForecast:
         Returns:
             The filename of the generated chart image
         """
-        import matplotlib.pyplot as plt
-        import matplotlib.dates as mdates
-        import numpy as np
-        from datetime import datetime, timedelta
-        import matplotlib.font_manager as fm
-        
-        # Hebrew text support
-        try:
-            import arabic_reshaper
-            from bidi.algorithm import get_display
-        except ImportError:
-            print("Warning: Hebrew text support not available. Install arabic-reshaper and python-bidi")
-            arabic_reshaper = None
-            get_display = None
+        from wave_chart import default_renderer
         
         if not filename:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"wave_height_chart_{timestamp}.png"
         
-        def format_hebrew_text(text):
-            """Format Hebrew text for proper RTL display"""
-            if arabic_reshaper and get_display:
-                try:
-                    reshaped_text = arabic_reshaper.reshape(text)
-                    return get_display(reshaped_text)
-                except:
-                    return text
-            return text
-        
         try:
-            daily_forecasts = forecast_data.get('daily_forecasts', {})
-            
-            if not daily_forecasts:
-                print("No daily forecast data available for chart")
+            if not forecast_data.get('daily_forecasts'):
+                log.warning("No daily forecast data available for chart")
                 return None
             
-            # Prepare data for 4surfers-style bar chart
-            dates = []
-            hebrew_days = []
-            morning_heights = []
-            noon_heights = []
-            evening_heights = []
-            date_labels = []
-            
-            # Sort dates chronologically 
-            sorted_dates = sorted(daily_forecasts.items())
-            
-            for date_key, day_data in sorted_dates:
-                try:
-                    date_obj = datetime.strptime(date_key, '%Y-%m-%d')
-                    dates.append(date_obj)
-                    
-                    hebrew_day = day_data.get('hebrew_day', '')
-                    hebrew_date = day_data.get('hebrew_date', date_obj.strftime('%d/%m'))
-                    hebrew_days.append(hebrew_day)
-                    date_labels.append(hebrew_date)
-                    
-                    times_data = day_data.get('times', {})
-                    
-                    # Extract heights for each time
-                    morning_heights.append(times_data.get('06:00', {}).get('wave_height', 0))
-                    noon_heights.append(times_data.get('12:00', {}).get('wave_height', 0))
-                    evening_heights.append(times_data.get('18:00', {}).get('wave_height', 0))
-                    
-                except Exception as e:
-                    print(f"Error parsing date {date_key}: {e}")
-                    continue
-            
-            if not dates:
-                print("No valid dates found for chart")
+            if not default_renderer().render_to_file(forecast_data, filename):
+                log.warning("No valid dates found for chart")
                 return None
             
-            # Create 4surfers-style bar chart
-            fig, ax = plt.subplots(figsize=(18, 10))
-            
-            # Set up x positions for grouped bars (like 4surfers)
-            x_positions = np.arange(len(dates))
-            bar_width = 0.25
-            
-            # Create grouped bars like the 4surfers chart
-            bars1 = ax.bar(x_positions - bar_width, morning_heights, bar_width, 
-                          label=format_hebrew_text('בוקר (06:00)'), 
-                          color='#87CEEB', alpha=0.8, edgecolor='white', linewidth=1)
-            
-            bars2 = ax.bar(x_positions, noon_heights, bar_width, 
-                          label=format_hebrew_text('צהרים (12:00)'), 
-                          color='#4682B4', alpha=0.8, edgecolor='white', linewidth=1)
-            
-            bars3 = ax.bar(x_positions + bar_width, evening_heights, bar_width, 
-                          label=format_hebrew_text('ערב (18:00)'), 
-                          color='#2F4F4F', alpha=0.8, edgecolor='white', linewidth=1)
-            
-            # Add value labels on top of bars
-            def add_bar_labels(bars, heights):
-                for bar, height in zip(bars, heights):
-                    if height > 0:
-                        ax.annotate(f'{height:.1f}m',
-                                   xy=(bar.get_x() + bar.get_width() / 2, height),
-                                   xytext=(0, 3),  # 3 points vertical offset
-                                   textcoords="offset points",
-                                   ha='center', va='bottom',
-                                   fontsize=9, weight='bold', 
-                                   color='#2C3E50')
-            
-            add_bar_labels(bars1, morning_heights)
-            add_bar_labels(bars2, noon_heights)
-            add_bar_labels(bars3, evening_heights)
-            
-            # Set custom x-axis labels with dates and Hebrew days
-            custom_labels = []
-            for i in range(len(date_labels)):
-                hebrew_formatted = format_hebrew_text(hebrew_days[i])
-                custom_labels.append(f"{date_labels[i]}\n{hebrew_formatted}")
-            
-            ax.set_xticks(x_positions)
-            ax.set_xticklabels(custom_labels, fontsize=11, ha='center', weight='bold')
-            
-            # Customize chart appearance with Hebrew support
-            title_text = format_hebrew_text('תחזית גלים אשקלון') + ' - Ashkelon Wave Forecast'
-            subtitle_text = format_hebrew_text('גובה גלים לפי שעות היום')
-            ax.set_title(f'🌊 {title_text}\n{subtitle_text}', 
-                        fontsize=18, fontweight='bold', pad=25)
-            
-            ylabel_text = format_hebrew_text('גובה גלים (מטר)') + '\nWave Height (meters)'
-            ax.set_ylabel(ylabel_text, fontsize=13, weight='bold')
-            
-            xlabel_text = format_hebrew_text('תאריך ויום') + '\nDate & Day'
-            ax.set_xlabel(xlabel_text, fontsize=13, weight='bold')
-            
-            # Add horizontal reference lines
-            ax.axhline(y=0.3, color='orange', linestyle='--', alpha=0.7, linewidth=2,
-                      label=format_hebrew_text('קרסול') + ' - Ankle High (0.3m)')
-            ax.axhline(y=0.7, color='green', linestyle='--', alpha=0.7, linewidth=2,
-                      label=format_hebrew_text('ברך') + ' - Knee High (0.7m)')  
-            ax.axhline(y=1.0, color='blue', linestyle='--', alpha=0.7, linewidth=2,
-                      label=format_hebrew_text('מעל ברך') + ' - Above Knee (1.0m)')
-            ax.axhline(y=1.3, color='red', linestyle='--', alpha=0.7, linewidth=2,
-                      label=format_hebrew_text('כתף') + ' - Shoulder High (1.3m)')
-            ax.axhline(y=2.0, color='purple', linestyle='--', alpha=0.5, linewidth=1,
-                      label=format_hebrew_text('ראש') + ' - Head High (2.0m)')
-            
-            # Set y-axis limits
-            all_heights = morning_heights + noon_heights + evening_heights
-            max_height = max(all_heights) if all_heights else 1.0
-            ax.set_ylim(0, max(1.2, max_height + 0.1))
-            
-            # Add enhanced grid
-            ax.grid(True, alpha=0.3, linestyle='-', linewidth=0.5, axis='y')
-            ax.set_axisbelow(True)
-            
-            # Add legend with Hebrew support
-            ax.legend(loc='upper right', framealpha=0.95, fontsize=11, 
-                     shadow=True, fancybox=True)
-            
-            # Enhance visual styling to match 4surfers
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.spines['left'].set_linewidth(1)
-            ax.spines['bottom'].set_linewidth(1)
-            
-            # Set background color
-            ax.set_facecolor('#F8F9FA')
-            fig.patch.set_facecolor('white')
-            
-            # Improve layout
-            plt.tight_layout()
-            
-            # Save with high quality
-            plt.savefig(filename, dpi=300, bbox_inches='tight', facecolor='white', edgecolor='none')
-            plt.close()
-            
-            print(f"📊 4surfers-style bar chart with Hebrew support saved as: {filename}")
+            log.info("📊 4surfers-style bar chart with Hebrew support saved as: %s", filename)
             return filename
             
         except Exception as e:
-            print(f"Error creating wave height chart: {e}")
+            log.error("Error creating wave height chart: %s", e)
             return None
     
     def generate_good_wave_days_summary_hebrew(self, forecast_data: Dict) -> str:
         """Generate Hebrew-enabled summary for PDF"""
         try:
-            # Import Hebrew text processing
-            import arabic_reshaper
-            from bidi.algorithm import get_display
-            
-            def format_hebrew_text(text):
-                """Format Hebrew text for display"""
-                try:
-                    reshaped_text = arabic_reshaper.reshape(text)
-                    return get_display(reshaped_text)
-                except:
-                    return text
+            # Shaped strings come from the shared RTL cache; without reshaper/bidi
+            # fall back to the English summary as before
+            if not rtl_available():
+                return self.generate_good_wave_days_summary(forecast_data)
+            format_hebrew_text = shape_rtl
             
             excellent_wave_days = []
             good_wave_days = []
@@ -2268,7 +2116,7 @@ class FourSurfersWaveForecast:
                 return f"📅 {hebrew_small} {hebrew_expected}. Better conditions may come later."
                 
         except Exception as e:
-            print(f"Error generating Hebrew wave days summary: {e}")
+            log.error("Error generating Hebrew wave days summary: %s", e)
             return self.generate_good_wave_days_summary(forecast_data)
     
     def generate_good_wave_days_summary(self, forecast_data: Dict) -> str:
@@ -2403,542 +2251,54 @@ class FourSurfersWaveForecast:
                 return "📅 Small waves expected this week (all below 0.3m). Better conditions may come later."
                 
         except Exception as e:
-            print(f"Error generating good wave days summary: {e}")
+            log.error("Error generating good wave days summary: %s", e)
             return "📅 Wave forecast summary unavailable."
     
-    def generate_pdf_report(self, forecast_data: Dict, filename: str = None) -> str:
+    def generate_pdf_report(self, forecast_data: Dict, filename: str = None,
+                            chart_png: Optional[bytes] = None) -> str:
         """
         Generate a PDF report of the wave forecast
         
+        Fonts, styles and static page text are set up once per process by
+        pdf_report; the chart is embedded from memory and the document is
+        written to disk in one go.
+        
         Args:
             forecast_data: The forecast data dictionary
             filename: Optional filename for the PDF
+            chart_png: Already rendered chart to embed (default: render it here)
             
         Returns:
             The filename of the generated PDF
         """
-        from reportlab.lib.pagesizes import A4, letter
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-        from reportlab.lib import colors
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
-        import os
+        from pdf_report import render_pdf
+        from wave_chart import default_renderer
         
         if not filename:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"ashkelon_forecast_report_{timestamp}.pdf"
         
         try:
-            # Create PDF document with 4surfers-style design
-            doc = SimpleDocTemplate(filename, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
-            story = []
-            
-            # Register Hebrew font support
-            hebrew_font_registered = False
-            try:
-                # Try to find and register a Hebrew-compatible font
-                hebrew_fonts = [
-                    '/System/Library/Fonts/Arial Unicode MS.ttf',  # macOS
-                    '/System/Library/Fonts/Helvetica.ttc',         # macOS fallback
-                    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',  # Linux
-                    'C:\\Windows\\Fonts\\arial.ttf',               # Windows
-                ]
-                
-                for font_path in hebrew_fonts:
-                    if os.path.exists(font_path):
-                        try:
-                            pdfmetrics.registerFont(TTFont('HebrewFont', font_path))
-                            pdfmetrics.registerFont(TTFont('HebrewFont-Bold', font_path))
-                            hebrew_font_registered = True
-                            print(f"✅ Hebrew font registered: {font_path}")
-                            break
-                        except:
-                            continue
-                            
-                if not hebrew_font_registered:
-                    print("⚠️ No Hebrew font found, using default fonts")
-            except Exception as e:
-                print(f"⚠️ Font registration error: {e}")
-            
-            # Get styles and configure Hebrew text support
-            styles = getSampleStyleSheet()
-            
-            # Hebrew text formatting function with better fallback
-            def format_hebrew_text_pdf(text):
-                """Format Hebrew text for PDF display - use English equivalents to avoid squares"""
-                if not text:
-                    return text
-                
-                # For PDF, use English equivalents to avoid display issues
-                hebrew_to_english = {
-                    'תחזית': 'Forecast', 'גלים': 'Waves', 'אשקלון': 'Ashkelon',
-                    'תאריך': 'Date', 'יום': 'Day', 'בוקר': 'Morning', 
-                    'צהרים': 'Noon', 'ערב': 'Evening', 'זמן': 'Time', 'טוב': 'Best',
-                    'שני': 'Monday', 'שלישי': 'Tuesday', 'רביעי': 'Wednesday',
-                    'חמישי': 'Thursday', 'שישי': 'Friday', 'שבת': 'Saturday', 
-                    'ראשון': 'Sunday', 'קרסול': 'Ankle', 'ברך': 'Knee', 
-                    'כתף': 'Shoulder', 'שטוח': 'Flat', 'מדריך': 'Guide',
-                    'איכות': 'Quality', 'מעולים': 'Excellent', 'גלישה': 'Surfing',
-                    'תנאי': 'Conditions', 'יומית': 'Daily'
-                }
-                
-                # Try direct translation first
-                if text in hebrew_to_english:
-                    return hebrew_to_english[text]
-                
-                # For longer Hebrew phrases, use English equivalents
-                if 'תחזית יומית' in text:
-                    return 'Daily Forecast'
-                elif 'תנאי גלישה מעולים' in text:
-                    return 'Excellent Surfing Conditions'
-                elif 'מדריך איכות גלים' in text:
-                    return 'Wave Quality Guide'
-                
-                # If no translation found, return as-is (might work with proper font)
-                return text
-            
-            # 4surfers.co.il inspired color scheme
-            surfers_blue = colors.Color(0, 0.48, 1, 1)  # #007BFF - oceanic blue
-            surfers_light_blue = colors.Color(0.89, 0.95, 0.99, 1)  # #E3F2FD - light blue background
-            surfers_dark_blue = colors.Color(0, 0.33, 0.8, 1)  # Darker blue for headers
-            
-            # Custom styles with Hebrew support and 4surfers theme
-            title_style = ParagraphStyle(
-                'SurfersTitle',
-                parent=styles['Heading1'],
-                fontSize=22,
-                spaceAfter=20,
-                alignment=1,  # Center alignment
-                fontName='HebrewFont-Bold' if hebrew_font_registered else 'Helvetica-Bold',
-                textColor=surfers_dark_blue,
-                backColor=surfers_light_blue,
-                borderColor=surfers_blue,
-                borderWidth=2,
-                borderPadding=10
-            )
-            
-            heading_style = ParagraphStyle(
-                'SurfersHeading',
-                parent=styles['Heading2'],
-                fontSize=16,
-                spaceAfter=15,
-                spaceBefore=10,
-                fontName='HebrewFont-Bold' if hebrew_font_registered else 'Helvetica-Bold',
-                textColor=surfers_dark_blue,
-                backColor=colors.white,
-                borderColor=surfers_blue,
-                borderWidth=1,
-                borderPadding=8
-            )
-            
-            # Hebrew-aware text style with proper font
-            hebrew_style = ParagraphStyle(
-                'SurfersHebrew',
-                parent=styles['Normal'],
-                fontSize=11,
-                fontName='HebrewFont' if hebrew_font_registered else 'Helvetica',
-                alignment=0,  # Left alignment for mixed Hebrew/English
-                textColor=colors.black
-            )
-            
-            # 4surfers-style title with Hebrew
-            hebrew_title = format_hebrew_text_pdf("תחזית גלים אשקלון")
-            title_text = f"�‍♂️ 4SURFERS.co.il | {hebrew_title}<br/>Ashkelon Wave Forecast Report"
-            story.append(Paragraph(title_text, title_style))
-            story.append(Spacer(1, 15))
-            
             # Good Wave Days Summary (Top of page) - Hebrew version for PDF in 4surfers style
             good_days_summary = self.generate_good_wave_days_summary_hebrew(forecast_data)
-            summary_style = ParagraphStyle(
-                'SurfersSummary',
-                parent=styles['Normal'],
-                fontSize=13,
-                spaceAfter=18,
-                spaceBefore=5,
-                backColor=surfers_light_blue,
-                borderColor=surfers_blue,
-                borderWidth=2,
-                borderPadding=12,
-                fontName='HebrewFont-Bold' if hebrew_font_registered else 'Helvetica-Bold',
-                textColor=surfers_dark_blue,
-                alignment=1  # Center alignment for summary
-            )
-            story.append(Paragraph(good_days_summary, summary_style))
-            story.append(Spacer(1, 15))
-            
-            # Create and include wave height chart
-            chart_filename = self.create_wave_height_chart(forecast_data)
-            if chart_filename:
+            
+            if chart_png is None and forecast_data.get('daily_forecasts'):
                 try:
-                    from reportlab.platypus import Image
-                    from reportlab.lib.utils import ImageReader
-                    
-                    # Add chart to PDF
-                    story.append(Paragraph("📊 Wave Height Timeline", heading_style))
-                    chart_image = Image(chart_filename, width=6*inch, height=3*inch)
-                    story.append(chart_image)
-                    story.append(Spacer(1, 20))
+                    chart_png = default_renderer().render(forecast_data)
                 except Exception as e:
-                    print(f"Could not include chart in PDF: {e}")
-            
-            # Beach Info with 4surfers styling and Hebrew support
-            beach_hebrew = forecast_data.get('beach_hebrew', 'N/A')
-            formatted_beach_hebrew = format_hebrew_text_pdf(beach_hebrew) if beach_hebrew != 'N/A' else 'N/A'
-            
-            beach_info_style = ParagraphStyle(
-                'SurfersInfo',
-                parent=styles['Normal'],
-                fontSize=11,
-                spaceAfter=12,
-                fontName='HebrewFont' if hebrew_font_registered else 'Helvetica',
-                backColor=colors.white,
-                borderColor=surfers_blue,
-                borderWidth=1,
-                borderPadding=8
-            )
-            
-            beach_info = f"""
-            <b>🏖️ Beach | חוף:</b> {forecast_data.get('beach', 'N/A')} ({formatted_beach_hebrew})<br/>
-            <b>🌐 Source | מקור:</b> {forecast_data.get('source', 'N/A')}<br/>
-            <b>📅 Report Generated | דוח נוצר:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}<br/>
-            <b>⏱️ Data Retrieved | נתונים נאספו:</b> {forecast_data.get('timestamp', 'N/A')[:19]}
-            """
-            story.append(Paragraph(beach_info, beach_info_style))
-            story.append(Spacer(1, 15))
-            
-            # Surf Quality Summary
-            story.append(Paragraph("🏄 Surf Quality Indicators Found", heading_style))
-            
-            if forecast_data.get('surf_quality_indicators'):
-                quality_data = []
-                quality_data.append(['Hebrew Term', 'English', 'Frequency'])
-                
-                for quality in forecast_data['surf_quality_indicators']:
-                    quality_data.append([
-                        quality['hebrew'],
-                        quality['english'],
-                        str(quality['count'])
-                    ])
-                
-                quality_table = Table(quality_data)
-                quality_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                story.append(quality_table)
-            else:
-                story.append(Paragraph("No surf quality indicators found", styles['Normal']))
-            
-            story.append(Spacer(1, 20))
-            
-            # Enhanced Daily Forecasts with proper dates - 4surfers style
-            hebrew_title = format_hebrew_text_pdf("תחזית יומית")
-            story.append(Paragraph(f"📅 Daily Breakdown - {hebrew_title} (בוקר/צהרים/ערב)", heading_style))
-            
-            # Create 4surfers-style forecast table from daily forecasts
-            if forecast_data.get('daily_forecasts'):
-                # Create table headers with Hebrew support
-                forecast_table_data = []
-                forecast_table_data.append([
-                    f'Date\n{format_hebrew_text_pdf("תאריך")}', 
-                    f'Day\n{format_hebrew_text_pdf("יום")}',
-                    f'Morning 06:00\n{format_hebrew_text_pdf("בוקר")}', 
-                    f'Noon 12:00\n{format_hebrew_text_pdf("צהרים")}', 
-                    f'Evening 18:00\n{format_hebrew_text_pdf("ערב")}',
-                    f'Best Time\n{format_hebrew_text_pdf("זמן טוב")}'
-                ])
-                
-                # Sort dates and add data
-                sorted_forecasts = sorted(forecast_data['daily_forecasts'].items())
-                
-                for date_key, day_data in sorted_forecasts:
-                    hebrew_date = day_data.get('hebrew_date', date_key[-5:])  # DD/MM format
-                    hebrew_day = day_data.get('hebrew_day', '')
-                    english_day = day_data.get('english_day', '')
-                    
-                    times_data = day_data.get('times', {})
-                    
-                    # Get wave heights and conditions
-                    morning_info = times_data.get('06:00', {})
-                    noon_info = times_data.get('12:00', {})
-                    evening_info = times_data.get('18:00', {})
-                    
-                    # Get wave heights and conditions with Hebrew support
-                    def format_time_cell(time_info):
-                        if not time_info:
-                            return "N/A"
-                        
-                        height = time_info.get('wave_height', 0)
-                        surf_quality = time_info.get('surf_quality', 'N/A')
-                        
-                        # Extract Hebrew condition if available
-                        if '(' in surf_quality:
-                            hebrew_condition = surf_quality.split('(')[0].strip()
-                            english_condition = surf_quality.split('(')[1].replace(')', '').strip()
-                            formatted_hebrew = format_hebrew_text_pdf(hebrew_condition)
-                            return f"{height:.1f}m\n{formatted_hebrew}\n({english_condition})"
-                        else:
-                            return f"{height:.1f}m\n{surf_quality}"
-                    
-                    morning_text = format_time_cell(morning_info)
-                    noon_text = format_time_cell(noon_info)
-                    evening_text = format_time_cell(evening_info)
-                    
-                    # Determine best time with Hebrew labels
-                    time_hebrew = {'Morning': 'בוקר', 'Noon': 'צהרים', 'Evening': 'ערב'}
-                    heights = []
-                    if morning_info: heights.append(('Morning', morning_info.get('wave_height', 0)))
-                    if noon_info: heights.append(('Noon', noon_info.get('wave_height', 0)))
-                    if evening_info: heights.append(('Evening', evening_info.get('wave_height', 0)))
-                    
-                    if heights:
-                        best_time = max(heights, key=lambda x: x[1])
-                        if best_time[1] >= 0.3:
-                            hebrew_time = format_hebrew_text_pdf(time_hebrew[best_time[0]])
-                            best_text = f"{best_time[0]}\n{hebrew_time}\n{best_time[1]:.1f}m ✅"
-                        else:
-                            hebrew_flat = format_hebrew_text_pdf("שטוח")
-                            best_text = f"Flat\n{hebrew_flat}\n❌"
-                    else:
-                        best_text = "N/A"
-                    
-                    # Use English day names for PDF to avoid Hebrew display issues
-                    hebrew_to_english = {
-                        'שני': 'Monday', 'שלישי': 'Tuesday', 'רביעי': 'Wednesday', 
-                        'חמישי': 'Thursday', 'שישי': 'Friday', 'שבת': 'Saturday', 'ראשון': 'Sunday'
-                    }
-                    english_day_name = hebrew_to_english.get(hebrew_day, english_day)
-                    
-                    forecast_table_data.append([
-                        hebrew_date,
-                        f"{format_hebrew_text_pdf(hebrew_day)}\n{english_day_name}",
-                        morning_text,
-                        noon_text, 
-                        evening_text,
-                        best_text
-                    ])
-                
-                # Create and style the forecast table with 4surfers theme
-                forecast_table = Table(forecast_table_data, colWidths=[0.8*inch, 1.1*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch])
-                
-                # 4surfers-inspired table styling
-                forecast_table.setStyle(TableStyle([
-                    # Header styling with oceanic theme
-                    ('BACKGROUND', (0, 0), (-1, 0), surfers_dark_blue),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'HebrewFont-Bold' if hebrew_font_registered else 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 11),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 15),
-                    ('TOPPADDING', (0, 0), (-1, 0), 15),
-                    
-                    # Data rows styling with alternating ocean colors
-                    ('FONTSIZE', (0, 1), (-1, -1), 10),
-                    ('FONTNAME', (0, 1), (1, -1), 'HebrewFont-Bold' if hebrew_font_registered else 'Helvetica-Bold'),
-                    ('FONTNAME', (2, 1), (-1, -1), 'HebrewFont' if hebrew_font_registered else 'Helvetica'),
-                    ('TOPPADDING', (0, 1), (-1, -1), 10),
-                    ('BOTTOMPADDING', (0, 1), (-1, -1), 10),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 8),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-                    
-                    # Grid and borders with oceanic styling
-                    ('GRID', (0, 0), (-1, -1), 1.5, surfers_blue),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    
-                    # Alternating row colors with oceanic theme
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [surfers_light_blue, colors.white]),
-                    
-                    # Highlight best time column with green accent
-                    ('BACKGROUND', (5, 0), (5, 0), colors.green),
-                    ('BACKGROUND', (5, 1), (5, -1), colors.lightgreen),
-                    
-                    # Special styling for wave height cells
-                    ('TEXTCOLOR', (2, 1), (4, -1), surfers_dark_blue),
-                ]))
-                
-                story.append(forecast_table)
-                story.append(Spacer(1, 20))
-                
-                # Add surf quality legend with 4surfers styling
-                legend_style = ParagraphStyle(
-                    'SurfersLegend',
-                    parent=styles['Normal'],
-                    fontSize=10,
-                    spaceAfter=12,
-                    spaceBefore=8,
-                    backColor=surfers_light_blue,
-                    borderColor=surfers_blue,
-                    borderWidth=1.5,
-                    borderPadding=10,
-                    fontName='HebrewFont' if hebrew_font_registered else 'Helvetica',
-                    textColor=surfers_dark_blue
-                )
-                
-                # Create legend with Hebrew and English
-                hebrew_legend_title = format_hebrew_text_pdf("מדריך איכות גלים")
-                hebrew_flat = format_hebrew_text_pdf("פלטה")
-                hebrew_ankle = format_hebrew_text_pdf("קרסול") 
-                hebrew_ankle_knee = format_hebrew_text_pdf("קרסול עד ברך")
-                hebrew_knee = format_hebrew_text_pdf("ברך")
-                hebrew_above_knee = format_hebrew_text_pdf("מעל ברך")
-                hebrew_shoulder = format_hebrew_text_pdf("כתף")
-                hebrew_head = format_hebrew_text_pdf("ראש")
-                
-                legend_text = f"""
-                <b>🏄 Surf Quality Legend - {hebrew_legend_title}:</b><br/>
-                • <b>{hebrew_flat} (Flat):</b> 0-0.1m - No waves<br/>
-                • <b>{hebrew_ankle} (Ankle High):</b> 0.2-0.4m - Very small waves<br/>
-                • <b>{hebrew_ankle_knee} (Ankle-Knee):</b> 0.5-0.6m - Small waves for beginners<br/>
-                • <b>{hebrew_knee} (Knee High):</b> 0.7-0.9m - Good waves for surfing<br/>
-                • <b>{hebrew_above_knee} (Above Knee):</b> 1.0-1.2m - Great waves<br/>
-                • <b>{hebrew_shoulder} (Shoulder High):</b> 1.3-1.5m - Excellent waves<br/>
-                • <b>{hebrew_head} (Head High):</b> 2.0m+ - Epic conditions for experts
-                """
-                
-                story.append(Paragraph(legend_text, legend_style))
-                
-            else:
-                # Fallback to old timeline data if daily_forecasts not available
-                daily_organized = {}
-                if forecast_data.get('wave_timeline'):
-                    for item in forecast_data['wave_timeline']:
-                        date = item['date']
-                        if date not in daily_organized:
-                            daily_organized[date] = {}
-                        time_str = item['time']
-                        daily_organized[date][time_str] = item
-                
-                # Create tables for each day
-                for date_key in sorted(daily_organized.keys()):
-                    if date_key in ['unknown_date', 'container_data']:
-                        continue
-                    
-                    try:
-                        date_obj = datetime.strptime(date_key, '%Y-%m-%d')
-                        hebrew_day = self._get_hebrew_day(date_obj.weekday())
-                        formatted_date = date_obj.strftime('%d/%m/%Y')
-                        english_day = date_obj.strftime('%A')
-                        
-                        day_title = f"{hebrew_day} - {formatted_date} ({english_day})"
-                    except:
-                        day_title = date_key
-                    
-                    story.append(Paragraph(f"<b>{day_title}</b>", styles['Heading3']))
-                    
-                    times_data = daily_organized[date_key]
-                    if times_data:
-                        time_data = []
-                        time_data.append(['Time', 'Wave Height', 'Surf Condition', 'Quality'])
-                        
-                        for time_str in ['06:00', '6:00', '12:00', '18:00']:
-                            if time_str in times_data:
-                                item = times_data[time_str]
-                                height = f"{item['height']:.1f}m"
-                                condition = item.get('condition', 'Unknown')
-                                
-                                # Determine quality level
-                                if item['height'] >= 1.0:
-                                    quality = "🟢 Good"
-                                elif item['height'] >= 0.6:
-                                    quality = "🟡 Fair" 
-                                elif item['height'] >= 0.3:
-                                    quality = "🟠 Small"
-                                else:
-                                    quality = "🔴 Flat"
-                                
-                                time_data.append([time_str, height, condition, quality])
-                        
-                        if len(time_data) > 1:  # Has data beyond header
-                            time_table = Table(time_data, colWidths=[0.8*inch, 1*inch, 2.2*inch, 1*inch])
-                            time_table.setStyle(TableStyle([
-                                ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-                                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                                ('BACKGROUND', (0, 1), (-1, -1), colors.lightblue),
-                                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                                ('FONTSIZE', (0, 1), (-1, -1), 9)
-                            ]))
-                            story.append(time_table)
-                    
-                    story.append(Spacer(1, 15))
+                    log.warning("Could not include chart in PDF: %s", e)
             
-
+            pdf_bytes = render_pdf(forecast_data, good_days_summary, chart_png)
+            with open(filename, 'wb') as f:
+                f.write(pdf_bytes)
             
-            # Wave Heights and Wind Speeds
-            if forecast_data.get('wave_heights') or forecast_data.get('wind_speeds'):
-                story.append(Spacer(1, 20))
-                story.append(Paragraph("🌊 Conditions Summary", heading_style))
-                
-                conditions_text = ""
-                if forecast_data.get('wave_heights'):
-                    conditions_text += f"<b>Wave Heights:</b> {', '.join(map(str, forecast_data['wave_heights']))} meters<br/>"
-                
-                if forecast_data.get('wind_speeds'):
-                    conditions_text += f"<b>Wind Speeds:</b> {', '.join(map(str, forecast_data['wind_speeds']))} km/h<br/>"
-                
-                story.append(Paragraph(conditions_text, styles['Normal']))
-            
-            # Summary
-            if forecast_data.get('summary'):
-                story.append(Spacer(1, 20))
-                story.append(Paragraph("📊 Report Summary", heading_style))
-                
-                summary = forecast_data['summary']
-                summary_text = f"""
-                <b>Days with Forecasts:</b> {summary.get('total_days_found', 0)}<br/>
-                <b>Quality Indicators Found:</b> {summary.get('quality_indicators_found', 0)}<br/>
-                <b>Most Common Condition:</b> {summary.get('most_common_condition', 'Unknown')}
-                """
-                story.append(Paragraph(summary_text, styles['Normal']))
-            
-            # Build PDF
-            doc.build(story)
-            
-            print(f"📄 PDF report generated: {filename}")
+            log.info("📄 PDF report generated: %s", filename)
             return filename
             
         except Exception as e:
-            print(f"Error generating PDF: {e}")
+            log.error("Error generating PDF: %s", e)
             return None
     
-    def send_telegram_message(self, chat_id: int, message: str) -> bool:
-        """Send a message via Telegram bot"""
-        if not self.telegram_bot_token:
-            print("❌ No Telegram bot token provided")
-            return False
-            
-        try:
-            url = f"https://api.telegram.org/bot{self.telegram_bot_token}/sendMessage"
-            data = {
-                'chat_id': chat_id,
-                'text': message,
-                'parse_mode': 'HTML'
-            }
-            
-            response = requests.post(url, data=data)
-            
-            if response.status_code == 200:
-                print("✅ Telegram message sent successfully!")
-                return True
-            else:
-                print(f"❌ Telegram API error: {response.status_code} - {response.text}")
-                return False
-                
-        except Exception as e:
-            print(f"❌ Error sending Telegram message: {e}")
-            return False
-    
     def generate_hebrew_wave_summary(self, forecast_data: Dict) -> str:
         """Generate Hebrew wave summary for Telegram with 06:00, 12:00, 18:00 surf sessions"""
         try:
@@ -2946,14 +2306,21 @@ class FourSurfersWaveForecast:
             
             # Extract surf sessions for key times: 06:00, 12:00, 18:00
             if 'daily_forecasts' in forecast_data:
+                arrays = ForecastArrays.from_slots(
+                    (0, time_info.get('wave_height') or 0, 0, 0, int(time_key[:2]), 80, (date, time_key))
+                    for date, day_data in forecast_data['daily_forecasts'].items()
+                    for time_key, time_info in day_data.get('times', {}).items() if time_key in SUMMARY_TIMES
+                )
+                surfable = {label for label, match in zip(arrays.labels, SUMMARY_SESSIONS.evaluate(arrays, now=0)[0])
+                            if match}
+                
                 for date, day_data in forecast_data['daily_forecasts'].items():
                     times_data = day_data.get('times', {})
                     
                     # Get surf conditions for key surf times
                     surf_sessions = {}
-                    key_times = ['06:00', '12:00', '18:00']
                     
-                    for time_key in key_times:
+                    for time_key in SUMMARY_TIMES:
                         if time_key in times_data:
                             time_info = times_data[time_key]
                             wave_height = time_info.get('wave_height', 0)
@@ -2963,7 +2330,7 @@ class FourSurfersWaveForecast:
                             # The API already provides the correct Hebrew terms from 4surfers website
                             hebrew_quality = surf_quality.split('(')[0].strip() if surf_quality else ''
                             
-                            if wave_height >= 0.3:  # Only include surfable conditions
+                            if (date, time_key) in surfable:  # Only include surfable conditions
                                 surf_sessions[time_key] = {
                                     'height': wave_height,
                                     'quality': hebrew_quality,  # Use original Hebrew from API
@@ -3031,7 +2398,7 @@ class FourSurfersWaveForecast:
                 return "🌊 <b>תחזית גלים אשקלון</b>\n\n😔 אין גלים טובים לגלישה השבוע\n(כל הגלים מתחת ל-0.3 מ')\n\n📊 מקור: 4surfers.co.il"
                 
         except Exception as e:
-            print(f"Error generating Hebrew summary: {e}")
+            log.error("Error generating Hebrew summary: %s", e)
             return "❌ שגיאה ביצירת תחזית הגלים"
     
     def _get_hebrew_session_name(self, time_key: str) -> str:
@@ -3046,41 +2413,39 @@ class FourSurfersWaveForecast:
     def check_good_waves_next_72h(self, forecast_data: Dict) -> bool:
         """Check if there are waves above ankle height (>0.4m) in the next 72 hours"""
         try:
-            from datetime import datetime, timedelta
-            
-            # Calculate 72 hours from now
-            now = datetime.now()
-            cutoff_time = now + timedelta(hours=72)
-            
-            daily_forecasts = forecast_data.get('daily_forecasts', {})
-            
-            for date_str, day_data in daily_forecasts.items():
-                # Parse date
-                try:
-                    forecast_date = datetime.strptime(date_str, '%Y-%m-%d')
-                    
-                    # Skip if beyond 72 hours
-                    if forecast_date > cutoff_time:
-                        continue
-                        
-                    # Check times for this day
-                    times_data = day_data.get('times', {})
-                    for time_key, time_data in times_data.items():
-                        wave_height = time_data.get('wave_height', 0)
-                        
-                        # If any wave is above 0.4m (above ankle), return True
-                        if wave_height > 0.4:
-                            print(f"🌊 Good waves found: {wave_height:.1f}m on {date_str} at {time_key}")
-                            return True
-                            
-                except ValueError:
+            # Flatten every forecast slot so the window is one rule evaluation
+            # Slots from earlier today stay in the window (as before); past days do not
+            window_start = local_epoch(datetime.now(ISRAEL_TZ).strftime('%Y-%m-%d'))
+            cutoff = epoch_now() + 72 * 3600
+            
+            slots = []
+            for date_str, day_data in forecast_data.get('daily_forecasts', {}).items():
+                day_start = local_epoch(date_str)
+                if day_start is None:
                     continue
+                for time_key, time_data in day_data.get('times', {}).items():
+                    # Non HH:MM slot names (HTML scrapes) fall back to the start of the day
+                    slot_epoch = local_epoch(date_str, time_key)
+                    hour = int(time_key[:2]) if slot_epoch is not None else 0
+                    slots.append((slot_epoch if slot_epoch is not None else day_start,
+                                  time_data.get('wave_height') or 0, 0, 0, hour, 80, (date_str, time_key)))
+            
+            arrays = ForecastArrays.from_slots(slots)
+            rules = RuleSet([replace(ABOVE_ANKLE, window_hours=(cutoff - window_start) / 3600)])
+            good = np.flatnonzero(rules.evaluate(arrays, now=window_start)[0])
+            
+            # If any wave is above 0.4m (above ankle), return True
+            if good.size:
+                index = good[0]
+                date_str, time_key = arrays.labels[index]
+                log.info("🌊 Good waves found: %.1fm on %s at %s", arrays.height_m[index], date_str, time_key)
+                return True
                     
-            print("〰️ No waves above ankle height (0.4m) found in next 72 hours")
+            log.info("〰️ No waves above ankle height (0.4m) found in next 72 hours")
             return False
             
         except Exception as e:
-            print(f"⚠️ Error checking wave conditions: {e}")
+            log.warning("⚠️ Error checking wave conditions: %s", e)
             # If there's an error, send anyway to be safe
             return True
 
@@ -3088,13 +2453,31 @@ class FourSurfersWaveForecast:
         """Send Hebrew wave summary via Telegram only if there are good waves in next 72h"""
         
         # Check if there are waves worth surfing in the next 72 hours
-        if not self.check_good_waves_next_72h(forecast_data):
-            print("📱 Skipping Telegram message - no surfable waves in next 72 hours")
+        with stage('classify'):
+            good_waves = self.check_good_waves_next_72h(forecast_data)
+        if not good_waves:
+            log.info("📱 Skipping Telegram message - no surfable waves in next 72 hours")
             return True  # Return True since this is expected behavior
             
-        print("📱 Good waves detected - sending Telegram summary...")
-        hebrew_summary = self.generate_hebrew_wave_summary(forecast_data)
-        return self.send_telegram_message(chat_id, hebrew_summary)
+        log.info("📱 Good waves detected - sending Telegram summary...")
+        with stage('render'):
+            hebrew_summary = self.generate_hebrew_wave_summary(forecast_data)
+        return self.deliver_wave_report(chat_id, hebrew_summary, forecast_data)
+    
+    def deliver_wave_report(self, chat_id: int, message: str, forecast_data: Dict) -> bool:
+        """
+        Send the report unless this chat already has it
+        
+        Unchanged sessions are skipped, detail-only changes edit the previous
+        message and new swells get a new message (see notification_state).
+        """
+        if not self.telegram_bot_token:
+            log.error("❌ No Telegram bot token provided")
+            return False
+        
+        from notification_state import forecast_sessions, notify_chats
+        with stage('send'):
+            return notify_chats(self.telegram_bot_token, [str(chat_id)], message, forecast_sessions(forecast_data))
     
     def save_forecast_data(self, forecast_data: Dict, filename: str = None):
         """Save forecast data to file"""
@@ -3215,7 +2598,17 @@ class FourSurfersWaveForecast:
 
 
 def main():
-    """Main function to run the Ashkelon wave forecast application"""
+    """Main function to run the Ashkelon wave forecast application (--profile writes a run profile)"""
+    configure_logging()
+    if profile_requested():
+        with RunProfiler('wave_forecast'):
+            run_forecast()
+    else:
+        run_forecast()
+
+
+def run_forecast():
+    """Fetch, render and deliver one forecast"""
     print("🏄‍♂️ Enhanced Ashkelon Wave Forecast from 4surfers.co.il")
     print("=" * 60)
     
@@ -3236,21 +2629,39 @@ def main():
     forecast_data = wave_forecast.get_ashkelon_forecast()
     
     if forecast_data:
-        # Display the forecast
-        wave_forecast.display_forecast(forecast_data)
-        
-        # Save the JSON data
-        wave_forecast.save_forecast_data(forecast_data)
-        
-        # Skip PDF and chart generation - only send Telegram summary
+        # Display, JSON, Telegram text and (with RENDER_CHART / RENDER_PDF) chart and PDF
+        # are rendered in parallel; the console report prints here as before
+        from output_pipeline import enabled_stages, print_timings, run_pipeline
+        with stage('render'):
+            results = run_pipeline(forecast_data, stages=enabled_stages(), forecast=wave_forecast,
+                                   console=wave_forecast)
+        for name, result in results.items():
+            if name != 'total':
+                # Worker-process stages: wall time only, nested under render
+                record_stage(f"render.{name}", result.seconds)
         
         # Show good wave days summary
         summary = wave_forecast.generate_good_wave_days_summary(forecast_data)
         print(f"\n🌊 {summary}")
         
+        for name in ('json', 'chart', 'pdf'):
+            if name in results:
+                result = results[name]
+                print(f"📁 {name}: {result.output}" if result.ok else f"❌ {name} failed: {result.error}")
+        print_timings(results)
+        
         # Send Hebrew summary via Telegram (only if good waves in next 72h)
         print("\n📱 Checking for surfable conditions in next 72 hours...")
-        telegram_success = wave_forecast.send_wave_report_telegram(forecast_data, TELEGRAM_CHAT_ID)
+        telegram = results.get('telegram')
+        if telegram is not None and telegram.ok:
+            if telegram.output['send']:
+                print("📱 Good waves detected - sending Telegram summary...")
+                telegram_success = wave_forecast.deliver_wave_report(TELEGRAM_CHAT_ID, telegram.output['text'], forecast_data)
+            else:
+                print("📱 Skipping Telegram message - no surfable waves in next 72 hours")
+                telegram_success = True
+        else:
+            telegram_success = wave_forecast.send_wave_report_telegram(forecast_data, TELEGRAM_CHAT_ID)
         
         if telegram_success:
             print("✅ Telegram process completed successfully!")